@@ -0,0 +1,51 @@
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The realtime conversation channel (WebSocket and long-poll) is served by
+``conversations.consumers``, every other HTTP request goes to the WSGI
+application running in a thread pool.
+
+Run with any ASGI server, e.g. ``uvicorn config.asgi:application``.
+"""
+
+import os
+
+from asgiref.wsgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+django_application = WsgiToAsgi(get_wsgi_application())
+
+from conversations.consumers import get_consumer  # noqa: E402
+
+
+async def lifespan(receive, send):
+    while True:
+        event = await receive()
+
+        if event["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+
+        elif event["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    found = get_consumer(scope)
+
+    if found is not None:
+        consumer, conversation_pk = found
+        await consumer(scope, receive, send, conversation_pk)
+
+    elif scope["type"] == "http":
+        await django_application(scope, receive, send)
+
+    else:
+        await send({"type": "websocket.close", "code": 4404})
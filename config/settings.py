@@ -77,6 +77,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "lists.context_processors.saved_rooms",
             ],
         },
     },
@@ -84,6 +85,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+ASGI_APPLICATION = "config.asgi.application"
+
 
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
@@ -145,3 +148,86 @@ EMAIL_PORT = "587"
 EMAIL_HOST_USER = os.environ.get("MAIL_GUN_USERNAME")
 EMAIL_HOST_PASSWORD = os.environ.get("MAIL_GUN_PASSWORD")
 EMAIL_FROM = "no-reply@sandbox8cf3408edf9c45d1a02812f96952fc5e.mailgun.org"
+
+# Seconds a signed email verification link stays valid
+
+EMAIL_VERIFICATION_MAX_AGE = 60 * 60 * 24 * 3
+
+# Realtime conversation channel
+# Broker class fanning new messages out to WebSocket / long-poll subscribers
+
+CONVERSATIONS_BROKER = "conversations.broker.InMemoryBroker"
+
+
+# OAuth providers
+# Built once per process by users.oauth.get_providers, every provider gets
+# login / callback urls. Shared HTTP pool size per host and (connect, read)
+# timeout of provider calls
+
+OAUTH_PROVIDERS = {
+    "github": {
+        "CLASS": "users.oauth.GithubProvider",
+        "CLIENT_ID": os.environ.get("GITHUB_CLIENT_ID"),
+        "CLIENT_SECRET": os.environ.get("GITHUB_CLIENT_SECRET"),
+    },
+    "kakao": {
+        "CLASS": "users.oauth.KakaoProvider",
+        "CLIENT_ID": os.environ.get("KAKAO_API_KEY"),
+    },
+}
+OAUTH_POOL_SIZE = 20
+OAUTH_TIMEOUT = (3.05, 10)
+
+# Social login avatars
+# Downloaded by import_avatars up to a size cap, stored as square WebP thumbnails
+
+AVATAR_MAX_DOWNLOAD_SIZE = 5 * 1024 * 1024
+AVATAR_THUMBNAIL_SIZE = 160
+AVATAR_THUMBNAIL_QUALITY = 80
+
+# Login throttling
+# Token bucket (attempts, seconds to refill them) per client IP and per account,
+# kept in the LOGIN_THROTTLE_CACHE cache. It must be shared by every worker, or
+# each one would allow the whole rate: the "throttle" cache is a database table
+# (python manage.py createcachetable), or memcached when CACHE_LOCATION is set
+
+LOGIN_THROTTLE_CACHE = "throttle"
+LOGIN_THROTTLE_RATES = {"ip": (60, 60), "account": (10, 10 * 60)}
+
+# Caches and sessions
+# The default cache is local memory per process, or memcached shared by every
+# worker when CACHE_LOCATION is set, which then holds login throttling too.
+# Saved room sets are only cached in a default cache shared by every worker.
+# Sessions are kept in the database. When SESSION_CACHE_LOCATION is set, they
+# are read from the "sessions" file cache there and only written through to
+# the database, so warm requests do no django_session query. Every worker must
+# share that directory (one host): a per process cache would keep serving a
+# session another worker logged out. Messages are kept in a signed cookie so
+# they never create or modify a session.
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "login_throttle",
+    },
+}
+
+if os.environ.get("CACHE_LOCATION"):
+    CACHES["default"] = CACHES["throttle"] = {
+        "BACKEND": "django.core.cache.backends.memcached.MemcachedCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION"),
+    }
+
+if os.environ.get("SESSION_CACHE_LOCATION"):
+    CACHES["sessions"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("SESSION_CACHE_LOCATION"),
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    }
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    SESSION_CACHE_ALIAS = "sessions"
+else:
+    SESSION_ENGINE = "django.contrib.sessions.backends.db"
+
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
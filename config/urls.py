@@ -6,7 +6,13 @@ from django.conf.urls.static import static
 urlpatterns = [
     path("", include("core.urls", namespace="core")),
     path("rooms/", include("rooms.urls", namespace="rooms")),
+    path("api/rooms/", include("rooms.api_urls", namespace="rooms_api")),
     path("users/", include("users.urls", namespace="users")),
+    path("lists/", include("lists.urls", namespace="lists")),
+    path(
+        "conversations/",
+        include("conversations.urls", namespace="conversations"),
+    ),
     path("admin/", admin.site.urls),
 ]
 
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """Subscription to one broker channel
+
+    Payloads are handed over to the event loop the subscription was created
+    on, so a broker can publish from any thread (e.g. a WSGI worker saving a
+    Message) while consumers wait inside the ASGI event loop.
+
+    Method:
+        deliver : queue a payload on the subscriber's event loop
+        get     : wait for the next payload (asyncio.TimeoutError on timeout)
+        close   : detach from the broker
+    """
+
+    def __init__(self, broker, channel, loop):
+        self.broker = broker
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue()
+
+    def deliver(self, payload):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, payload)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    """Publish / subscribe interface of the realtime message channel
+
+    Method:
+        publish     : send a payload to every subscriber of a channel
+        subscribe   : return a Subscription bound to the running event loop
+        unsubscribe : remove a Subscription
+    """
+
+    def publish(self, channel, payload):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    """Broker fanning payloads out to subscribers of the current process
+
+    Backends that fan out across workers (Redis, Postgres LISTEN/NOTIFY, ...)
+    can subclass this broker, send payloads to their transport in publish
+    and call dispatch when a payload comes back from it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def publish(self, channel, payload):
+        self.dispatch(channel, payload)
+
+    def dispatch(self, channel, payload):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(payload)
+            except RuntimeError:
+                # The subscriber's event loop is already closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, asyncio.get_running_loop())
+
+        with self.lock:
+            self.subscriptions.setdefault(channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel)
+
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+
+                if not subscriptions:
+                    del self.subscriptions[subscription.channel]
+
+    def count_subscriptions(self, channel=None):
+        with self.lock:
+            if channel is not None:
+                return len(self.subscriptions.get(channel, ()))
+
+            return sum(len(subs) for subs in self.subscriptions.values())
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Return the process wide broker configured by CONVERSATIONS_BROKER"""
+    return import_string(settings.CONVERSATIONS_BROKER)()
+
+
+def conversation_channel(conversation_pk):
+    return f"conversation-{conversation_pk}"
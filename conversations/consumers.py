@@ -0,0 +1,204 @@
+import asyncio
+import json
+import re
+from http.cookies import SimpleCookie
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from conversations.broker import get_broker, conversation_channel
+from conversations.models import Conversation, Message
+
+CONVERSATION_PATH = re.compile(r"^/conversations/(?P<pk>\d+)/(?P<kind>socket|poll)$")
+
+BACKLOG_LIMIT = 100
+POLL_TIMEOUT = 25
+POLL_MAX_TIMEOUT = 60
+
+
+def get_scope_headers(scope):
+    return {
+        name.decode("latin1").lower(): value.decode("latin1")
+        for name, value in scope.get("headers", [])
+    }
+
+
+def get_query_params(scope):
+    return {
+        key: values[-1]
+        for key, values in parse_qs(scope.get("query_string", b"").decode()).items()
+    }
+
+
+def get_int_param(params, name, default, maximum=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        value = default
+
+    if maximum is not None:
+        value = min(value, maximum)
+
+    return max(value, 0)
+
+
+def get_scope_user(scope):
+    """Resolve the user of an ASGI scope from the Django session cookie"""
+    cookie = SimpleCookie(get_scope_headers(scope).get("cookie", ""))
+    morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore(morsel.value if morsel else None)
+
+    return get_user(SimpleNamespace(session=session))
+
+
+@sync_to_async
+def authorize(scope, conversation_pk):
+    """Return True when the scope's user participates in the conversation"""
+    user = get_scope_user(scope)
+
+    if not user.is_authenticated:
+        return False
+
+    return Conversation.objects.filter(pk=conversation_pk, participants=user).exists()
+
+
+@sync_to_async
+def get_backlog(conversation_pk, after):
+    messages = Message.objects.filter(
+        conversation_id=conversation_pk, pk__gt=after
+    ).order_by("pk")[:BACKLOG_LIMIT]
+
+    return [message.serialize() for message in messages]
+
+
+async def send_json_response(send, status, data):
+    body = json.dumps(data).encode()
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def message_poll(scope, receive, send, conversation_pk):
+    """Long-poll fallback of the realtime channel
+
+    GET /conversations/<pk>/poll?after=<message id>&timeout=<seconds>
+    Answers at once when messages newer than `after` exist, otherwise waits
+    for the next published message or the timeout (empty list).
+    """
+    if scope["method"] != "GET":
+        await send_json_response(send, 405, {"error": "Method not allowed"})
+        return
+
+    if not await authorize(scope, conversation_pk):
+        await send_json_response(send, 403, {"error": "Forbidden"})
+        return
+
+    params = get_query_params(scope)
+    after = get_int_param(params, "after", 0)
+    timeout = get_int_param(params, "timeout", POLL_TIMEOUT, POLL_MAX_TIMEOUT)
+
+    # Subscribe before reading the backlog so nothing slips in between
+    subscription = get_broker().subscribe(conversation_channel(conversation_pk))
+
+    try:
+        messages = await get_backlog(conversation_pk, after)
+
+        if not messages:
+            try:
+                payload = await subscription.get(timeout)
+                messages = [payload] if payload["id"] > after else []
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        subscription.close()
+
+    await send_json_response(send, 200, {"messages": messages})
+
+
+async def stream_socket(receive, send, subscription, after=0):
+    """Forward published payloads to an accepted WebSocket until disconnect
+    Payloads already sent as backlog (id <= after) are skipped
+    """
+
+    async def pump():
+        while True:
+            payload = await subscription.get()
+
+            if payload["id"] <= after:
+                continue
+
+            await send({"type": "websocket.send", "text": json.dumps(payload)})
+
+    pump_task = asyncio.ensure_future(pump())
+
+    try:
+        while True:
+            event = await receive()
+
+            if event["type"] == "websocket.disconnect":
+                break
+    finally:
+        pump_task.cancel()
+        subscription.close()
+
+
+async def message_socket(scope, receive, send, conversation_pk):
+    """WebSocket of the realtime channel
+
+    ws://<host>/conversations/<pk>/socket?after=<message id>
+    Sends the backlog newer than `after`, then every new message as JSON text.
+    """
+    event = await receive()
+
+    if event["type"] != "websocket.connect":
+        return
+
+    if not await authorize(scope, conversation_pk):
+        await send({"type": "websocket.close", "code": 4403})
+        return
+
+    await send({"type": "websocket.accept"})
+
+    subscription = get_broker().subscribe(conversation_channel(conversation_pk))
+    after = get_int_param(get_query_params(scope), "after", 0)
+
+    try:
+        for payload in await get_backlog(conversation_pk, after):
+            await send({"type": "websocket.send", "text": json.dumps(payload)})
+            after = payload["id"]
+    except Exception:
+        subscription.close()
+        raise
+
+    await stream_socket(receive, send, subscription, after)
+
+
+def get_consumer(scope):
+    """Return (consumer, conversation pk) for realtime scopes, else None"""
+    match = CONVERSATION_PATH.match(scope.get("path", ""))
+
+    if match is None:
+        return None
+
+    kind = match.group("kind")
+
+    if scope["type"] == "websocket" and kind == "socket":
+        return message_socket, int(match.group("pk"))
+
+    if scope["type"] == "http" and kind == "poll":
+        return message_poll, int(match.group("pk"))
+
+    return None
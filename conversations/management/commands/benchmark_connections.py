@@ -0,0 +1,98 @@
+import asyncio
+import time
+import tracemalloc
+from core.management.commands.custom_command import CustomCommand
+from conversations.broker import InMemoryBroker
+from conversations.consumers import stream_socket
+
+
+class IdleClient:
+    """Fake WebSocket client which stays connected until disconnect is called"""
+
+    def __init__(self, expected):
+        self.disconnected = asyncio.Event()
+        self.received = 0
+        self.expected = expected
+        self.done = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "websocket.disconnect"}
+
+    async def send(self, event):
+        self.received += 1
+
+        if self.received >= self.expected:
+            self.done.set()
+
+    def disconnect(self):
+        self.disconnected.set()
+
+
+class Command(CustomCommand):
+    help = "Benchmark idle realtime connections held by one worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connections", default=10000, help="Number of idle connections to open"
+        )
+        parser.add_argument(
+            "--messages", default=10, help="Number of messages fanned out to all"
+        )
+
+    def handle(self, *args, **options):
+        connections = int(options.get("connections"))
+        messages = int(options.get("messages"))
+
+        self.stdout.write(self.style.SUCCESS("■ START BENCHMARK IDLE CONNECTIONS"))
+
+        result = asyncio.run(self.run(connections, messages))
+
+        self.stdout.write(
+            f"■ CONNECTIONS       : {connections}\n"
+            f"■ OPEN TIME         : {result['open']:.3f}s\n"
+            f"■ MEMORY / CONN     : {result['memory'] / connections / 1024:.2f} KiB\n"
+            f"■ FAN-OUT / MESSAGE : {result['fanout'] / messages * 1000:.2f} ms\n"
+            f"■ CLOSE TIME        : {result['close']:.3f}s"
+        )
+        self.stdout.write(self.style.SUCCESS("■ SUCCESS BENCHMARK IDLE CONNECTIONS!"))
+
+    async def run(self, connections, messages):
+        broker = InMemoryBroker()
+        channel = "benchmark"
+        clients = [IdleClient(messages) for _ in range(connections)]
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+
+        tasks = [
+            asyncio.ensure_future(
+                stream_socket(client.receive, client.send, broker.subscribe(channel))
+            )
+            for client in clients
+        ]
+        await asyncio.sleep(0)
+
+        opened = time.perf_counter()
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        for idx in range(messages):
+            broker.publish(channel, {"id": idx + 1, "message": "benchmark"})
+
+        await asyncio.gather(*(client.done.wait() for client in clients))
+        fanned_out = time.perf_counter()
+
+        for client in clients:
+            client.disconnect()
+
+        await asyncio.gather(*tasks)
+        closed = time.perf_counter()
+
+        return {
+            "open": opened - started,
+            "memory": memory,
+            "fanout": fanned_out - opened,
+            "close": closed - fanned_out,
+        }
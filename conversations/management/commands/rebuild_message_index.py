@@ -0,0 +1,57 @@
+from core.management.commands.custom_command import CustomCommand
+from conversations.models import Message, MessageTerm
+from conversations.search import tokenize
+
+
+class Command(CustomCommand):
+    help = "Rebuild the message search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", default=1000, help="Number of messages indexed per batch"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            chunk_size = int(options.get("chunk_size"))
+
+            self.stdout.write(self.style.SUCCESS("■ START REBUILD MESSAGE INDEX"))
+
+            MessageTerm.objects.all().delete()
+            total = Message.objects.count()
+            messages = Message.objects.values_list(
+                "pk", "conversation_id", "message"
+            ).iterator(chunk_size=chunk_size)
+            terms = []
+            progress = self.progress(total, unit="messages")
+
+            done = 0
+
+            for pk, conversation_id, text in messages:
+                terms.extend(
+                    MessageTerm(
+                        term=term,
+                        count=count,
+                        message_id=pk,
+                        conversation_id=conversation_id,
+                    )
+                    for term, count in tokenize(text).items()
+                )
+
+                done += 1
+
+                if done % chunk_size == 0:
+                    MessageTerm.objects.bulk_create(terms, batch_size=chunk_size)
+                    terms = []
+                    progress.update(done)
+
+            # The last chunk is seldom full, and total may be stale by now
+            MessageTerm.objects.bulk_create(terms, batch_size=chunk_size)
+            progress.update(done)
+            progress.finish()
+
+            self.stdout.write(self.style.SUCCESS("■ SUCCESS REBUILD MESSAGE INDEX!"))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"■ {e}"))
+            self.stdout.write(self.style.ERROR("■ FAIL REBUILD MESSAGE INDEX"))
@@ -0,0 +1,56 @@
+# Generated by Django 2.2.13 on 2026-10-19 02:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0002_auto_20191222_2148"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MessageTerm",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=40)),
+                ("count", models.PositiveIntegerField(default=1)),
+                (
+                    "conversation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="conversations.Conversation",
+                    ),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="conversations.Message",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="messageterm",
+            index=models.Index(
+                fields=["term", "conversation"], name="conversatio_term_dc25d5_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="messageterm",
+            unique_together={("message", "term")},
+        ),
+    ]
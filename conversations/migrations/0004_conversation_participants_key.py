@@ -0,0 +1,39 @@
+# Generated by Django 2.2.13 on 2026-10-19 02:31
+
+import hashlib
+from django.db import migrations, models
+
+
+def fill_participants_key(apps, schema_editor):
+    """Set participants_key of every existing conversation"""
+    Conversation = apps.get_model("conversations", "Conversation")
+    Participant = Conversation.participants.through
+    participants = {}
+
+    for conversation_id, user_id in Participant.objects.values_list(
+        "conversation_id", "user_id"
+    ):
+        participants.setdefault(conversation_id, set()).add(user_id)
+
+    for conversation_id, user_pks in participants.items():
+        user_pks = ",".join(map(str, sorted(user_pks)))
+        key = hashlib.sha256(user_pks.encode()).hexdigest()
+        Conversation.objects.filter(pk=conversation_id).update(participants_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0003_message_term"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversation",
+            name="participants_key",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.RunPython(fill_participants_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.13 on 2026-10-19 03:50
+
+from django.db import migrations, models
+
+
+def fill_direct_key(apps, schema_editor):
+    """Set direct_key of the oldest conversation of each participants_key
+    The one get_or_create_for returns
+    """
+    Conversation = apps.get_model("conversations", "Conversation")
+    used_keys = set()
+
+    for pk, key in (
+        Conversation.objects.exclude(participants_key=None)
+        .order_by("pk")
+        .values_list("pk", "participants_key")
+    ):
+        if key not in used_keys:
+            used_keys.add(key)
+            Conversation.objects.filter(pk=pk).update(direct_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("conversations", "0004_conversation_participants_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversation",
+            name="direct_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(fill_direct_key, migrations.RunPython.noop),
+    ]
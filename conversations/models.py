@@ -1,7 +1,47 @@
-from django.db import models
+import hashlib
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, When
 from core.models import AbstractTimeStamp
 
 
+def make_participants_key(user_pks):
+    """Return canonical key of a participant set (sha256 of sorted user ids)"""
+    user_pks = sorted(set(user_pks))
+
+    if not user_pks:
+        return None
+
+    return hashlib.sha256(",".join(map(str, user_pks)).encode()).hexdigest()
+
+
+class ConversationManager(models.Manager):
+    def find(self, key):
+        """Return the oldest conversation of a participants_key, or None"""
+        return self.filter(participants_key=key).order_by("pk").first()
+
+    def get_or_create_for(self, *users):
+        """Return (conversation, created) with exactly these participants
+        One indexed lookup on participants_key. A created conversation gets
+        the unique direct_key too, so when concurrent calls both miss the
+        lookup the database rejects the second insert, which then finds
+        the first one's conversation
+        """
+        key = make_participants_key(user.pk for user in users)
+        conversation = self.find(key)
+
+        if conversation is not None:
+            return conversation, False
+
+        try:
+            with transaction.atomic():
+                conversation = self.create(participants_key=key, direct_key=key)
+                conversation.participants.add(*users)
+        except IntegrityError:
+            return self.find(key), False
+
+        return conversation, True
+
+
 class Conversation(AbstractTimeStamp):
     """Conversation Model
 
@@ -9,19 +49,31 @@ class Conversation(AbstractTimeStamp):
         AbstractTimeStamp
 
     Fields:
-        participants : User Model (N:N)
-        created_at   : DateTimeField
-        updated_at   : DateTimeField
+        participants     : User Model (N:N)
+        participants_key : CharField (indexed, kept in sync on participants change)
+        direct_key       : CharField (unique, participants_key of a conversation
+                           made by get_or_create_for, cleared once they change)
+        created_at       : DateTimeField
+        updated_at       : DateTimeField
 
     Method:
-        __str__            : join all participants username
-        count_messages     : return messages count
-        count_participants : return participants count
+        __str__                 : join all participants username
+        count_messages          : return messages count
+        count_participants      : return participants count
+        update_participants_key : recompute participants_key from database
     """
 
     participants = models.ManyToManyField(
         "users.User", related_name="conversation", blank=True
     )
+    participants_key = models.CharField(
+        max_length=64, null=True, blank=True, db_index=True, editable=False
+    )
+    direct_key = models.CharField(
+        max_length=64, null=True, blank=True, unique=True, editable=False
+    )
+
+    objects = ConversationManager()
 
     def __str__(self):
         usernames = [user.username for user in self.participants.all()]
@@ -38,6 +90,20 @@ class Conversation(AbstractTimeStamp):
 
     count_participants.short_description = "Number of Participants"
 
+    def update_participants_key(self):
+        user_pks = self.participants.values_list("pk", flat=True)
+        self.participants_key = make_participants_key(user_pks)
+        Conversation.objects.filter(pk=self.pk).update(
+            participants_key=self.participants_key,
+            # Kept while it matches, never set to a new value that may collide
+            direct_key=Case(
+                When(direct_key=self.participants_key, then=F("direct_key"))
+            ),
+        )
+
+        if self.direct_key != self.participants_key:
+            self.direct_key = None
+
 
 class Message(AbstractTimeStamp):
     """Message Model
@@ -53,7 +119,8 @@ class Message(AbstractTimeStamp):
         updated_at   : DateTimeField
 
     Method:
-        __str__ : return user and message
+        __str__   : return user and message
+        serialize : return JSON serializable dict for the realtime channel
     """
 
     message = models.TextField()
@@ -66,3 +133,42 @@ class Message(AbstractTimeStamp):
 
     def __str__(self):
         return f"{self.user} says: {self.message}"
+
+    def serialize(self):
+        return {
+            "id": self.pk,
+            "conversation": self.conversation_id,
+            "user": self.user_id,
+            "message": self.message,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class MessageTerm(models.Model):
+    """MessageTerm Model
+    Inverted index entry of conversations.search, one row per term of a message
+
+    Fields:
+        term         : CharField (indexed with conversation)
+        count        : PositiveIntegerField (term frequency in the message)
+        message      : Message Model (1:N)
+        conversation : Conversation Model (1:N, copy of message.conversation)
+    """
+
+    MAX_LENGTH = 40
+
+    term = models.CharField(max_length=MAX_LENGTH)
+    count = models.PositiveIntegerField(default=1)
+    message = models.ForeignKey(
+        "Message", related_name="terms", on_delete=models.CASCADE
+    )
+    conversation = models.ForeignKey(
+        "Conversation", related_name="terms", on_delete=models.CASCADE
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["term", "conversation"])]
+        unique_together = ("message", "term")
+
+    def __str__(self):
+        return self.term
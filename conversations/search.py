@@ -0,0 +1,60 @@
+import re
+from collections import Counter
+from django.db.models import Count, Sum
+from conversations.models import Conversation, Message, MessageTerm
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return {term: count} of a text, terms are lower cased word characters"""
+    terms = (
+        token[: MessageTerm.MAX_LENGTH] for token in TOKEN_PATTERN.findall(text.lower())
+    )
+
+    return Counter(terms)
+
+
+def index_message(message):
+    """Replace the inverted index entries of one message"""
+    MessageTerm.objects.filter(message=message).delete()
+    MessageTerm.objects.bulk_create(
+        [
+            MessageTerm(
+                term=term,
+                count=count,
+                message_id=message.pk,
+                conversation_id=message.conversation_id,
+            )
+            for term, count in tokenize(message.message).items()
+        ]
+    )
+
+
+def search_messages(user, query):
+    """Return ranked message ids matching query in user's conversations
+
+    Ranked by number of distinct matched terms, then summed term frequency,
+    then newest first. Each row is {"message_id", "matched", "score"}.
+    """
+    terms = list(tokenize(query))
+
+    if not terms:
+        return MessageTerm.objects.none().values("message_id")
+
+    conversations = Conversation.objects.filter(participants=user).values("pk")
+
+    return (
+        MessageTerm.objects.filter(term__in=terms, conversation__in=conversations)
+        .values("message_id")
+        .annotate(matched=Count("term"), score=Sum("count"))
+        .order_by("-matched", "-score", "-message_id")
+    )
+
+
+def get_messages(rows):
+    """Return Message objects of search rows keeping the ranking order"""
+    ids = [row["message_id"] for row in rows]
+    messages = Message.objects.select_related("user").in_bulk(ids)
+
+    return [messages[pk] for pk in ids if pk in messages]
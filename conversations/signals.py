@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import post_save, m2m_changed
+from django.dispatch import receiver
+from conversations.broker import get_broker, conversation_channel
+from conversations.models import Conversation, Message
+from conversations.search import index_message
+
+
+@receiver(post_save, sender=Message)
+def publish_message(sender, instance, created, **kwargs):
+    """Push a new message to the conversation's realtime channel
+    Published after commit so subscribers never see a rolled back message
+    """
+    if not created:
+        return
+
+    channel = conversation_channel(instance.conversation_id)
+    payload = instance.serialize()
+
+    transaction.on_commit(lambda: get_broker().publish(channel, payload))
+
+
+@receiver(post_save, sender=Message)
+def update_message_index(sender, instance, **kwargs):
+    """Keep the search index of a message in sync with its text"""
+    index_message(instance)
+
+
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def update_participants_key(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Conversation.participants_key in sync with participants"""
+    if action == "pre_clear" and reverse:
+        instance._cleared_conversations = list(
+            instance.conversation.values_list("pk", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        conversations = [instance]
+    elif action == "post_clear":
+        conversations = Conversation.objects.filter(
+            pk__in=getattr(instance, "_cleared_conversations", [])
+        )
+    else:
+        conversations = Conversation.objects.filter(pk__in=pk_set)
+
+    for conversation in conversations:
+        conversation.update_participants_key()
@@ -1,8 +1,11 @@
 from django.test import TestCase
-from django.db import IntegrityError
-from conversations.models import Conversation, Message
+from django.db import IntegrityError, transaction
+from django.core.management import call_command
+from conversations.models import Conversation, Message, MessageTerm
+from conversations.models import make_participants_key
 from users.models import User
 from datetime import datetime
+from io import StringIO
 from unittest import mock
 import pytz
 
@@ -113,6 +116,109 @@ class ConversationModelTest(TestCase):
 
         self.assertEqual(10, conversation.count_participants())
 
+    def test_conversation_participants_key(self):
+        """Conversation model participants_key field test
+        Check key follows participants add, remove and clear in both directions
+        """
+        conversation = Conversation.objects.get(id=1)
+        first = User.objects.create_user("test_user_1")
+        second = User.objects.create_user("test_user_2")
+
+        self.assertIsNone(conversation.participants_key)
+
+        conversation.participants.add(second, first)
+        conversation.refresh_from_db()
+        self.assertEqual(
+            make_participants_key([first.pk, second.pk]), conversation.participants_key
+        )
+
+        second.conversation.remove(conversation)
+        conversation.refresh_from_db()
+        self.assertEqual(
+            make_participants_key([first.pk]), conversation.participants_key
+        )
+
+        first.conversation.clear()
+        conversation.refresh_from_db()
+        self.assertIsNone(conversation.participants_key)
+
+    def test_conversation_get_or_create_for(self):
+        """Conversation manager get_or_create_for method test
+        Check same participant set returns existing conversation in one query
+        """
+        first = User.objects.create_user("test_user_1")
+        second = User.objects.create_user("test_user_2")
+
+        conversation, created = Conversation.objects.get_or_create_for(first, second)
+        self.assertTrue(created)
+        self.assertEqual(2, conversation.count_participants())
+
+        with self.assertNumQueries(1):
+            found, created = Conversation.objects.get_or_create_for(second, first)
+
+        self.assertFalse(created)
+        self.assertEqual(conversation, found)
+
+    def test_conversation_get_or_create_for_race(self):
+        """Conversation manager get_or_create_for concurrent creation test
+        Check the unique direct_key rejects a second conversation created
+        between lookup and insert, and the first one is returned
+        """
+        first = User.objects.create_user("test_user_1")
+        second = User.objects.create_user("test_user_2")
+        existing, created = Conversation.objects.get_or_create_for(first, second)
+        count = Conversation.objects.count()
+        lookups = [None]
+
+        with mock.patch.object(
+            Conversation.objects,
+            "find",
+            side_effect=lambda key: lookups.pop(0) if lookups else existing,
+        ):
+            found, created = Conversation.objects.get_or_create_for(first, second)
+
+        self.assertFalse(created)
+        self.assertEqual(existing, found)
+        self.assertEqual(count, Conversation.objects.count())
+
+    def test_conversation_direct_key(self):
+        """Conversation model direct_key field test
+        Check the key is unique and dropped once participants change
+        """
+        first = User.objects.create_user("test_user_1")
+        second = User.objects.create_user("test_user_2")
+        conversation, created = Conversation.objects.get_or_create_for(first, second)
+        key = make_participants_key([first.pk, second.pk])
+        self.assertEqual(key, conversation.direct_key)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Conversation.objects.create(direct_key=key)
+
+        conversation.participants.remove(second)
+        conversation.refresh_from_db()
+        self.assertIsNone(conversation.direct_key)
+
+        created = Conversation.objects.get_or_create_for(first, second)[1]
+        self.assertTrue(created)
+
+    def test_conversation_same_participants(self):
+        """Conversation model participants_key field test
+        Check several conversations may share participants, the oldest is found
+        """
+        first = User.objects.create_user("test_user_1")
+        second = User.objects.create_user("test_user_2")
+        conversations = [Conversation.objects.create() for _ in range(2)]
+
+        for conversation in conversations:
+            # One at a time, both conversations pass through the same sets
+            conversation.participants.add(first)
+            conversation.participants.add(second)
+
+        found, created = Conversation.objects.get_or_create_for(first, second)
+
+        self.assertFalse(created)
+        self.assertEqual(conversations[0], found)
+
 
 class MessageModelTest(TestCase):
     @classmethod
@@ -199,3 +305,24 @@ class MessageModelTest(TestCase):
             message.save()
             self.assertEqual("Update Message 1", message.message)
             self.assertEqual(message.updated_at, mocked)
+
+    def test_rebuild_message_index_command(self):
+        """rebuild_message_index command test
+        Check the last, partial chunk is indexed, even past a stale count
+        """
+        message = Message.objects.get(id=1)
+
+        for text in ("Second message", "Third message"):
+            Message.objects.create(
+                message=text, user=message.user, conversation=message.conversation
+            )
+
+        terms = set(MessageTerm.objects.values_list("message", "term", "count"))
+
+        with mock.patch("conversations.models.Message.objects.count", return_value=1):
+            call_command("rebuild_message_index", "--chunk-size=2", stdout=StringIO())
+
+        self.assertEqual(
+            terms, set(MessageTerm.objects.values_list("message", "term", "count"))
+        )
+        self.assertEqual(3, len({term[0] for term in terms}))
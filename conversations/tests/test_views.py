@@ -0,0 +1,320 @@
+from django.test import TestCase, TransactionTestCase
+from django.conf import settings
+from asgiref.sync import async_to_sync
+from conversations.broker import InMemoryBroker, get_broker, conversation_channel
+from conversations.consumers import message_poll, message_socket, get_consumer
+from conversations.models import Conversation, Message
+from conversations.search import search_messages, get_messages
+from users.models import User
+from unittest import mock
+import asyncio
+import json
+
+
+class ASGIClient:
+    """Collect events sent by an ASGI consumer"""
+
+    def __init__(self, events=()):
+        self.events = list(events)
+        self.sent = []
+
+    async def receive(self):
+        if self.events:
+            return self.events.pop(0)
+
+        await asyncio.sleep(0.05)
+        return {"type": "websocket.disconnect"}
+
+    async def send(self, event):
+        self.sent.append(event)
+
+
+def make_scope(scope_type, path, cookie="", query_string=b"", method="GET"):
+    return {
+        "type": scope_type,
+        "path": path,
+        "method": method,
+        "query_string": query_string,
+        "headers": [(b"cookie", cookie.encode())],
+    }
+
+
+class BrokerTest(TestCase):
+    def test_broker_publish_to_subscribers(self):
+        """InMemoryBroker publish test
+        Check every subscription of the channel receives the payload
+        """
+        broker = InMemoryBroker()
+
+        async def run():
+            first = broker.subscribe("test")
+            second = broker.subscribe("test")
+            other = broker.subscribe("other")
+            broker.publish("test", {"id": 1})
+
+            self.assertEqual({"id": 1}, await first.get(1))
+            self.assertEqual({"id": 1}, await second.get(1))
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await other.get(0.01)
+
+        async_to_sync(run)()
+
+    def test_broker_unsubscribe(self):
+        """InMemoryBroker unsubscribe test
+        Check closed subscription is removed from broker
+        """
+        broker = InMemoryBroker()
+
+        async def run():
+            subscription = broker.subscribe("test")
+            self.assertEqual(1, broker.count_subscriptions("test"))
+            subscription.close()
+            self.assertEqual(0, broker.count_subscriptions())
+
+        async_to_sync(run)()
+
+    def test_get_consumer(self):
+        """Realtime consumer routing test
+        Check socket / poll path resolve to right consumer
+        """
+        self.assertEqual(
+            (message_socket, 1),
+            get_consumer(make_scope("websocket", "/conversations/1/socket")),
+        )
+        self.assertEqual(
+            (message_poll, 2), get_consumer(make_scope("http", "/conversations/2/poll"))
+        )
+        self.assertIsNone(get_consumer(make_scope("http", "/conversations/2/socket")))
+        self.assertIsNone(get_consumer(make_scope("http", "/")))
+
+
+class RealtimeViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running RealtimeViewTest
+        Create conversation between host and guest with two messages
+        """
+        host = User.objects.create_user(username="host", password="testtest")
+        guest = User.objects.create_user(username="guest", password="testtest")
+        User.objects.create_user(username="stranger", password="testtest")
+        conversation = Conversation.objects.create()
+        conversation.participants.add(host, guest)
+
+        cls.conversation = conversation
+        cls.hello = Message.objects.create(
+            message="Hello", user=guest, conversation=conversation
+        )
+        cls.welcome = Message.objects.create(
+            message="Welcome", user=host, conversation=conversation
+        )
+
+    def setUp(self):
+        get_broker.cache_clear()
+        self.pk = self.conversation.pk
+        self.channel = conversation_channel(self.pk)
+
+    def get_cookie(self, username):
+        self.client.login(username=username, password="testtest")
+        session_key = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        return f"{settings.SESSION_COOKIE_NAME}={session_key}"
+
+    def test_poll_backlog(self):
+        """Long-poll consumer backlog test
+        Check messages after `after` id are returned at once
+        """
+        scope = make_scope(
+            "http",
+            f"/conversations/{self.pk}/poll",
+            self.get_cookie("guest"),
+            f"after={self.hello.pk}".encode(),
+        )
+        client = ASGIClient()
+        async_to_sync(message_poll)(scope, client.receive, client.send, self.pk)
+
+        self.assertEqual(200, client.sent[0]["status"])
+        data = json.loads(client.sent[1]["body"])
+        self.assertEqual(["Welcome"], [m["message"] for m in data["messages"]])
+
+    def test_poll_timeout(self):
+        """Long-poll consumer timeout test
+        Check empty message list is returned when nothing is published
+        """
+        scope = make_scope(
+            "http",
+            f"/conversations/{self.pk}/poll",
+            self.get_cookie("guest"),
+            f"after={self.welcome.pk}&timeout=0".encode(),
+        )
+        client = ASGIClient()
+        async_to_sync(message_poll)(scope, client.receive, client.send, self.pk)
+
+        self.assertEqual({"messages": []}, json.loads(client.sent[1]["body"]))
+
+    def test_poll_wait_published_message(self):
+        """Long-poll consumer publish test
+        Check poll answers with the message published while waiting
+        """
+        scope = make_scope(
+            "http",
+            f"/conversations/{self.pk}/poll",
+            self.get_cookie("host"),
+            f"after={self.welcome.pk}".encode(),
+        )
+        client = ASGIClient()
+        message = {"id": self.welcome.pk + 1, "message": "Hi"}
+
+        async def run():
+            poll = asyncio.ensure_future(
+                message_poll(scope, client.receive, client.send, self.pk)
+            )
+            while get_broker().count_subscriptions(self.channel) == 0:
+                await asyncio.sleep(0.01)
+            get_broker().publish(self.channel, message)
+            await poll
+
+        async_to_sync(run)()
+
+        data = json.loads(client.sent[1]["body"])
+        self.assertEqual([message], data["messages"])
+
+    def test_poll_forbidden(self):
+        """Long-poll consumer permission test
+        Check non participant and anonymous user get 403
+        """
+        for cookie in (self.get_cookie("stranger"), ""):
+            scope = make_scope("http", f"/conversations/{self.pk}/poll", cookie)
+            client = ASGIClient()
+            async_to_sync(message_poll)(scope, client.receive, client.send, self.pk)
+            self.assertEqual(403, client.sent[0]["status"])
+
+    def test_socket_backlog_and_publish(self):
+        """WebSocket consumer test
+        Check socket is accepted, sends backlog and published messages
+        """
+        scope = make_scope(
+            "websocket", f"/conversations/{self.pk}/socket", self.get_cookie("guest")
+        )
+        client = ASGIClient([{"type": "websocket.connect"}])
+        # Already sent in the backlog, then a new one
+        duplicate = {"id": self.welcome.pk, "message": "Dup"}
+        new = {"id": self.welcome.pk + 1, "message": "New"}
+
+        async def run():
+            socket = asyncio.ensure_future(
+                message_socket(scope, client.receive, client.send, self.pk)
+            )
+            while get_broker().count_subscriptions(self.channel) == 0:
+                await asyncio.sleep(0.01)
+            get_broker().publish(self.channel, duplicate)
+            get_broker().publish(self.channel, new)
+            await socket
+
+        async_to_sync(run)()
+
+        self.assertEqual("websocket.accept", client.sent[0]["type"])
+        messages = [json.loads(event["text"])["message"] for event in client.sent[1:]]
+        self.assertEqual(["Hello", "Welcome", "New"], messages)
+        self.assertEqual(0, get_broker().count_subscriptions())
+
+    def test_socket_forbidden(self):
+        """WebSocket consumer permission test
+        Check socket of non participant is closed
+        """
+        scope = make_scope(
+            "websocket", f"/conversations/{self.pk}/socket", self.get_cookie("stranger")
+        )
+        client = ASGIClient([{"type": "websocket.connect"}])
+        async_to_sync(message_socket)(scope, client.receive, client.send, self.pk)
+
+        self.assertEqual([{"type": "websocket.close", "code": 4403}], client.sent)
+
+
+class MessagePublishTest(TransactionTestCase):
+    def test_message_published_on_commit(self):
+        """Message post_save signal test
+        Check created message is published to the conversation channel
+        """
+        user = User.objects.create_user(username="test_user")
+        conversation = Conversation.objects.create()
+
+        with mock.patch("conversations.signals.get_broker") as mocked_broker:
+            message = Message.objects.create(
+                message="Hello", user=user, conversation=conversation
+            )
+
+        mocked_broker.return_value.publish.assert_called_once_with(
+            conversation_channel(conversation.pk), message.serialize()
+        )
+
+
+class MessageSearchViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running MessageSearchViewTest
+        Create two conversations, user participates only in the first one
+        """
+        user = User.objects.create_user(username="user", password="testtest")
+        other = User.objects.create_user(username="other", password="testtest")
+        mine = Conversation.objects.create()
+        mine.participants.add(user, other)
+        theirs = Conversation.objects.create()
+        theirs.participants.add(other)
+
+        Message.objects.create(
+            message="Is the room near the beach?", user=user, conversation=mine
+        )
+        Message.objects.create(
+            message="Beach, beach and more beach room", user=other, conversation=mine
+        )
+        Message.objects.create(message="Parking only", user=other, conversation=mine)
+        Message.objects.create(
+            message="Secret beach room", user=other, conversation=theirs
+        )
+
+    def test_search_messages_ranked(self):
+        """search_messages function test
+        Check only user's conversations are searched and results are ranked
+        """
+        user = User.objects.get(username="user")
+        rows = search_messages(user, "Beach room")
+        messages = [message.message for message in get_messages(rows)]
+
+        self.assertEqual(
+            ["Beach, beach and more beach room", "Is the room near the beach?"],
+            messages,
+        )
+
+    def test_message_index_updated(self):
+        """Message search index update test
+        Check edited message is searched with its new text only
+        """
+        user = User.objects.get(username="user")
+        message = Message.objects.get(message="Parking only")
+        message.message = "Garage only"
+        message.save()
+
+        self.assertFalse(search_messages(user, "parking").exists())
+        self.assertEqual(1, search_messages(user, "garage").count())
+
+    def test_message_search_view(self):
+        """MessageSearchView test
+        Check matching messages are rendered with pagination
+        """
+        self.client.login(username="user", password="testtest")
+        response = self.client.get("/conversations/search/", {"q": "beach"})
+        html = response.content.decode("utf8")
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn("<title>Search Messages | Airbnb</title>", html)
+        self.assertIn("Is the room near the beach?", html)
+        self.assertNotIn("Secret beach room", html)
+        self.assertEqual(2, len(response.context["messages_found"]))
+
+    def test_message_search_view_logged_out(self):
+        """MessageSearchView logged out test
+        Check anonymous user is redirected to login page
+        """
+        response = self.client.get("/conversations/search/", {"q": "beach"})
+        self.assertEqual(302, response.status_code)
@@ -0,0 +1,6 @@
+from django.urls import path
+from conversations.views import MessageSearchView
+
+app_name = "conversations"
+
+urlpatterns = [path("search/", MessageSearchView.as_view(), name="search")]
@@ -1,3 +1,29 @@
+from django.core.paginator import Paginator
 from django.shortcuts import render
+from django.views.generic import View
+from conversations.search import search_messages, get_messages
+from users.mixins import LoggedInOnlyView
 
-# Create your views here.
+
+class MessageSearchView(LoggedInOnlyView, View):
+    """conversations application MessageSearchView class
+    Display ranked messages of the user's conversations matching `q`
+
+    Inherit        : LoggedInOnlyView, View
+    paginate_by    : 20
+    Templates name : conversations/message_search.html
+    """
+
+    paginate_by = 20
+
+    def get(self, request):
+        query = request.GET.get("q", "").strip()
+        context = {"query": query}
+
+        if query:
+            rows = search_messages(request.user, query)
+            page = Paginator(rows, self.paginate_by).get_page(request.GET.get("page"))
+            context["page_obj"] = page
+            context["messages_found"] = get_messages(page.object_list)
+
+        return render(request, "conversations/message_search.html", context)
@@ -1,3 +1,54 @@
 from django.contrib import admin
+from django.utils import timezone
+from core.exports import EXPORTS, FORMAT_CSV, FORMAT_JSONL, export_response
+from core.models import OutgoingEmail
 
-# Register your models here.
+
+class ExportActionsMixin:
+    """Add actions streaming the selected rows of an export
+
+    Fields:
+        export_name : key of the export in core.exports.EXPORTS
+
+    Admin action:
+        export_csv   : download selected rows as CSV
+        export_jsonl : download selected rows as JSON lines
+    """
+
+    export_name = None
+    actions = ("export_csv", "export_jsonl")
+
+    def export_csv(self, request, queryset):
+        return export_response(EXPORTS[self.export_name], FORMAT_CSV, queryset)
+
+    export_csv.short_description = "Export selected as CSV"
+
+    def export_jsonl(self, request, queryset):
+        return export_response(EXPORTS[self.export_name], FORMAT_JSONL, queryset)
+
+    export_jsonl.short_description = "Export selected as JSON lines"
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Register OutgoingEmail model at admin panel
+
+    Filter by:
+        status : CharField
+
+    Admin action:
+        retry : queue selected emails again for immediate delivery
+    """
+
+    list_display = ("subject", "to", "status", "attempts", "send_after", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to", "subject")
+    actions = ("retry",)
+
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=OutgoingEmail.STATUS_SENT).update(
+            status=OutgoingEmail.STATUS_PENDING, send_after=timezone.now()
+        )
+        self.message_user(request, f"{updated} emails queued again")
+
+    retry.short_description = "Retry selected emails"
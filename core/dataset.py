@@ -0,0 +1,271 @@
+import numpy as np
+from datetime import date, time
+from itertools import accumulate
+from random import Random
+from faker import Faker
+from reservations.generator import generate_stays
+
+# Chunks are the unit of work of a process and of a loading transaction
+CHUNK_SIZE = 1000
+USERS_PER_SCALE = 50
+ROOMS_PER_SCALE = 100
+
+# Faker is slow, texts are drawn from pools generated once per dataset
+POOL_SIZE = 500
+CITY_COUNT = 1000
+
+# City of rank k is picked with weight 1 / k ** ZIPF_EXPONENT
+ZIPF_EXPONENT = 1.07
+# Reviews per room follow a Pareto law, most rooms have none, a few hundreds
+REVIEWS_PARETO_ALPHA = 1.2
+MAX_REVIEWS_PER_ROOM = 500
+LIST_RATE = 0.3
+RESERVATIONS_START = date(2020, 1, 1)
+RESERVATIONS_DAYS = 730
+
+LIST_NAMES = ["My Wishlist", "Holidays", "Weekend", "Business trips", "Someday"]
+
+
+class Dataset:
+    """Reproducible fake dataset of every model, generated in chunks
+
+    Each chunk draws from its own Random seeded by (seed, kind, index) and
+    derives primary keys from its position, so chunks can be generated by
+    any process in any order and still give the same rows. Rows are plain
+    dicts, the Dataset never touches the database or the models.
+
+    Fields:
+        scale     : size unit, USERS_PER_SCALE users and ROOMS_PER_SCALE rooms
+        seed      : seed of the text pools and of every chunk
+        first_pks : first primary key of users, rooms and lists
+        choices   : pks of room types, amenities, facilities, house rules
+                    and values of genders, languages, currencies, statuses
+
+    Method:
+        tasks    : return (kind, index) of every chunk in loading order
+        generate : return rows of a chunk by model
+    """
+
+    def __init__(self, scale, seed, first_pks, choices):
+        self.seed = seed
+        self.first_pks = first_pks
+        self.choices = choices
+        self.counts = {
+            "users": USERS_PER_SCALE * scale,
+            "rooms": ROOMS_PER_SCALE * scale,
+            "lists": USERS_PER_SCALE * scale,
+        }
+        self.build_pools()
+
+    def build_pools(self):
+        faker = Faker()
+        faker.seed_instance(self.seed)
+        pool = range(POOL_SIZE)
+
+        self.first_names = [faker.first_name() for _ in pool]
+        self.last_names = [faker.last_name() for _ in pool]
+        self.bios = [faker.text(max_nb_chars=120) for _ in pool]
+        self.names = [faker.address()[:140] for _ in pool]
+        self.descriptions = [faker.text() for _ in pool]
+        self.addresses = [faker.street_address() for _ in pool]
+        # faker.time_object depends on the current time, it isn't reproducible
+        self.times = [
+            time(faker.random_int(0, 23), faker.random_element((0, 30))) for _ in pool
+        ]
+        self.captions = [faker.sentence()[:80] for _ in pool]
+        self.reviews = [faker.text(max_nb_chars=200) for _ in pool]
+        self.cities = [
+            (str.capitalize(faker.city()), faker.country_code())
+            for _ in range(CITY_COUNT)
+        ]
+        self.city_weights = list(
+            accumulate(1 / rank**ZIPF_EXPONENT for rank in range(1, CITY_COUNT + 1))
+        )
+
+    def tasks(self):
+        # Users first, rooms and lists point to them
+        for kind in ("users", "rooms", "lists"):
+            for index in range(-(-self.counts[kind] // CHUNK_SIZE)):
+                yield kind, index
+
+    def generate(self, task):
+        kind, index = task
+        offset = index * CHUNK_SIZE
+        count = min(CHUNK_SIZE, self.counts[kind] - offset)
+        rng = Random(f"{self.seed}:{kind}:{index}")
+
+        return getattr(self, f"generate_{kind}")(rng, offset, count)
+
+    def pk_range(self, kind, offset=0, count=None):
+        first = self.first_pks[kind] + offset
+        return range(first, first + (self.counts[kind] if count is None else count))
+
+    def generate_users(self, rng, offset, count):
+        users = []
+
+        for pk in self.pk_range("users", offset, count):
+            first_name = rng.choice(self.first_names)
+            last_name = rng.choice(self.last_names)
+            email = f"{first_name}.{last_name}.{pk}@example.com".lower()
+            users.append(
+                {
+                    "pk": pk,
+                    "username": email,
+                    "email": email,
+                    # Unusable, seeded users can't log in
+                    "password": f"!seed{self.seed}",
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "bio": rng.choice(self.bios),
+                    "gender": rng.choice(self.choices["genders"]),
+                    "language": rng.choice(self.choices["languages"]),
+                    "currency": rng.choice(self.choices["currencies"]),
+                    "is_superhost": rng.random() < 0.1,
+                    "email_verified": True,
+                }
+            )
+
+        return {"users": users}
+
+    def generate_rooms(self, rng, offset, count):
+        rows = {
+            "rooms": [],
+            "photos": [],
+            "amenities": [],
+            "facilities": [],
+            "house_rules": [],
+            "reviews": [],
+            "reservations": [],
+        }
+        users = self.pk_range("users")
+        cities = rng.choices(self.cities, cum_weights=self.city_weights, k=count)
+
+        for pk, (city, country) in zip(self.pk_range("rooms", offset, count), cities):
+            rows["rooms"].append(
+                {
+                    "pk": pk,
+                    "name": rng.choice(self.names),
+                    "description": rng.choice(self.descriptions),
+                    "country": country,
+                    "city": city,
+                    "price": rng.randint(1, 300),
+                    "address": rng.choice(self.addresses),
+                    "guests": rng.randint(1, 10),
+                    "beds": rng.randint(1, 5),
+                    "bedrooms": rng.randint(1, 5),
+                    "baths": rng.randint(1, 5),
+                    "check_in": rng.choice(self.times),
+                    "check_out": rng.choice(self.times),
+                    "instant_book": rng.random() < 0.5,
+                    "host_id": rng.choice(users),
+                    "room_type_id": rng.choice(self.choices["room_types"] or [None]),
+                }
+            )
+            rows["photos"] += [
+                {
+                    "caption": rng.choice(self.captions),
+                    "file": f"room_photos/{rng.randint(1, 31)}.webp",
+                    "room_id": pk,
+                }
+                for _ in range(rng.randint(7, 27))
+            ]
+
+            for key in ("amenities", "facilities", "house_rules"):
+                rows[key] += [
+                    (pk, item) for item in self.choices[key] if rng.random() < 0.5
+                ]
+
+            rows["reviews"] += self.make_reviews(rng, pk, users)
+
+        rows["reservations"] = self.make_reservations(
+            rng, self.pk_range("rooms", offset, count), users
+        )
+
+        return rows
+
+    def make_reviews(self, rng, room_pk, users):
+        count = min(
+            int(rng.paretovariate(REVIEWS_PARETO_ALPHA)) - 1, MAX_REVIEWS_PER_ROOM
+        )
+        reviews = []
+
+        for _ in range(count):
+            # Scores of a review go together around the reviewer's mood
+            mood = rng.randint(2, 5)
+            scores = {
+                field: max(1, min(5, mood + rng.randint(-1, 1)))
+                for field in (
+                    "accuracy",
+                    "communication",
+                    "cleanliness",
+                    "location",
+                    "check_in",
+                    "value",
+                )
+            }
+            reviews.append(
+                {
+                    "review": rng.choice(self.reviews),
+                    "user_id": rng.choice(users),
+                    "room_id": room_pk,
+                    **scores,
+                }
+            )
+
+        return reviews
+
+    def make_reservations(self, rng, room_pks, users):
+        # NumPy generator of the chunk, seeded from its Random
+        np_rng = np.random.default_rng(rng.getrandbits(64))
+        rooms, check_ins, nights = generate_stays(
+            np_rng, len(room_pks), RESERVATIONS_START, RESERVATIONS_DAYS
+        )
+        first_day = np.datetime64(RESERVATIONS_START, "D")
+
+        return [
+            {
+                "status": status,
+                "check_in": check_in,
+                "check_out": check_out,
+                "guest_id": guest_pk,
+                "room_id": room_pks[room],
+            }
+            for room, check_in, check_out, status, guest_pk in zip(
+                rooms.tolist(),
+                (first_day + check_ins).tolist(),
+                (first_day + check_ins + nights).tolist(),
+                np_rng.choice(self.choices["statuses"], len(rooms)).tolist(),
+                np_rng.choice(users, len(rooms)).tolist(),
+            )
+        ]
+
+    def generate_lists(self, rng, offset, count):
+        rows = {"lists": [], "list_rooms": []}
+        rooms = self.pk_range("rooms")
+        user_pks = self.pk_range("users", offset, count)
+
+        # At most one list per user, its pk follows the user's so chunks agree
+        for user_pk, pk in zip(user_pks, self.pk_range("lists", offset, count)):
+            if rng.random() >= LIST_RATE:
+                continue
+
+            rows["lists"].append(
+                {"pk": pk, "name": rng.choice(LIST_NAMES), "user_id": user_pk}
+            )
+            size = min(rng.randint(1, 20), len(rooms))
+            rows["list_rooms"] += [(pk, room) for room in rng.sample(rooms, size)]
+
+        return rows
+
+
+# Dataset of a worker process, set once by init_worker
+_dataset = None
+
+
+def init_worker(dataset):
+    global _dataset
+    _dataset = dataset
+
+
+def generate_chunk(task):
+    return _dataset.generate(task)
@@ -1,7 +1,19 @@
 from django.core.management.base import BaseCommand
+from core.progress import INTERVAL, Progress
 
 
 class CustomCommand(BaseCommand):
+    def progress(self, total, prefix="■ PROGRESS", unit="items", interval=INTERVAL):
+        """Return a Progress bar of total items written to stdout"""
+        return Progress(
+            self.stdout,
+            total,
+            prefix=prefix,
+            unit=unit,
+            interval=interval,
+            style_func=self.style.SUCCESS,
+        )
+
     def progress_bar(
         self,
         iteration,
@@ -13,16 +25,22 @@ class CustomCommand(BaseCommand):
         fill="█",
         printEnd="\r",
     ):
-        percent = ("{0:." + str(decimals) + "f}").format(
-            100 * (iteration / float(total))
-        )
-        filledLength = int(length * iteration // total)
-        bar = fill * filledLength + "-" * (length - filledLength)
+        """Draw iteration out of total, through a Progress kept between calls
 
-        self.stdout.write(
-            self.style.SUCCESS("\r%s |%s| %s%% %s" % (prefix, bar, percent, suffix)),
-            ending=printEnd,
-        )
+        A new Progress starts when total changes or iteration goes back.
+        printEnd is left for older callers, Progress picks line endings.
+        """
+        progress = getattr(self, "_progress", None)
+
+        if progress is None or progress.total != total or iteration < progress.done:
+            progress = self._progress = Progress(
+                self.stdout,
+                total,
+                prefix=prefix,
+                length=length,
+                style_func=self.style.SUCCESS,
+                fill=fill,
+                decimals=decimals,
+            )
 
-        if iteration == total:
-            self.stdout.write("\n")
+        progress.update(iteration, suffix)
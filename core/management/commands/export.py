@@ -0,0 +1,60 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.exports import (
+    CHUNK_SIZE,
+    EXPORTS,
+    FORMAT_CSV,
+    FORMATS,
+    buffered,
+    format_lines,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream rooms, reservations or reviews into a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(EXPORTS), help="Export to run")
+        parser.add_argument("--format", default=FORMAT_CSV, choices=FORMATS)
+        parser.add_argument(
+            "--output", help="File to write, standard output if not given"
+        )
+        parser.add_argument(
+            "--chunk-size", default=CHUNK_SIZE, help="Number of rows per fetch"
+        )
+
+    def handle(self, *args, **options):
+        export = EXPORTS[options.get("name")]
+        path = options.get("output")
+        started = time.perf_counter()
+        exported = 0
+
+        def count(rows):
+            nonlocal exported
+
+            for exported, row in enumerate(rows, 1):
+                yield row
+
+        rows = count(export.rows(chunk_size=int(options.get("chunk_size"))))
+        chunks = buffered(format_lines(export.headers, rows, options.get("format")))
+
+        if not path:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"■ START EXPORT {export.name.upper()}"))
+
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as output:
+                output.writelines(chunks)
+        except OSError as e:
+            raise CommandError(f"■ {e}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"■ EXPORTED {exported} ROWS TO {path} IN {elapsed:.1f}s"
+            )
+        )
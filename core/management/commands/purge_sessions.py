@@ -0,0 +1,30 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions in chunks without locking the session table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", default=5000, help="Number of sessions deleted per query"
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = int(options.get("chunk_size"))
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        purged = 0
+
+        while True:
+            with transaction.atomic():
+                keys = list(expired.values_list("session_key", flat=True)[:chunk_size])
+                Session.objects.filter(session_key__in=keys).delete()
+
+            purged += len(keys)
+
+            if len(keys) < chunk_size:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"■ PURGED {purged} SESSIONS"))
@@ -0,0 +1,59 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.seeding import BATCH_SIZE
+from core.snapshots import (
+    FORMAT_SQLITE,
+    SnapshotError,
+    get_format,
+    load,
+    restore_sqlite,
+)
+
+
+class Command(BaseCommand):
+    help = "Replace every table of the database with a snapshot file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Snapshot file made by the snapshot command")
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Do NOT prompt the user for input of any kind",
+        )
+        parser.add_argument(
+            "--batch-size", default=BATCH_SIZE, help="Number of rows per insert"
+        )
+
+    def handle(self, *args, **options):
+        path = options.get("path")
+
+        if options.get("interactive"):
+            confirm = input(
+                "This will replace ALL data of the database with the snapshot.\n"
+                "Type 'yes' to continue, or 'no' to cancel: "
+            )
+
+            if confirm != "yes":
+                self.stdout.write("■ RESTORE CANCELLED")
+                return
+
+        started = time.perf_counter()
+
+        self.stdout.write(self.style.SUCCESS(f"■ START RESTORE {path}"))
+
+        try:
+            if get_format(path) == FORMAT_SQLITE:
+                restore_sqlite(path)
+                restored = "DATABASE"
+            else:
+                counts = load(path, int(options.get("batch_size")))
+                restored = f"{sum(counts.values())} ROWS OF {len(counts)} TABLES"
+        except (OSError, SnapshotError) as e:
+            raise CommandError(f"■ {e}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"■ RESTORED {restored} IN {elapsed:.1f}s")
+        )
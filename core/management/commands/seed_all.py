@@ -0,0 +1,160 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from core.dataset import Dataset, generate_chunk, init_worker
+from core.management.commands.custom_command import CustomCommand
+from core.seeding import BATCH_SIZE, bulk_insert, bulk_insert_m2m
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from lists.models import List
+from reservations.models import Reservation
+from reviews.models import Review
+from rooms.management.commands.seed_amenities import AMENITIES
+from rooms.management.commands.seed_facilities import FACILITIES
+from rooms.management.commands.seed_room_types import ROOM_TYPES
+from rooms.models import Room, RoomType, Photo, Amenity, Facility, HouseRule
+from users.models import User
+
+HOUSE_RULES = [
+    "No smoking",
+    "No pets",
+    "No parties or events",
+    "Not suitable for children",
+    "Quiet hours after 10 PM",
+]
+
+ROWS = (
+    ("users", User),
+    ("rooms", Room),
+    ("photos", Photo),
+    ("reviews", Review),
+    ("reservations", Reservation),
+    ("lists", List),
+)
+
+M2M_ROWS = (
+    ("amenities", Room, "amenities"),
+    ("facilities", Room, "facilities"),
+    ("house_rules", Room, "house_rules"),
+    ("list_rooms", List, "rooms"),
+)
+
+
+class Command(CustomCommand):
+    help = "Create a reproducible dataset of every model at once"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", default=1, help="Dataset size, 50 users and 100 rooms per unit"
+        )
+        parser.add_argument("--seed", default=0, help="Same seed, same dataset")
+        parser.add_argument(
+            "--workers", default=os.cpu_count(), help="Number of generating processes"
+        )
+        parser.add_argument(
+            "--batch-size", default=BATCH_SIZE, help="Number of rows per insert"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scale = int(options.get("scale"))
+            seed = int(options.get("seed"))
+            workers = int(options.get("workers"))
+            batch_size = int(options.get("batch_size"))
+
+            self.stdout.write(self.style.SUCCESS("■ START SEED ALL"))
+
+            dataset = Dataset(scale, seed, self.get_first_pks(), self.get_choices())
+            tasks = list(dataset.tasks())
+            progress = self.progress(len(tasks), unit="chunks")
+
+            for rows in self.generate(dataset, tasks, workers):
+                with transaction.atomic():
+                    self.load(rows, batch_size)
+
+                progress.advance()
+
+            self.reset_sequences()
+            # bulk_create skips the signals keeping room_count up to date
+            User.objects.refresh_counts()
+
+            self.stdout.write(self.style.SUCCESS("■ SUCCESS SEED ALL!"))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"■ {e}"))
+            self.stdout.write(self.style.ERROR("■ FAIL SEED ALL"))
+
+    def get_first_pks(self):
+        """Rows are appended after existing ones, so an empty database always
+        gets the same primary keys"""
+        return {
+            kind: (model.objects.aggregate(last_pk=Max("pk"))["last_pk"] or 0) + 1
+            for kind, model in (("users", User), ("rooms", Room), ("lists", List))
+        }
+
+    def get_choices(self):
+        choices = {
+            "genders": [value for value, label in User.GENDER_CHOICES],
+            "languages": [value for value, label in User.LANGUAGE_CHOICES],
+            "currencies": [value for value, label in User.CURRENCY_CHOICES],
+            "statuses": [value for value, label in Reservation.STATUS_CHOICES],
+        }
+
+        for key, model, names in (
+            ("room_types", RoomType, ROOM_TYPES),
+            ("amenities", Amenity, AMENITIES),
+            ("facilities", Facility, FACILITIES),
+            ("house_rules", HouseRule, HOUSE_RULES),
+        ):
+            model.objects.bulk_create(
+                [model(name=name) for name in names], ignore_conflicts=True
+            )
+            choices[key] = sorted(
+                model.objects.filter(name__in=names).values_list("pk", flat=True)
+            )
+
+        return choices
+
+    def generate(self, dataset, tasks, workers):
+        """Yield rows of every task in order, generated by workers processes"""
+        if workers < 2:
+            for task in tasks:
+                yield dataset.generate(task)
+
+            return
+
+        # Workers never query, a forked connection would be closed under us
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(dataset,)
+        ) as executor:
+            # Keep a few chunks ahead of loading, not the whole dataset
+            pending = deque()
+
+            for task in tasks:
+                pending.append(executor.submit(generate_chunk, task))
+
+                if len(pending) > workers * 2:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def load(self, rows, batch_size):
+        for key, model in ROWS:
+            if key in rows:
+                bulk_insert(model, (model(**row) for row in rows[key]), batch_size)
+
+        for key, model, field_name in M2M_ROWS:
+            if key in rows:
+                bulk_insert_m2m(model, field_name, rows[key], batch_size)
+
+    def reset_sequences(self):
+        """Primary keys were given explicitly, move sequences past them"""
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Room, List])
+
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,143 @@
+import time
+from datetime import timedelta
+from django.core.mail import get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+from core.management.commands.custom_command import CustomCommand
+from core.models import OutgoingEmail
+
+
+class Command(CustomCommand):
+    help = "Send queued emails in batches over one reused mail connection"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", default=50, help="Number of emails claimed per batch"
+        )
+        parser.add_argument(
+            "--max-attempts", default=5, help="Attempts before an email is failed"
+        )
+        parser.add_argument(
+            "--backoff",
+            default=60,
+            help="Seconds before the first retry, doubled on every attempt",
+        )
+        parser.add_argument(
+            "--lease",
+            default=300,
+            help="Seconds claimed emails are held before another worker retries",
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling the queue forever"
+        )
+        parser.add_argument(
+            "--interval", default=5, help="Seconds between polls with --loop"
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = int(options.get("batch_size"))
+        self.max_attempts = int(options.get("max_attempts"))
+        self.backoff = int(options.get("backoff"))
+        self.lease = int(options.get("lease"))
+        interval = int(options.get("interval"))
+
+        # Opened by the first send, so an unreachable relay fails a poll only
+        connection = get_connection(fail_silently=False)
+
+        try:
+            while True:
+                try:
+                    sent, failed = self.send_all(connection)
+                except Exception as e:
+                    if not options.get("loop"):
+                        raise
+
+                    self.stdout.write(
+                        self.style.ERROR(f"■ FAIL {e.__class__.__name__}: {e}")
+                    )
+                else:
+                    if sent or failed or options.get("verbosity") > 1:
+                        self.stdout.write(
+                            self.style.SUCCESS(f"■ SENT {sent} EMAILS, {failed} FAILED")
+                        )
+
+                if not options.get("loop"):
+                    break
+
+                time.sleep(interval)
+        finally:
+            self.close(connection)
+
+    def send_all(self, connection):
+        sent = failed = 0
+
+        while True:
+            batch_sent, batch_failed, claimed = self.send_batch(connection)
+            sent += batch_sent
+            failed += batch_failed
+
+            if claimed < self.batch_size:
+                return sent, failed
+
+    def claim(self):
+        """Lease a batch of due emails to this worker and commit at once
+
+        Sending happens outside of the transaction, so row locks are held
+        only while claiming. Emails of a worker dying mid batch are due
+        again once the lease ends.
+        """
+        with transaction.atomic():
+            queryset = OutgoingEmail.objects.due()
+
+            # Lets several workers drain the queue without sending twice
+            if db_connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+
+            emails = list(queryset[: self.batch_size])
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                send_after=timezone.now() + timedelta(seconds=self.lease)
+            )
+
+        return emails
+
+    def send_batch(self, connection):
+        emails = self.claim()
+        sent = failed = 0
+
+        try:
+            for email in emails:
+                # Raises while the relay is down, leaving the rest unattempted
+                connection.open()
+                email.attempts += 1
+
+                try:
+                    connection.send_messages([email.to_message(connection)])
+                    email.status = OutgoingEmail.STATUS_SENT
+                    email.sent_at = timezone.now()
+                    email.last_error = ""
+                    sent += 1
+                except Exception as e:
+                    email.last_error = f"{e.__class__.__name__}: {e}"
+
+                    if email.attempts >= self.max_attempts:
+                        email.status = OutgoingEmail.STATUS_FAILED
+                        failed += 1
+                    else:
+                        delay = self.backoff * 2 ** (email.attempts - 1)
+                        email.send_after = timezone.now() + timedelta(seconds=delay)
+
+                    # The connection may be broken, the next email opens a new one
+                    self.close(connection)
+        finally:
+            # Unattempted emails get their send_after back, for the next poll
+            OutgoingEmail.objects.bulk_update(
+                emails, ["status", "attempts", "send_after", "last_error", "sent_at"]
+            )
+
+        return sent, failed, len(emails)
+
+    def close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.snapshots import (
+    FORMAT_COLUMNAR,
+    FORMAT_SQLITE,
+    FORMATS,
+    SnapshotError,
+    backup_sqlite,
+    dump,
+)
+
+
+class Command(BaseCommand):
+    help = "Save every table of the database into a snapshot file for restore"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Snapshot file to write")
+        parser.add_argument(
+            "--format",
+            default=FORMAT_COLUMNAR,
+            choices=FORMATS,
+            help="columnar zip of any database, or a raw SQLite backup",
+        )
+
+    def handle(self, *args, **options):
+        path = options.get("path")
+        started = time.perf_counter()
+
+        self.stdout.write(self.style.SUCCESS(f"■ START SNAPSHOT {path}"))
+
+        try:
+            if options.get("format") == FORMAT_SQLITE:
+                backup_sqlite(path)
+                saved = "DATABASE"
+            else:
+                counts = dump(path)
+                saved = f"{sum(counts.values())} ROWS OF {len(counts)} TABLES"
+        except SnapshotError as e:
+            raise CommandError(f"■ {e}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"■ SAVED {saved} IN {elapsed:.1f}s"))
@@ -1,4 +1,6 @@
+from django.core.mail import EmailMultiAlternatives
 from django.db import models
+from django.utils import timezone
 
 
 class AbstractTimeStamp(models.Model):
@@ -17,3 +19,92 @@ class AbstractTimeStamp(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutgoingEmailManager(models.Manager):
+    def enqueue(self, subject, body, from_email, to, html_body=""):
+        """Store an email to be sent by the send_queued_emails command"""
+        return self.create(
+            subject=subject,
+            body=body,
+            html_body=html_body,
+            from_email=from_email,
+            to=",".join(to),
+        )
+
+    def due(self):
+        return self.filter(
+            status=OutgoingEmail.STATUS_PENDING, send_after__lte=timezone.now()
+        ).order_by("send_after", "pk")
+
+
+class OutgoingEmail(AbstractTimeStamp):
+    """OutgoingEmail Model
+    Email outbox, requests only enqueue and send_queued_emails delivers
+
+    Inherit:
+        AbstractTimeStamp
+
+    Fields:
+        subject    : CharField
+        body       : TextField
+        html_body  : TextField
+        from_email : CharField
+        to         : TextField (comma separated addresses)
+        status     : CharField
+        attempts   : PositiveIntegerField
+        send_after : DateTimeField (next attempt time)
+        last_error : TextField
+        sent_at    : DateTimeField
+        created_at : DateTimeField
+        updated_at : DateTimeField
+
+    Method:
+        __str__    : return subject - to
+        to_message : return EmailMultiAlternatives of this email
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.TextField()
+    status = models.CharField(
+        max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    send_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutgoingEmailManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "send_after"])]
+
+    def __str__(self):
+        return f"{self.subject} - {self.to}"
+
+    def to_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.to.split(","),
+            connection=connection,
+        )
+
+        if self.html_body:
+            message.attach_alternative(self.html_body, "text/html")
+
+        return message
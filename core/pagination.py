@@ -0,0 +1,57 @@
+class KeysetPage:
+    """One page of a keyset (seek) paginated queryset
+
+    Attributes:
+        object_list  : objects of the page in ascending key order
+        has_next     : more objects after the last one
+        has_previous : more objects before the first one
+        next_key     : key to pass as `after` for the next page
+        previous_key : key to pass as `before` for the previous page
+    """
+
+    def __init__(self, object_list, has_next, has_previous, key):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_key = getattr(object_list[-1], key) if object_list else None
+        self.previous_key = getattr(object_list[0], key) if object_list else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def parse_key(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def keyset_paginate(queryset, per_page, after=None, before=None, key="pk"):
+    """Return a KeysetPage of queryset ordered by an unique integer key
+
+    Seeks with `key > after` / `key < before` instead of OFFSET, so every
+    page costs the same index range scan however deep the list goes.
+    """
+    after, before = parse_key(after), parse_key(before)
+
+    if before is not None:
+        objects = list(
+            queryset.filter(**{f"{key}__lt": before}).order_by(f"-{key}")[
+                : per_page + 1
+            ]
+        )
+        has_previous = len(objects) > per_page
+        objects = objects[:per_page][::-1]
+        return KeysetPage(objects, True, has_previous, key)
+
+    if after is not None:
+        queryset = queryset.filter(**{f"{key}__gt": after})
+
+    objects = list(queryset.order_by(key)[: per_page + 1])
+    has_next = len(objects) > per_page
+
+    return KeysetPage(objects[:per_page], has_next, after is not None, key)
@@ -0,0 +1,137 @@
+import multiprocessing
+import time
+from datetime import timedelta
+
+# Seconds between two redraws of a bar
+INTERVAL = 0.1
+
+
+class Progress:
+    """Progress bar of a long loop, showing throughput and time left
+
+    Redraws happen at most once per interval seconds, whatever the number
+    of updates, so a loop may update on every item. Output which isn't a
+    terminal (a log file, a pipe, a test's StringIO) only gets the final
+    line.
+
+    Worker processes report through a shared counter: hand progress.counter
+    to them (e.g. in a pool initializer), call advance(counter, count) in
+    the worker and progress.refresh() in the parent.
+
+    Fields:
+        total    : number of items of the loop
+        done     : number of items done so far
+        prefix   : text before the bar
+        unit     : name of the items, shown with the throughput
+        length   : number of characters of the bar
+        interval : minimum seconds between two redraws
+
+    Method:
+        update  : set the number of items done
+        advance : add items done
+        refresh : read the number of items done from the shared counter
+        finish  : draw the final line, whatever the items done
+    """
+
+    def __init__(
+        self,
+        stdout,
+        total,
+        prefix="■ PROGRESS",
+        unit="items",
+        length=40,
+        interval=INTERVAL,
+        style_func=None,
+        fill="█",
+        decimals=1,
+    ):
+        self.stdout = stdout
+        self.total = total
+        self.done = 0
+        self.prefix = prefix
+        self.unit = unit
+        self.length = length
+        self.interval = interval
+        self.style_func = style_func
+        self.fill = fill
+        self.decimals = decimals
+        self.started = time.monotonic()
+        self.drawn = None
+        self.finished = False
+        self.is_tty = stdout.isatty()
+        self._counter = None
+
+    @property
+    def counter(self):
+        """multiprocessing.Value of items done, created on first use"""
+        if self._counter is None:
+            self._counter = multiprocessing.Value("q", self.done)
+
+        return self._counter
+
+    def update(self, done, suffix=""):
+        self.done = done
+
+        if done >= self.total:
+            self.finish(suffix)
+        elif self.is_tty:
+            now = time.monotonic()
+
+            if self.drawn is None or now - self.drawn >= self.interval:
+                self.drawn = now
+                self.draw(suffix, now)
+
+    def advance(self, count=1, suffix=""):
+        if self._counter is None:
+            self.update(self.done + count, suffix)
+        else:
+            # Workers add to the counter too, self.done may be behind
+            advance(self._counter, count)
+            self.refresh(suffix)
+
+    def refresh(self, suffix=""):
+        self.update(self.counter.value, suffix)
+
+    def finish(self, suffix=""):
+        if not self.finished:
+            self.finished = True
+            self.draw(suffix, time.monotonic(), ending="\n")
+
+    def draw(self, suffix, now, ending="\r"):
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed else 0
+        ratio = min(self.done / self.total, 1) if self.total else 1
+        filled = int(self.length * ratio)
+        bar = self.fill * filled + "-" * (self.length - filled)
+
+        if self.finished:
+            timing = f"in {format_seconds(elapsed)}"
+        elif rate:
+            timing = f"ETA {format_seconds((self.total - self.done) / rate)}"
+        else:
+            timing = "ETA -:--:--"
+
+        line = (
+            f"{self.prefix} |{bar}| {100 * ratio:.{self.decimals}f}% "
+            f"{rate:,.0f} {self.unit}/s {timing} {suffix}"
+        ).rstrip()
+
+        if self.is_tty:
+            line = "\r" + line
+        else:
+            ending = "\n"
+
+        self.stdout.write(line, style_func=self.style_func, ending=ending)
+
+        if self.is_tty:
+            self.stdout.flush()
+
+
+def advance(counter, count=1):
+    """Add items done to the shared counter of a Progress, from any process"""
+    with counter.get_lock():
+        counter.value += count
+
+
+def format_seconds(seconds):
+    return str(timedelta(seconds=int(seconds)))
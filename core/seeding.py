@@ -0,0 +1,69 @@
+from itertools import islice
+from django.db import connection
+from django.db.models import Max
+
+BATCH_SIZE = 2000
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items of iterable"""
+    iterator = iter(iterable)
+
+    while True:
+        chunk = list(islice(iterator, size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def bulk_insert(model, objs, batch_size=BATCH_SIZE, with_pks=False):
+    """bulk_create objs in chunks, optionally setting their primary keys
+
+    Backends which can't return ids from a bulk insert (SQLite, MySQL) read
+    the new keys back with one query per chunk, so call it in a transaction.
+    """
+    objs = list(objs)
+    returns_pks = connection.features.can_return_ids_from_bulk_insert
+
+    for chunk in chunked(objs, batch_size):
+        if not with_pks or returns_pks:
+            model.objects.bulk_create(chunk)
+            continue
+
+        last_pk = model.objects.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+        model.objects.bulk_create(chunk)
+        pks = (
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        for obj, pk in zip(chunk, pks):
+            obj.pk = pk
+
+    return objs
+
+
+def bulk_insert_m2m(model, field_name, pairs, batch_size=BATCH_SIZE):
+    """Insert (source pk, target pk) pairs straight into a M2M through table
+
+    Rows are two integers, so they skip model instances and the ORM insert
+    compiler and go through one executemany per chunk.
+    """
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through._meta
+    quote = connection.ops.quote_name
+    source = quote(through.get_field(field.m2m_field_name()).column)
+    target = quote(through.get_field(field.m2m_reverse_field_name()).column)
+    table = quote(through.db_table)
+    sql = f"INSERT INTO {table} ({source}, {target}) VALUES (%s, %s)"
+    inserted = 0
+
+    with connection.cursor() as cursor:
+        for chunk in chunked(pairs, batch_size):
+            cursor.executemany(sql, chunk)
+            inserted += len(chunk)
+
+    return inserted
@@ -0,0 +1,191 @@
+import json
+import sqlite3
+import zipfile
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from core.seeding import BATCH_SIZE, chunked
+
+SNAPSHOT_VERSION = 1
+FORMAT_COLUMNAR = "columnar"
+FORMAT_SQLITE = "sqlite"
+FORMATS = (FORMAT_COLUMNAR, FORMAT_SQLITE)
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def get_tables():
+    return sorted(connection.introspection.django_table_names(only_existing=True))
+
+
+def get_migrations():
+    return sorted(map(list, MigrationRecorder(connection).applied_migrations()))
+
+
+def dump(path):
+    """Save every table into a zip of one columnar JSON file per table
+
+    A table file holds its column names and one list of values per column,
+    which compresses far better than fixtures repeating every field name.
+    Return rows saved by table.
+    """
+    quote = connection.ops.quote_name
+    counts = {}
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        # One transaction, so every table is read from the same state
+        with transaction.atomic(), connection.cursor() as cursor:
+            tables = get_tables()
+
+            for table in tables:
+                cursor.execute(f"SELECT * FROM {quote(table)} LIMIT 0")
+                columns = [column[0] for column in cursor.description]
+                # SQLite converters parse dates only for them to be written
+                # back as text, unary + changes no value but skips them
+                prefix = "+" if connection.vendor == "sqlite" else ""
+                fields = ", ".join(prefix + quote(column) for column in columns)
+                cursor.execute(f"SELECT {fields} FROM {quote(table)}")
+                rows = cursor.fetchall()
+                data = [list(values) for values in zip(*rows)] or [[] for _ in columns]
+                archive.writestr(
+                    f"{table}.json",
+                    json.dumps(
+                        {"columns": columns, "data": data},
+                        cls=DjangoJSONEncoder,
+                        separators=(",", ":"),
+                    ),
+                )
+                counts[table] = len(rows)
+
+            manifest = {
+                "version": SNAPSHOT_VERSION,
+                "vendor": connection.vendor,
+                "migrations": get_migrations(),
+                "tables": tables,
+            }
+
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+    return counts
+
+
+def drop_indexes(cursor, table):
+    """Drop secondary indexes of table, return the SQL creating them again
+
+    Indexes backing primary keys and unique constraints are left alone.
+    Backends without a way to read index definitions keep every index.
+    """
+    if connection.vendor == "sqlite":
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+            [table],
+        )
+    elif connection.vendor == "postgresql":
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint)",
+            [table],
+        )
+    else:
+        return []
+
+    indexes = cursor.fetchall()
+
+    for name, sql in indexes:
+        cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+    return [sql for name, sql in indexes]
+
+
+def load(path, batch_size=BATCH_SIZE):
+    """Replace every table with the rows of a dump() snapshot
+
+    Runs in one transaction, foreign keys are checked once at commit.
+    Secondary indexes are dropped while a table is loaded and built once
+    at the end instead of updated row by row. Return rows loaded by table.
+    """
+    quote = connection.ops.quote_name
+
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError("Unknown snapshot version")
+
+        # Values are saved as the database returns them, booleans and dates
+        # of SQLite don't read back into other databases
+        if manifest["vendor"] != connection.vendor:
+            raise SnapshotError(f"Snapshot was taken from {manifest['vendor']}")
+
+        if manifest["migrations"] != get_migrations():
+            raise SnapshotError("Snapshot was taken with other migrations applied")
+
+        counts = {}
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table in get_tables():
+                cursor.execute(f"DELETE FROM {quote(table)}")
+
+            for table in manifest["tables"]:
+                content = json.loads(archive.read(f"{table}.json"))
+                columns = ", ".join(quote(column) for column in content["columns"])
+                values = ", ".join(["%s"] * len(content["columns"]))
+                sql = f"INSERT INTO {quote(table)} ({columns}) VALUES ({values})"
+                indexes = drop_indexes(cursor, table)
+
+                for chunk in chunked(zip(*content["data"]), batch_size):
+                    cursor.executemany(sql, chunk)
+
+                for index_sql in indexes:
+                    cursor.execute(index_sql)
+
+                counts[table] = len(content["data"][0]) if content["data"] else 0
+
+            # Primary keys were given explicitly, move sequences past them
+            models = apps.get_models(include_auto_created=True)
+
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    return counts
+
+
+def backup_sqlite(path):
+    """Copy the whole SQLite database, page by page, into the file at path"""
+    if connection.vendor != "sqlite":
+        raise SnapshotError("sqlite snapshots need a SQLite database")
+
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+
+    try:
+        connection.connection.backup(target)
+    finally:
+        target.close()
+
+
+def restore_sqlite(path):
+    """Overwrite the whole SQLite database, migrations included, with path"""
+    if connection.vendor != "sqlite":
+        raise SnapshotError("sqlite snapshots need a SQLite database")
+
+    connection.ensure_connection()
+    source = sqlite3.connect(path)
+
+    try:
+        source.backup(connection.connection)
+    finally:
+        source.close()
+
+
+def get_format(path):
+    with open(path, "rb") as snapshot:
+        header = snapshot.read(len(SQLITE_HEADER))
+
+    return FORMAT_SQLITE if header == SQLITE_HEADER else FORMAT_COLUMNAR
@@ -0,0 +1,111 @@
+from django.test import TestCase, override_settings
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from core.models import OutgoingEmail
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class SendQueuedEmailsTest(TestCase):
+    def setUp(self):
+        """Run every test function
+        Queue three emails, the last one is scheduled in the future
+        """
+        for i in range(2):
+            OutgoingEmail.objects.enqueue(
+                f"Subject {i}",
+                "Body",
+                "from@test.com",
+                [f"to{i}@test.com"],
+                html_body="<b>Body</b>",
+            )
+
+        later = OutgoingEmail.objects.enqueue(
+            "Later", "Body", "from@test.com", ["later@test.com"]
+        )
+        later.send_after = timezone.now() + timedelta(hours=1)
+        later.save()
+
+    def test_send_queued_emails(self):
+        """send_queued_emails command test
+        Check due emails are sent in batches over one connection
+        """
+        with mock.patch(
+            "core.management.commands.send_queued_emails.get_connection",
+            wraps=mail.get_connection,
+        ) as mocked_connection:
+            call_command("send_queued_emails", "--batch-size=1", stdout=StringIO())
+
+        self.assertEqual(1, mocked_connection.call_count)
+        self.assertEqual(
+            ["Subject 0", "Subject 1"], [message.subject for message in mail.outbox]
+        )
+        self.assertEqual("<b>Body</b>", mail.outbox[0].alternatives[0][0])
+        self.assertEqual(
+            2, OutgoingEmail.objects.filter(status=OutgoingEmail.STATUS_SENT).count()
+        )
+        self.assertEqual(1, OutgoingEmail.objects.filter(sent_at=None).count())
+
+    def test_send_queued_emails_retry_backoff(self):
+        """send_queued_emails command failure test
+        Check failed email is retried later with backoff, then marked failed
+        """
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("relay down"),
+        ):
+            call_command("send_queued_emails", "--backoff=60", stdout=StringIO())
+
+        email = OutgoingEmail.objects.get(subject="Subject 0")
+        self.assertEqual(OutgoingEmail.STATUS_PENDING, email.status)
+        self.assertEqual(1, email.attempts)
+        self.assertEqual("OSError: relay down", email.last_error)
+        self.assertGreater(email.send_after, timezone.now() + timedelta(seconds=50))
+
+        call_command("send_queued_emails", stdout=StringIO())
+        self.assertEqual(0, len(mail.outbox))
+
+        OutgoingEmail.objects.filter(pk=email.pk).update(send_after=timezone.now())
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("relay down"),
+        ):
+            call_command("send_queued_emails", "--max-attempts=2", stdout=StringIO())
+
+        email.refresh_from_db()
+        self.assertEqual(2, email.attempts)
+        self.assertEqual(OutgoingEmail.STATUS_FAILED, email.status)
+        self.assertEqual(0, len(mail.outbox))
+
+    def test_send_queued_emails_relay_down(self):
+        """send_queued_emails command connection failure test
+        Check an unreachable relay leaves emails due, and --loop goes on
+        """
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            side_effect=OSError("relay down"),
+        ), self.assertRaises(OSError):
+            call_command("send_queued_emails", stdout=StringIO())
+
+        self.assertEqual(2, OutgoingEmail.objects.due().filter(attempts=0).count())
+
+        out = StringIO()
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            side_effect=[OSError("relay down"), None, None],
+        ), mock.patch(
+            "core.management.commands.send_queued_emails.time.sleep",
+            side_effect=[None, KeyboardInterrupt],
+        ), self.assertRaises(
+            KeyboardInterrupt
+        ):
+            call_command("send_queued_emails", "--loop", stdout=out)
+
+        self.assertIn("■ FAIL OSError: relay down", out.getvalue())
+        self.assertIn("■ SENT 2 EMAILS, 0 FAILED", out.getvalue())
+        self.assertEqual(2, len(mail.outbox))
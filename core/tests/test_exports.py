@@ -0,0 +1,161 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from core.exports import format_lines
+from reservations.models import Reservation
+from reviews.models import Review
+from rooms.models import Room
+from users.models import User
+from datetime import date, time
+from io import StringIO
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+
+class ExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running ExportTest
+        Create a staff user, a host with three rooms, reservations and a review
+        """
+        cls.staff = User.objects.create_user(
+            "staff", email="staff@test.com", password="password", is_staff=True
+        )
+        host = User.objects.create_user("host", email="host@test.com")
+
+        for i in range(3):
+            room = Room.objects.create(
+                name=f"Room, {i}",
+                description="Two\nlines",
+                country="KR",
+                city="Seoul",
+                price=100,
+                address="Test Address",
+                guests=1,
+                beds=1,
+                bedrooms=1,
+                baths=1,
+                check_in=time(9, 30),
+                check_out=time(10, 30),
+                host=host,
+            )
+            Reservation.objects.create(
+                check_in=date(2020, 1, 1 + i),
+                check_out=date(2020, 1, 2 + i),
+                guest=cls.staff,
+                room=room,
+            )
+
+        Review.objects.create(
+            review="Café",
+            accuracy=5,
+            communication=4,
+            cleanliness=3,
+            location=2,
+            check_in=1,
+            value=5,
+            user=cls.staff,
+            room=room,
+        )
+
+    def test_export_view_streams_csv(self):
+        """export view test
+        Check staff download every room as CSV, one fetch per chunk
+        """
+        self.client.login(username="staff", password="password")
+        url = reverse("core:export", kwargs={"name": "rooms", "format": "csv"})
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+            content = b"".join(response.streaming_content).decode()
+
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.DictReader(content.splitlines(keepends=True)))
+        self.assertEqual(["Room, 0", "Room, 1", "Room, 2"], [r["name"] for r in rows])
+        self.assertEqual("host@test.com", rows[0]["host"])
+        self.assertEqual("09:30:00", rows[0]["check_in"])
+
+    def test_export_csv_formulas_escaped(self):
+        """format_lines function test
+        Check CSV text read as a formula by spreadsheets is quoted, not numbers
+        """
+        rows = [("=HYPERLINK()", "+1", "-1", "@SUM(A1)", "a=b", -1, None)]
+        lines = list(format_lines(["a", "b", "c", "d", "e", "f", "g"], rows, "csv"))
+
+        self.assertEqual("'=HYPERLINK(),'+1,'-1,'@SUM(A1),a=b,-1,\r\n", lines[1])
+
+        lines = list(format_lines(["a"], [("=1",)], "jsonl"))
+        self.assertEqual('{"a": "=1"}\n', lines[0])
+
+    def test_export_view_staff_only(self):
+        """export view test
+        Check anonymous and non-staff users are sent to login, unknown names 404
+        """
+        url = reverse("core:export", kwargs={"name": "rooms", "format": "csv"})
+        self.assertEqual(302, self.client.get(url).status_code)
+
+        self.client.login(username="staff", password="password")
+        url = reverse("core:export", kwargs={"name": "users", "format": "csv"})
+        self.assertEqual(404, self.client.get(url).status_code)
+        url = reverse("core:export", kwargs={"name": "rooms", "format": "xml"})
+        self.assertEqual(404, self.client.get(url).status_code)
+
+    def test_export_command_jsonl(self):
+        """export command test
+        Check reservations are written one JSON object per line, chunk by chunk
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "reservations.jsonl")
+        out = StringIO()
+
+        call_command(
+            "export",
+            "reservations",
+            "--format=jsonl",
+            f"--output={path}",
+            "--chunk-size=2",
+            stdout=out,
+        )
+
+        with open(path, encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+
+        self.assertIn("■ EXPORTED 3 ROWS", out.getvalue())
+        self.assertEqual(
+            ["2020-01-01", "2020-01-02", "2020-01-03"],
+            [record["check_in"] for record in records],
+        )
+        self.assertEqual("staff@test.com", records[0]["guest"])
+
+    def test_export_command_stdout(self):
+        """export command test
+        Check reviews are written to standard output without progress lines
+        """
+        out = StringIO()
+        call_command("export", "reviews", "--format=jsonl", stdout=out)
+
+        (record,) = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual("Café", record["review"])
+
+    def test_admin_export_action(self):
+        """ExportActionsMixin admin action test
+        Check only the selected rooms are exported
+        """
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@test.com", "password")
+        )
+        room = Room.objects.order_by("pk").last()
+
+        response = self.client.post(
+            reverse("admin:rooms_room_changelist"),
+            {"action": "export_jsonl", "_selected_action": [room.pk]},
+        )
+        content = b"".join(response.streaming_content).decode()
+
+        (record,) = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(room.pk, record["id"])
@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+from django.core.management.base import OutputWrapper
+from concurrent.futures import ProcessPoolExecutor
+from core.management.commands.custom_command import CustomCommand
+from core.progress import Progress, advance
+from io import StringIO
+
+
+class TerminalIO(StringIO):
+    def isatty(self):
+        return True
+
+
+_counter = None
+
+
+def init_worker(counter):
+    global _counter
+    _counter = counter
+
+
+def work(count):
+    advance(_counter, count)
+
+
+class ProgressTest(SimpleTestCase):
+    def test_progress_not_tty(self):
+        """Progress class test
+        Check output which isn't a terminal only gets the final line
+        """
+        out = StringIO()
+        progress = Progress(OutputWrapper(out), 1000, unit="rooms")
+
+        for _ in range(1000):
+            progress.advance()
+
+        progress.finish()
+        (line,) = out.getvalue().splitlines()
+        self.assertIn("100.0%", line)
+        self.assertIn("rooms/s in 0:00:00", line)
+
+    def test_progress_throttles_redraws(self):
+        """Progress class test
+        Check a terminal is redrawn once per interval, then on the last item
+        """
+        out = TerminalIO()
+        progress = Progress(OutputWrapper(out), 1000, interval=3600)
+
+        for done in range(1, 1001):
+            progress.update(done, suffix="Complete")
+
+        first, last = out.getvalue().split("\r")[1::2]
+        self.assertIn("0.1%", first)
+        self.assertIn("ETA", first)
+        self.assertIn("100.0%", last)
+        self.assertTrue(last.endswith("Complete\n"))
+
+    def test_progress_shared_counter(self):
+        """Progress class test
+        Check items done in worker processes add up in the parent
+        """
+        progress = Progress(OutputWrapper(StringIO()), 100)
+        progress.advance(10)
+
+        with ProcessPoolExecutor(
+            2, initializer=init_worker, initargs=(progress.counter,)
+        ) as executor:
+            list(executor.map(work, [5] * 10))
+
+        progress.refresh()
+        self.assertEqual(60, progress.done)
+        progress.advance(40)
+        self.assertTrue(progress.finished)
+
+    def test_progress_bar_compatible(self):
+        """CustomCommand progress_bar method test
+        Check older callers still get one final bar per loop
+        """
+        out = StringIO()
+        command = CustomCommand(stdout=out)
+
+        for loop in range(2):
+            for iteration in range(1, 11):
+                command.progress_bar(iteration, 10, prefix="■ PROGRESS", length=10)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith("■ PROGRESS |██████████| 100.0%"))
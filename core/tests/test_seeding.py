@@ -0,0 +1,196 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.dataset import CITY_COUNT, Dataset
+from core.management.commands.seed_all import Command as SeedAllCommand
+from core.seeding import bulk_insert, bulk_insert_m2m, chunked
+from lists.models import List
+from reviews.models import Review
+from rooms.models import Amenity, Photo, Room, RoomType
+from users.models import User
+from datetime import time
+from io import StringIO
+
+
+def make_room(host, name):
+    return Room(
+        name=name,
+        description="Test Description",
+        country="KR",
+        city="Seoul",
+        price=100,
+        address="Test Address",
+        guests=1,
+        beds=1,
+        bedrooms=1,
+        baths=1,
+        check_in=time(9, 30),
+        check_out=time(10, 30),
+        host=host,
+    )
+
+
+class SeedingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running SeedingTest
+        Create one host, one room type and two amenities
+        """
+        User.objects.create_user(username="host")
+        RoomType.objects.create(name="Entire place")
+        for name in ("Wifi", "Kitchen"):
+            Amenity.objects.create(name=name)
+
+    def test_chunked(self):
+        """chunked function test
+        Check iterable is split in lists of at most size items
+        """
+        self.assertEqual([[0, 1], [2, 3], [4]], list(chunked(range(5), 2)))
+
+    def test_bulk_insert_with_pks(self):
+        """bulk_insert function test
+        Check inserted objects get their primary keys, chunk by chunk
+        """
+        host = User.objects.get(username="host")
+        rooms = bulk_insert(
+            Room, (make_room(host, f"Room {i}") for i in range(5)), 2, with_pks=True
+        )
+
+        self.assertEqual(
+            [f"Room {i}" for i in range(5)],
+            [Room.objects.get(pk=room.pk).name for room in rooms],
+        )
+
+    def test_bulk_insert_m2m(self):
+        """bulk_insert_m2m function test
+        Check pairs are inserted into the M2M through table
+        """
+        host = User.objects.get(username="host")
+        room = make_room(host, "Room")
+        room.save()
+        amenity_pks = list(Amenity.objects.values_list("pk", flat=True))
+
+        inserted = bulk_insert_m2m(
+            Room, "amenities", [(room.pk, pk) for pk in amenity_pks], 1
+        )
+
+        self.assertEqual(2, inserted)
+        self.assertEqual(
+            sorted(amenity_pks),
+            sorted(room.amenities.values_list("pk", flat=True)),
+        )
+
+    def test_seed_rooms_command(self):
+        """seed_rooms command test
+        Check rooms, photos and amenities are bulk created in constant queries
+        """
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "seed_rooms", "--number=30", "--batch-size=10", stdout=StringIO()
+            )
+
+        # Per batch: rooms, their keys, photos, M2M, never one query per room
+        self.assertLess(len(queries), 30)
+
+        host = User.objects.get(username="host")
+        self.assertEqual(30, Room.objects.count())
+        self.assertEqual(30, host.rooms.count())
+        self.assertEqual(30, User.objects.get(pk=host.pk).room_count)
+        self.assertFalse(Room.objects.filter(photos=None).exists())
+        self.assertGreaterEqual(Photo.objects.count(), 30 * 7)
+
+    def test_seed_reviews_command(self):
+        """seed_reviews command test
+        Check reviews of every room are bulk created and counted once
+        """
+        host = User.objects.get(username="host")
+        bulk_insert(Room, (make_room(host, f"Room {i}") for i in range(3)))
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "seed_reviews", "--number=4", "--batch-size=5", stdout=StringIO()
+            )
+
+        # Users, rooms, three chunks, one counter refresh
+        self.assertLess(len(queries), 15)
+        self.assertEqual(12, Review.objects.count())
+        self.assertEqual(
+            [4, 4, 4], [room.reviews.count() for room in Room.objects.all()]
+        )
+        self.assertEqual(12, User.objects.get(pk=host.pk).review_count)
+
+
+class SeedAllTest(TestCase):
+    def make_dataset(self, seed):
+        return Dataset(
+            1,
+            seed,
+            {"users": 1, "rooms": 1, "lists": 1},
+            {
+                "genders": ["other"],
+                "languages": ["en"],
+                "currencies": ["usd"],
+                "statuses": ["pending"],
+                "room_types": [1],
+                "amenities": [1, 2],
+                "facilities": [],
+                "house_rules": [],
+            },
+        )
+
+    def test_dataset_is_reproducible(self):
+        """Dataset generate test
+        Check a chunk depends on the seed only, not on the process making it
+        """
+        dataset = self.make_dataset(7)
+        tasks = list(dataset.tasks())
+
+        self.assertEqual([("users", 0), ("rooms", 0), ("lists", 0)], tasks)
+        self.assertEqual(
+            self.make_dataset(7).generate(("rooms", 0)),
+            dataset.generate(("rooms", 0)),
+        )
+        self.assertNotEqual(
+            self.make_dataset(8).generate(("rooms", 0)),
+            dataset.generate(("rooms", 0)),
+        )
+        self.assertEqual(
+            list(SeedAllCommand().generate(dataset, tasks, 1)),
+            list(SeedAllCommand().generate(dataset, tasks, 2)),
+        )
+
+    def test_dataset_is_skewed(self):
+        """Dataset generate test
+        Check a few cities hold many rooms and a few rooms many reviews
+        """
+        rows = self.make_dataset(7).generate(("rooms", 0))
+        cities = [room["city"] for room in rows["rooms"]]
+        reviews = [review["room_id"] for review in rows["reviews"]]
+        top_city = max(cities.count(city) for city in cities)
+        top_room = max(reviews.count(room) for room in reviews)
+
+        self.assertGreater(top_city, 10 * len(cities) / CITY_COUNT)
+        self.assertGreater(top_room, 5 * len(reviews) / len(cities))
+
+    def test_seed_all_command(self):
+        """seed_all command test
+        Check every model is created with consistent keys and counters
+        """
+        call_command(
+            "seed_all", "--scale=1", "--seed=1", "--workers=1", stdout=StringIO()
+        )
+
+        self.assertEqual(50, User.objects.count())
+        self.assertEqual(100, Room.objects.count())
+        self.assertEqual(4, RoomType.objects.count())
+        self.assertFalse(Room.objects.filter(photos=None).exists())
+        self.assertFalse(Room.objects.filter(amenities=None).exists())
+        self.assertTrue(Review.objects.exists())
+        self.assertTrue(List.objects.filter(rooms__isnull=False).exists())
+        self.assertEqual(100, sum(User.objects.values_list("room_count", flat=True)))
+
+        # Sequences moved past the explicit keys
+        room = make_room(User.objects.first(), "Room")
+        room.save()
+        self.assertEqual(101, room.pk)
@@ -0,0 +1,82 @@
+from django.test import TestCase, override_settings
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from users.models import User
+from datetime import timedelta
+from io import StringIO
+import shutil
+import tempfile
+
+
+class SessionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running SessionTest
+        Create one user able to log in
+        """
+        User.objects.create_user(username="session", password="testtest")
+
+    def test_warm_session_no_query(self):
+        """cached_db session engine test
+        Check logged in request reads its session without django_session query
+        """
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        caches = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "sessions": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": location,
+            },
+        }
+        session_settings = override_settings(
+            CACHES=caches,
+            SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+            SESSION_CACHE_ALIAS="sessions",
+        )
+        session_settings.enable()
+        self.addCleanup(session_settings.disable)
+
+        self.client.login(username="session", password="testtest")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/")
+
+        self.assertTrue(response.context["user"].is_authenticated)
+        self.assertFalse(
+            [query for query in queries if "django_session" in query["sql"]]
+        )
+
+    def test_messages_no_session(self):
+        """Message storage test
+        Check messages of anonymous user don't create a session
+        """
+        response = self.client.get("/users/verify/invalid")
+
+        self.assertIn("messages", response.cookies)
+        self.assertFalse(Session.objects.exists())
+
+    def test_purge_sessions_command(self):
+        """purge_sessions command test
+        Check only expired sessions are deleted, chunk by chunk
+        """
+        now = timezone.now()
+
+        for idx in range(5):
+            Session.objects.create(
+                session_key=f"expired{idx}",
+                session_data="",
+                expire_date=now - timedelta(days=1),
+            )
+        Session.objects.create(
+            session_key="alive", session_data="", expire_date=now + timedelta(days=1)
+        )
+
+        out = StringIO()
+        call_command("purge_sessions", "--chunk-size=2", stdout=out)
+
+        self.assertIn("PURGED 5 SESSIONS", out.getvalue())
+        self.assertEqual(["alive"], list(Session.objects.values_list("pk", flat=True)))
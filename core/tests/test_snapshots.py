@@ -0,0 +1,111 @@
+from django.test import TestCase, TransactionTestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from core.snapshots import SQLITE_HEADER
+from rooms.models import Amenity, Room
+from users.models import User
+from datetime import time
+from io import StringIO
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+
+def create_room(host, name):
+    room = Room.objects.create(
+        name=name,
+        description="Test Description",
+        country="KR",
+        city="Seoul",
+        price=100,
+        address="Test Address",
+        guests=1,
+        beds=1,
+        bedrooms=1,
+        baths=1,
+        check_in=time(9, 30),
+        check_out=time(10, 30),
+        host=host,
+    )
+    room.amenities.add(Amenity.objects.get_or_create(name="Wifi")[0])
+    return room
+
+
+class SnapshotTest(TestCase):
+    def setUp(self):
+        """Run every test function
+        Create a host with one room in a temporary snapshot directory
+        """
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "snapshot.zip")
+        self.host = User.objects.create_user("host", bio="Host bio")
+        create_room(self.host, "Room")
+
+    def test_snapshot_restore(self):
+        """snapshot and restore commands test
+        Check every table is restored as it was, later changes are dropped
+        """
+        call_command("snapshot", self.path, stdout=StringIO())
+
+        Room.objects.all().delete()
+        create_room(User.objects.create_user("other"), "Other room")
+
+        call_command("restore", self.path, "--noinput", stdout=StringIO())
+
+        room = Room.objects.get()
+        self.assertEqual("Room", room.name)
+        self.assertEqual(time(9, 30), room.check_in)
+        self.assertEqual(["Wifi"], [amenity.name for amenity in room.amenities.all()])
+        self.assertEqual(["host"], [user.username for user in User.objects.all()])
+        self.assertEqual(self.host.date_joined, User.objects.get().date_joined)
+
+        # Indexes dropped during the load are created again
+        self.assertTrue(Room.objects.filter(host__username="host").exists())
+        self.assertGreater(create_room(self.host, "New room").pk, room.pk)
+
+    def test_restore_other_migrations(self):
+        """restore command test
+        Check a snapshot of other migrations is refused and nothing changes
+        """
+        call_command("snapshot", self.path, stdout=StringIO())
+
+        with zipfile.ZipFile(self.path) as archive:
+            files = {name: archive.read(name) for name in archive.namelist()}
+
+        manifest = json.loads(files["manifest.json"])
+        manifest["migrations"].pop()
+        files["manifest.json"] = json.dumps(manifest)
+
+        with zipfile.ZipFile(self.path, "w") as archive:
+            for name, content in files.items():
+                archive.writestr(name, content)
+
+        create_room(self.host, "Other room")
+
+        with self.assertRaises(CommandError):
+            call_command("restore", self.path, "--noinput", stdout=StringIO())
+
+        self.assertEqual(2, Room.objects.count())
+
+
+class SqliteSnapshotTest(TransactionTestCase):
+    def test_sqlite_snapshot_restore(self):
+        """snapshot and restore commands test
+        Check a raw SQLite backup restores the whole database
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "snapshot.sqlite3")
+        create_room(User.objects.create_user("host"), "Room")
+
+        call_command("snapshot", path, "--format=sqlite", stdout=StringIO())
+        Room.objects.all().delete()
+        call_command("restore", path, "--noinput", stdout=StringIO())
+
+        with open(path, "rb") as snapshot:
+            self.assertEqual(SQLITE_HEADER, snapshot.read(len(SQLITE_HEADER)))
+
+        self.assertEqual(["Room"], [room.name for room in Room.objects.all()])
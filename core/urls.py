@@ -1,7 +1,10 @@
 from django.urls import path
+from core import views
 from rooms import views as room_views
 
-
 app_name = "core"
 
-urlpatterns = [path("", room_views.HomeView.as_view(), name="home")]
+urlpatterns = [
+    path("", room_views.HomeView.as_view(), name="home"),
+    path("exports/<str:name>.<str:format>", views.export, name="export"),
+]
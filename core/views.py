@@ -1,3 +1,12 @@
-from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404
+from core.exports import EXPORTS, FORMATS, export_response
 
-# Create your views here.
+
+@staff_member_required
+def export(request, name, format):
+    """Stream a whole export as a CSV or JSONL download, staff only"""
+    if name not in EXPORTS or format not in FORMATS:
+        raise Http404()
+
+    return export_response(EXPORTS[name], format)
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from lists.models import List
 
 
@@ -11,5 +12,15 @@ class ListAdmin(admin.ModelAdmin):
     """
 
     list_display = ("name", "user", "count_rooms")
+    list_select_related = ("user",)
     search_fields = ("name",)
     filter_horizontal = ("rooms",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(room_count=Count("rooms"))
+
+    def count_rooms(self, obj):
+        return obj.room_count
+
+    count_rooms.short_description = "Number of Rooms"
+    count_rooms.admin_order_field = "room_count"
@@ -0,0 +1,9 @@
+from django.utils.functional import SimpleLazyObject
+from lists.saved import get_request_saved_room_ids
+
+
+def saved_rooms(request):
+    """Expose saved_room_ids to templates, evaluated only when used"""
+    return {
+        "saved_room_ids": SimpleLazyObject(lambda: get_request_saved_room_ids(request))
+    }
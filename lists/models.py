@@ -1,7 +1,26 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.urls import reverse
 from core.models import AbstractTimeStamp
 
 
+class ListQuerySet(models.QuerySet):
+    def with_room_counts(self):
+        """Annotate room_count and cover (first photo file of the list's rooms)
+        Both are computed by the database in the list query itself
+        """
+        from rooms.models import Photo
+
+        cover = Photo.objects.filter(room__lists=OuterRef("pk")).order_by(
+            "room_id", "pk"
+        )
+
+        return self.annotate(
+            room_count=Count("rooms", distinct=True),
+            cover=Subquery(cover.values("file")[:1]),
+        )
+
+
 class List(AbstractTimeStamp):
     """List Model
 
@@ -16,19 +35,27 @@ class List(AbstractTimeStamp):
         updated_at : DateTimeField
 
     Method:
-        __str__     : return name
-        count_rooms : return rooms count
+        __str__          : return name
+        get_absolute_url : return list detail url
+        count_rooms      : return rooms count
     """
 
+    DEFAULT_NAME = "My Wishlist"
+
     name = models.CharField(max_length=80)
     user = models.ForeignKey(
         "users.User", related_name="lists", on_delete=models.CASCADE
     )
     rooms = models.ManyToManyField("rooms.Room", related_name="lists", blank=True)
 
+    objects = ListQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
+    def get_absolute_url(self):
+        return reverse("lists:detail", kwargs={"pk": self.pk})
+
     def count_rooms(self):
         return self.rooms.count()
 
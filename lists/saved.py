@@ -0,0 +1,75 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from lists.models import List
+
+CACHE_KEY = "lists:saved-rooms:{}"
+CACHE_TIMEOUT = 60 * 60
+
+
+def get_cache_key(user_pk):
+    return CACHE_KEY.format(user_pk)
+
+
+def get_cache():
+    """Return the default cache if every worker shares it, None otherwise
+
+    A local memory cache belongs to one worker process, which alone would
+    see the invalidation of a changed set: the others would keep serving
+    stale hearts and ETags. Sets are then loaded once per request instead.
+    """
+    cache = caches["default"]
+
+    if isinstance(cache, (LocMemCache, DummyCache)):
+        return None
+
+    return cache
+
+
+def get_saved_room_ids(user):
+    """Return frozenset of room ids in any of the user's lists
+    Built with one query on a cache miss, then served from the shared cache
+    """
+    if not user.is_authenticated:
+        return frozenset()
+
+    cache = get_cache()
+    key = get_cache_key(user.pk)
+    room_ids = cache.get(key) if cache else None
+
+    if room_ids is None:
+        room_ids = frozenset(
+            List.rooms.through.objects.filter(list__user=user).values_list(
+                "room_id", flat=True
+            )
+        )
+
+        if cache:
+            cache.set(key, room_ids, CACHE_TIMEOUT)
+
+    return room_ids
+
+
+def get_request_saved_room_ids(request):
+    """Return the saved room ids of request.user, loaded once per request"""
+    if not hasattr(request, "_saved_room_ids"):
+        request._saved_room_ids = get_saved_room_ids(request.user)
+
+    return request._saved_room_ids
+
+
+def invalidate_saved_room_ids(*user_pks):
+    """Forget the cached sets of users, rebuilt by their next request
+
+    Deleted at once, so this transaction reads its own changes, and again
+    on commit, in case another request cached the old rows meanwhile.
+    """
+    cache = get_cache()
+
+    if not cache:
+        return
+
+    keys = [get_cache_key(user_pk) for user_pk in user_pks]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,36 @@
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
+from lists.models import List
+from lists.saved import invalidate_saved_room_ids
+
+
+@receiver(m2m_changed, sender=List.rooms.through)
+def update_saved_room_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the cached saved room ids of users whose lists changed
+
+    Sets aren't changed in place, a read-modify-write before commit could
+    race other requests. The next request rebuilds them with one query.
+    """
+    if action == "pre_clear" and reverse:
+        instance._cleared_list_users = list(
+            instance.lists.values_list("user_id", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        invalidate_saved_room_ids(instance.user_id)
+
+    elif action == "post_clear":
+        invalidate_saved_room_ids(*getattr(instance, "_cleared_list_users", []))
+
+    else:
+        user_pks = List.objects.filter(pk__in=pk_set).values_list("user_id", flat=True)
+        invalidate_saved_room_ids(*set(user_pks))
+
+
+@receiver(post_delete, sender=List)
+def delete_saved_room_ids(sender, instance, **kwargs):
+    invalidate_saved_room_ids(instance.user_id)
@@ -0,0 +1,291 @@
+from django.test import TestCase, override_settings
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from lists.models import List
+from lists.saved import get_saved_room_ids
+from rooms.models import Room, Photo
+from users.models import User
+from datetime import datetime
+from unittest import mock
+import shutil
+import tempfile
+
+
+class SavedRoomViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running SavedRoomViewTest
+        Create user with one list and three rooms, first room is saved
+        """
+        user = User.objects.create_user(username="test_user", password="testtest")
+
+        for i in range(1, 4):
+            Room.objects.create(
+                name=f"Test Room {i}",
+                description="Test Description",
+                country="KR",
+                city="Seoul",
+                price=100,
+                address="Test Address",
+                guests=6,
+                beds=3,
+                bedrooms=2,
+                baths=2,
+                check_in=datetime(2019, 1, 1, 9, 30),
+                check_out=datetime(2019, 1, 2, 10, 30),
+                host=user,
+            )
+
+        list_obj = List.objects.create(name="Test List", user=user)
+        list_obj.rooms.add(Room.objects.get(pk=1))
+
+    def setUp(self):
+        """Share a file cache, as workers do, so saved room sets are cached"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        file_cache = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location,
+        }
+        shared_cache = override_settings(
+            CACHES={**settings.CACHES, "default": file_cache}
+        )
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        cache.clear()
+
+    def test_saved_room_ids_cached(self):
+        """get_saved_room_ids function test
+        Check saved room ids are loaded once and then served from the cache
+        """
+        user = User.objects.get(username="test_user")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(frozenset([1]), get_saved_room_ids(user))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(frozenset([1]), get_saved_room_ids(user))
+
+    def test_saved_room_ids_follow_m2m_change(self):
+        """Saved room ids m2m_changed test
+        Check cached set is rebuilt after add, remove and clear of list rooms
+        """
+        user = User.objects.get(username="test_user")
+        list_obj = List.objects.get(name="Test List")
+        room = Room.objects.get(pk=2)
+        get_saved_room_ids(user)
+
+        list_obj.rooms.add(room)
+        with self.assertNumQueries(1):
+            self.assertEqual(frozenset([1, 2]), get_saved_room_ids(user))
+
+        room.lists.remove(list_obj)
+        self.assertEqual(frozenset([1]), get_saved_room_ids(user))
+
+        list_obj.rooms.clear()
+        self.assertEqual(frozenset(), get_saved_room_ids(user))
+
+    def test_saved_room_ids_other_worker(self):
+        """Saved room ids cache sharing test
+        Check set changed by another worker is seen, whether cache is shared or not
+        """
+        user = User.objects.get(username="test_user")
+        list_obj = List.objects.get(name="Test List")
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        workers = [
+            (FileBasedCache(location, {}), FileBasedCache(location, {})),
+            (LocMemCache("worker-1", {}), LocMemCache("worker-2", {})),
+        ]
+
+        for first, second in workers:
+            with mock.patch("lists.saved.caches", {"default": first}):
+                self.assertEqual(frozenset([1]), get_saved_room_ids(user))
+
+            with mock.patch("lists.saved.caches", {"default": second}):
+                list_obj.rooms.add(2)
+
+            with mock.patch("lists.saved.caches", {"default": first}):
+                self.assertEqual(frozenset([1, 2]), get_saved_room_ids(user))
+
+            with mock.patch("lists.saved.caches", {"default": second}):
+                list_obj.rooms.remove(2)
+
+    def test_saved_room_ids_local_cache(self):
+        """get_saved_room_ids local memory cache test
+        Check set is not cached in a cache of one worker process
+        """
+        user = User.objects.get(username="test_user")
+
+        with mock.patch("lists.saved.caches", {"default": LocMemCache("local", {})}):
+            get_saved_room_ids(user)
+
+            with self.assertNumQueries(1):
+                self.assertEqual(frozenset([1]), get_saved_room_ids(user))
+
+    def test_saved_room_ids_anonymous(self):
+        """get_saved_room_ids anonymous user test
+        Check anonymous user has no saved room
+        """
+        response = self.client.get("/")
+        self.assertEqual(frozenset(), response.context["saved_room_ids"])
+
+    def test_save_room_view(self):
+        """save_room view test
+        Check room is added to user's list and marked on the home page
+        """
+        self.client.login(username="test_user", password="testtest")
+        response = self.client.post("/lists/rooms/3/save", {"next": "/"})
+
+        self.assertRedirects(response, "/")
+        self.assertTrue(List.objects.get(name="Test List").rooms.filter(pk=3).exists())
+
+        html = self.client.get("/").content.decode("utf8")
+        self.assertEqual(2, html.count('title="Saved"'))
+
+    def test_save_room_view_create_list(self):
+        """save_room view without list test
+        Check default list is created for user without list
+        """
+        User.objects.create_user(username="new_user", password="testtest")
+        self.client.login(username="new_user", password="testtest")
+        response = self.client.post("/lists/rooms/2/save")
+
+        self.assertRedirects(response, "/rooms/2")
+        list_obj = List.objects.get(user__username="new_user")
+        self.assertEqual(List.DEFAULT_NAME, list_obj.name)
+
+    def test_unsave_room_view(self):
+        """unsave_room view test
+        Check room is removed from every list and the cached set is rebuilt
+        """
+        user = User.objects.get(username="test_user")
+        List.objects.create(name="Other List", user=user).rooms.add(1)
+        self.client.login(username="test_user", password="testtest")
+        self.assertEqual(frozenset([1]), get_saved_room_ids(user))
+
+        response = self.client.post("/lists/rooms/1/unsave")
+
+        self.assertRedirects(response, "/rooms/1")
+        self.assertFalse(List.rooms.through.objects.filter(room_id=1).exists())
+        # Rebuilt by the redirected page
+        with self.assertNumQueries(0):
+            self.assertEqual(frozenset(), get_saved_room_ids(user))
+
+    def test_save_room_view_logged_out(self):
+        """save_room view logged out test
+        Check anonymous user is redirected to login page
+        """
+        response = self.client.post("/lists/rooms/1/save")
+        self.assertEqual(302, response.status_code)
+        self.assertIn("/users/login", response.url)
+
+
+class ListViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running ListViewTest
+        Create user with three lists, the first one holds 30 rooms with photos
+        """
+        user = User.objects.create_user(username="test_user", password="testtest")
+        User.objects.create_user(username="other_user", password="testtest")
+        lists = [List.objects.create(name=f"List {i}", user=user) for i in range(3)]
+
+        for i in range(1, 31):
+            room = Room.objects.create(
+                name=f"Test Room {i}",
+                description="Test Description",
+                country="KR",
+                city="Seoul",
+                price=100,
+                address="Test Address",
+                guests=6,
+                beds=3,
+                bedrooms=2,
+                baths=2,
+                check_in=datetime(2019, 1, 1, 9, 30),
+                check_out=datetime(2019, 1, 2, 10, 30),
+                host=user,
+            )
+            Photo.objects.create(
+                caption="photo", file=f"room_photos/{i}.webp", room=room
+            )
+            lists[0].rooms.add(room)
+
+            if i <= 2:
+                lists[1].rooms.add(room)
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username="test_user", password="testtest")
+
+    def test_lists_view(self):
+        """ListsView test
+        Check lists are rendered with annotated room count and cover photo
+        """
+        response = self.client.get("/lists/")
+        html = response.content.decode("utf8")
+        counts = {obj.name: obj.room_count for obj in response.context["lists"]}
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({"List 0": 30, "List 1": 2, "List 2": 0}, counts)
+        self.assertIn("/media/room_photos/1.webp", html)
+        self.assertIn("30 rooms", html)
+
+    def test_lists_view_constant_queries(self):
+        """ListsView query count test
+        Check query count doesn't grow with number of lists
+        """
+        with self.assertNumQueries(3):
+            self.client.get("/lists/")
+
+        user = User.objects.get(username="test_user")
+        for i in range(3, 10):
+            List.objects.create(name=f"List {i}", user=user).rooms.add(1)
+
+        with self.assertNumQueries(3):
+            self.client.get("/lists/")
+
+    def test_list_detail_view_keyset_pages(self):
+        """ListDetailView keyset pagination test
+        Check next / previous keys walk through the list rooms
+        """
+        response = self.client.get("/lists/1")
+        page = response.context["page"]
+
+        self.assertEqual(list(range(1, 13)), [room.pk for room in page])
+        self.assertTrue(page.has_next)
+        self.assertFalse(page.has_previous)
+
+        response = self.client.get("/lists/1", {"after": page.next_key})
+        page = response.context["page"]
+        self.assertEqual(list(range(13, 25)), [room.pk for room in page])
+
+        response = self.client.get("/lists/1", {"after": 24})
+        page = response.context["page"]
+        self.assertEqual(list(range(25, 31)), [room.pk for room in page])
+        self.assertFalse(page.has_next)
+
+        response = self.client.get("/lists/1", {"before": page.previous_key})
+        page = response.context["page"]
+        self.assertEqual(list(range(13, 25)), [room.pk for room in page])
+        self.assertTrue(page.has_previous)
+
+    def test_list_detail_view_constant_queries(self):
+        """ListDetailView query count test
+        Check rooms are rendered through room_card.html in constant queries
+        """
+        with self.assertNumQueries(7):
+            response = self.client.get("/lists/1")
+
+        self.assertIn("Test Room 12", response.content.decode("utf8"))
+
+    def test_list_detail_view_other_user(self):
+        """ListDetailView permission test
+        Check other user's list returns 404
+        """
+        self.client.login(username="other_user", password="testtest")
+        response = self.client.get("/lists/1")
+        self.assertEqual(404, response.status_code)
@@ -0,0 +1,11 @@
+from django.urls import path
+from lists.views import ListsView, ListDetailView, save_room, unsave_room
+
+app_name = "lists"
+
+urlpatterns = [
+    path("", ListsView.as_view(), name="lists"),
+    path("<int:pk>", ListDetailView.as_view(), name="detail"),
+    path("rooms/<int:room_pk>/save", save_room, name="save-room"),
+    path("rooms/<int:room_pk>/unsave", unsave_room, name="unsave-room"),
+]
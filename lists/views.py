@@ -1,3 +1,98 @@
-from django.shortcuts import render
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, get_object_or_404
+from django.urls import reverse_lazy
+from django.utils.http import is_safe_url
+from django.views.decorators.http import require_POST
+from django.views.generic import ListView, DetailView
+from core.pagination import keyset_paginate
+from lists.models import List
+from lists.saved import invalidate_saved_room_ids
+from rooms.models import Room
+from users.mixins import LoggedInOnlyView
 
-# Create your views here.
+
+class ListsView(LoggedInOnlyView, ListView):
+    """lists application ListsView class
+    Display the user's lists with room counts and cover photos
+
+    Inherit             : LoggedInOnlyView, ListView
+    context_object_name : lists
+    Templates name      : lists/list_list.html
+    """
+
+    context_object_name = "lists"
+
+    def get_queryset(self):
+        return (
+            List.objects.filter(user=self.request.user)
+            .with_room_counts()
+            .order_by("-created_at")
+        )
+
+
+class ListDetailView(LoggedInOnlyView, DetailView):
+    """lists application ListDetailView class
+    Display rooms of one of the user's lists with keyset pagination
+
+    Inherit        : LoggedInOnlyView, DetailView
+    paginate_by    : 12
+    Templates name : lists/list_detail.html
+    """
+
+    paginate_by = 12
+
+    def get_queryset(self):
+        return List.objects.filter(user=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        rooms = Room.objects.filter(lists=self.object).for_cards()
+        context["page"] = keyset_paginate(
+            rooms,
+            self.paginate_by,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+        return context
+
+
+def get_next_url(request, room):
+    next_url = request.POST.get("next")
+
+    if next_url and is_safe_url(next_url, allowed_hosts={request.get_host()}):
+        return next_url
+
+    return room.get_absolute_url()
+
+
+@login_required(login_url=reverse_lazy("users:login"))
+@require_POST
+def save_room(request, room_pk):
+    """Add room to the user's first list, creating it when user has none
+    The cached saved room ids are invalidated by the m2m_changed handler
+    """
+    room = get_object_or_404(Room, pk=room_pk)
+    list_obj = List.objects.filter(user=request.user).order_by("pk").first()
+
+    if list_obj is None:
+        list_obj = List.objects.create(user=request.user, name=List.DEFAULT_NAME)
+
+    list_obj.rooms.add(room)
+    messages.success(request, f"Saved {room.name}")
+
+    return redirect(get_next_url(request, room))
+
+
+@login_required(login_url=reverse_lazy("users:login"))
+@require_POST
+def unsave_room(request, room_pk):
+    """Remove room from every list of the user with one DELETE
+    and invalidate the cached saved room ids
+    """
+    room = get_object_or_404(Room, pk=room_pk)
+    List.rooms.through.objects.filter(list__user=request.user, room=room).delete()
+    invalidate_saved_room_ids(request.user.pk)
+    messages.success(request, f"Removed {room.name}")
+
+    return redirect(get_next_url(request, room))
@@ -1,10 +1,17 @@
 from django.contrib import admin
+from core.admin import ExportActionsMixin
 from reservations.models import Reservation
 
 
 @admin.register(Reservation)
-class ReservationAdmin(admin.ModelAdmin):
-    """Register Reservation model at admin panel"""
+class ReservationAdmin(ExportActionsMixin, admin.ModelAdmin):
+    """Register Reservation model at admin panel
+
+    Admin action:
+        export_csv / export_jsonl : stream selected reservations
+    """
+
+    export_name = "reservations"
 
     list_display = (
         "room",
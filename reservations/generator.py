@@ -0,0 +1,69 @@
+import numpy as np
+
+# Share of nights booked averaged over the year, of an average room
+OCCUPANCY = 0.6
+MEAN_STAY = 4
+# Occupancy swings by SEASONALITY around its mean, highest on PEAK_DAY
+SEASONALITY = 0.35
+PEAK_DAY = 200
+# Arrivals are more likely on Friday and Saturday
+WEEKEND_BOOST = 1.3
+
+
+def seasonal_occupancy(start, days, occupancy=OCCUPANCY, seasonality=SEASONALITY):
+    """Return expected occupancy of every day of the window beginning at start"""
+    dates = np.datetime64(start, "D") + np.arange(days)
+    day_of_year = (dates - dates.astype("datetime64[Y]")).astype(int)
+    # 1970-01-01 was a Thursday
+    weekday = (dates.astype(int) + 3) % 7
+    curve = occupancy * (
+        1 + seasonality * np.cos(2 * np.pi * (day_of_year - PEAK_DAY) / 365.25)
+    )
+
+    return curve * np.where(np.isin(weekday, (4, 5)), WEEKEND_BOOST, 1)
+
+
+def generate_stays(
+    rng,
+    room_count,
+    start,
+    days,
+    occupancy=OCCUPANCY,
+    mean_stay=MEAN_STAY,
+    seasonality=SEASONALITY,
+):
+    """Return non-overlapping stays of room_count rooms over days from start
+
+    Works on a rooms x days matrix at once. Every day a guest may arrive,
+    with a chance following the seasonal curve and the room's popularity,
+    for a geometric number of nights. A stay arriving before the previous
+    ones left is moved to their last check-out and dropped if nothing is
+    left of it, so stays of a room never overlap.
+
+    Return (room indexes, check-in day offsets, nights) arrays.
+    """
+    # Popularity of rooms averages 1, some rooms are booked far more
+    popularity = rng.gamma(4, 1 / 4, size=(room_count, 1))
+    curve = np.clip(
+        popularity * seasonal_occupancy(start, days, occupancy, seasonality), 0, 0.95
+    )
+    # Arrivals during a stay are partly lost, this rate makes up for it so
+    # the booked share of nights stays close to the curve
+    arrival_rate = curve / (mean_stay * (1 - curve / 2))
+
+    arrives = rng.random((room_count, days)) < arrival_rate
+    nights = rng.geometric(1 / mean_stay, size=(room_count, days))
+    day = np.arange(days)
+    check_outs = np.where(arrives, np.minimum(day + nights, days), 0)
+
+    # Last check-out of the stays arriving before each day
+    previous = np.maximum.accumulate(check_outs, axis=1)
+    previous = np.concatenate(
+        [np.zeros((room_count, 1), dtype=previous.dtype), previous[:, :-1]], axis=1
+    )
+    kept = arrives & (check_outs > previous)
+
+    rooms, arrival_days = np.nonzero(kept)
+    check_ins = np.maximum(arrival_days, previous[kept])
+
+    return rooms, check_ins, check_outs[kept] - check_ins
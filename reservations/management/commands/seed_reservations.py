@@ -1,52 +1,113 @@
+import numpy as np
 from core.management.commands.custom_command import CustomCommand
-from django_seed import Seed
-from datetime import datetime, timedelta
-from random import randint, choice
+from core.seeding import BATCH_SIZE, bulk_insert, chunked
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from reservations.generator import OCCUPANCY, generate_stays
+from reservations.models import Reservation
 from rooms.models import Room
 from users.models import User
-from reservations.models import Reservation
 
 
 class Command(CustomCommand):
-    help = "Automatically create reservations"
+    help = "Automatically create non-overlapping reservations of every room"
+
+    # Stays are generated on a rooms x days matrix, this many rooms at once
+    ROOMS_PER_CHUNK = 500
+    CANCEL_RATE = 0.1
+    # Share of upcoming reservations the host already confirmed
+    CONFIRM_RATE = 0.6
 
     def add_arguments(self, parser):
         parser.add_argument(
-            "--number", default=1, help="Number of reservations to create"
+            "--past-days", default=365, help="Days of reservations before today"
+        )
+        parser.add_argument(
+            "--future-days", default=180, help="Days of reservations after today"
+        )
+        parser.add_argument(
+            "--occupancy", default=OCCUPANCY, help="Average share of booked nights"
+        )
+        parser.add_argument("--seed", default=None, help="Seed of the generator")
+        parser.add_argument(
+            "--batch-size", default=BATCH_SIZE, help="Number of reservations per insert"
         )
 
     def handle(self, *args, **options):
         try:
-            number = int(options.get("number"))
+            past_days = int(options.get("past_days"))
+            future_days = int(options.get("future_days"))
+            occupancy = float(options.get("occupancy"))
+            seed = options.get("seed")
+            batch_size = int(options.get("batch_size"))
 
             self.stdout.write(self.style.SUCCESS("■ START CREATE RESERVATIONS"))
 
-            users = User.objects.all()
-            rooms = Room.objects.all()
-
-            seeder = Seed.seeder()
-            seeder.add_entity(
-                Reservation,
-                number,
-                {
-                    "status": lambda x: choice(
-                        [
-                            Reservation.STATUS_CANCELED,
-                            Reservation.STATUS_CONFIRMED,
-                            Reservation.STATUS_PENDING,
-                        ]
-                    ),
-                    "guest": lambda x: choice(users),
-                    "room": lambda x: choice(rooms),
-                    "check_in": lambda x: datetime.now(),
-                    "check_out": lambda x: datetime.now()
-                    + timedelta(days=randint(3, 25)),
-                },
+            self.rng = np.random.default_rng(None if seed is None else int(seed))
+            self.start = timezone.now().date() - timedelta(days=past_days)
+            self.days = past_days + future_days
+            self.past_days = past_days
+            self.occupancy = occupancy
+            self.guest_pks = np.array(User.objects.values_list("pk", flat=True))
+
+            if not len(self.guest_pks):
+                raise ValueError("Create users first")
+
+            # Rooms booked in the window already keep their own reservations
+            booked = Reservation.objects.filter(
+                check_in__lt=self.start + timedelta(days=self.days),
+                check_out__gt=self.start,
+            ).values("room_id")
+            room_pks = list(
+                Room.objects.exclude(pk__in=booked)
+                .order_by("pk")
+                .values_list("pk", flat=True)
             )
-            seeder.execute()
+            progress = self.progress(len(room_pks), unit="rooms")
+
+            for chunk in chunked(room_pks, self.ROOMS_PER_CHUNK):
+                with transaction.atomic():
+                    bulk_insert(Reservation, self.make_reservations(chunk), batch_size)
+
+                progress.advance(len(chunk))
 
             self.stdout.write(self.style.SUCCESS("■ SUCCESS CREATE ALL RESERVATIONS!"))
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"■ {e}"))
             self.stdout.write(self.style.ERROR("■ FAIL CREATE RESERVATIONS"))
+
+    def make_reservations(self, room_pks):
+        rooms, check_ins, nights = generate_stays(
+            self.rng, len(room_pks), self.start, self.days, self.occupancy
+        )
+        check_outs = check_ins + nights
+        draw = self.rng.random(len(rooms))
+        statuses = np.where(
+            draw < self.CANCEL_RATE,
+            Reservation.STATUS_CANCELED,
+            np.where(
+                (check_outs <= self.past_days) | (draw < self.CONFIRM_RATE),
+                Reservation.STATUS_CONFIRMED,
+                Reservation.STATUS_PENDING,
+            ),
+        )
+        first_day = np.datetime64(self.start, "D")
+
+        return [
+            Reservation(
+                status=status,
+                check_in=check_in,
+                check_out=check_out,
+                guest_id=guest_pk,
+                room_id=room_pk,
+            )
+            for status, check_in, check_out, guest_pk, room_pk in zip(
+                statuses.tolist(),
+                (first_day + check_ins).tolist(),
+                (first_day + check_outs).tolist(),
+                self.rng.choice(self.guest_pks, len(rooms)).tolist(),
+                np.array(room_pks)[rooms].tolist(),
+            )
+        ]
@@ -0,0 +1,92 @@
+from django.test import TestCase
+from django.core.management import call_command
+from reservations.generator import generate_stays, seasonal_occupancy
+from reservations.models import Reservation
+from users.models import User
+from rooms.models import Room
+from datetime import date, time
+from io import StringIO
+import numpy as np
+
+
+class GeneratorTest(TestCase):
+    def test_generate_stays_never_overlap(self):
+        """generate_stays function test
+        Check stays of a room never overlap and stay in the window
+        """
+        rooms, check_ins, nights = generate_stays(
+            np.random.default_rng(1), 50, date(2020, 1, 1), 365
+        )
+
+        self.assertTrue((nights >= 1).all())
+        self.assertTrue((check_ins + nights <= 365).all())
+
+        for room in range(50):
+            stays = check_ins[rooms == room]
+            ends = stays + nights[rooms == room]
+            self.assertTrue((stays[1:] >= ends[:-1]).all())
+
+    def test_generate_stays_follow_seasons(self):
+        """generate_stays function test
+        Check summer is booked more than winter, close to the asked occupancy
+        """
+        rooms, check_ins, nights = generate_stays(
+            np.random.default_rng(1), 500, date(2020, 1, 1), 365, occupancy=0.5
+        )
+        booked = np.zeros(365)
+
+        for check_in, night in zip(check_ins, nights):
+            booked[check_in : check_in + night] += 1
+
+        booked /= 500
+        self.assertGreater(booked[180:220].mean(), booked[0:40].mean() * 1.5)
+        self.assertAlmostEqual(0.5, booked.mean(), delta=0.1)
+
+    def test_seasonal_occupancy_weekends(self):
+        """seasonal_occupancy function test
+        Check arrivals are more likely on Friday and Saturday
+        """
+        # 2020-07-16 is a Thursday
+        thursday, friday, saturday, sunday = seasonal_occupancy(date(2020, 7, 16), 4)
+
+        self.assertGreater(friday, thursday)
+        self.assertGreater(saturday, sunday)
+
+    def test_seed_reservations_command(self):
+        """seed_reservations command test
+        Check every room gets non-overlapping reservations, only once
+        """
+        user = User.objects.create_user("test_user")
+
+        for i in range(3):
+            Room.objects.create(
+                name=f"Room {i}",
+                description="Test Description",
+                country="KR",
+                city="Seoul",
+                price=100,
+                address="Test Address",
+                guests=1,
+                beds=1,
+                bedrooms=1,
+                baths=1,
+                check_in=time(9, 30),
+                check_out=time(10, 30),
+                host=user,
+            )
+
+        call_command("seed_reservations", "--seed=1", stdout=StringIO())
+        count = Reservation.objects.count()
+
+        self.assertGreater(count, 3 * 10)
+
+        for room in Room.objects.all():
+            stays = list(room.reservations.order_by("check_in"))
+            self.assertTrue(stays)
+            self.assertTrue(
+                all(a.check_out <= b.check_in for a, b in zip(stays, stays[1:]))
+            )
+
+        # Already booked rooms are left alone
+        call_command("seed_reservations", "--seed=2", stdout=StringIO())
+        self.assertEqual(count, Reservation.objects.count())
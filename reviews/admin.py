@@ -1,9 +1,16 @@
 from django.contrib import admin
+from core.admin import ExportActionsMixin
 from reviews.models import Review
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
-    """Register Review model at admin panel"""
+class ReviewAdmin(ExportActionsMixin, admin.ModelAdmin):
+    """Register Review model at admin panel
+
+    Admin action:
+        export_csv / export_jsonl : stream selected reviews
+    """
+
+    export_name = "reviews"
 
     list_display = ("__str__", "rating_average")
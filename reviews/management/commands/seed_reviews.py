@@ -1,4 +1,6 @@
 from core.management.commands.custom_command import CustomCommand
+from core.seeding import BATCH_SIZE, bulk_insert, chunked
+from django.db import transaction
 from django_seed import Seed
 from random import randint, choice
 from reviews.models import Review
@@ -9,47 +11,62 @@ from users.models import User
 class Command(CustomCommand):
     help = "Automatically create reviews"
 
+    # Faker is slow, texts are drawn from a pool generated once per run
+    POOL_SIZE = 500
+
     def add_arguments(self, parser):
-        parser.add_argument("--number", default=1, help="Number of reviews to create")
+        parser.add_argument(
+            "--number", default=1, help="Number of reviews to create per room"
+        )
+        parser.add_argument(
+            "--batch-size", default=BATCH_SIZE, help="Number of reviews per insert"
+        )
 
     def handle(self, *args, **options):
         try:
             number = int(options.get("number"))
+            batch_size = int(options.get("batch_size"))
 
             self.stdout.write(self.style.SUCCESS("■ START CREATE REVIEWS"))
 
-            users = User.objects.all()
-            rooms = Room.objects.all()
-
-            for idx, room in enumerate(rooms):
-                seeder = Seed.seeder()
-                seeder.add_entity(
-                    Review,
-                    number,
-                    {
-                        "accuracy": lambda x: randint(0, 6),
-                        "communication": lambda x: randint(0, 6),
-                        "cleanliness": lambda x: randint(0, 6),
-                        "location": lambda x: randint(0, 6),
-                        "check_in": lambda x: randint(0, 6),
-                        "value": lambda x: randint(0, 6),
-                        "room": room,
-                        "user": lambda x: choice(users),
-                    },
-                )
-
-                self.progress_bar(
-                    idx + 1,
-                    len(rooms),
-                    prefix="■ PROGRESS",
-                    suffix="Complete",
-                    length=40,
-                )
-
-                seeder.execute()
+            faker = Seed.faker()
+            self.texts = [faker.text() for _ in range(self.POOL_SIZE)]
+            self.user_pks = list(User.objects.values_list("pk", flat=True))
+            room_pks = list(Room.objects.values_list("pk", flat=True))
+
+            if not self.user_pks:
+                raise ValueError("Create users first")
+
+            total = number * len(room_pks)
+            reviews = (
+                self.make_review(room_pk) for room_pk in room_pks for _ in range(number)
+            )
+            progress = self.progress(total, unit="reviews")
+
+            for chunk in chunked(reviews, batch_size):
+                with transaction.atomic():
+                    bulk_insert(Review, chunk, batch_size)
+
+                progress.advance(len(chunk))
+
+            # bulk_create skips the signals keeping review_count up to date
+            User.objects.refresh_counts()
 
             self.stdout.write(self.style.SUCCESS("■ SUCCESS CREATE ALL REVIEWS!"))
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"■ {e}"))
             self.stdout.write(self.style.ERROR("■ FAIL CREATE REVIEWS"))
+
+    def make_review(self, room_pk):
+        return Review(
+            review=choice(self.texts),
+            accuracy=randint(0, 6),
+            communication=randint(0, 6),
+            cleanliness=randint(0, 6),
+            location=randint(0, 6),
+            check_in=randint(0, 6),
+            value=randint(0, 6),
+            room_id=room_pk,
+            user_id=choice(self.user_pks),
+        )
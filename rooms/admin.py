@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import mark_safe
+from core.admin import ExportActionsMixin
 from .models import Room, RoomType, Amenity, Facility, HouseRule, Photo
 
 
@@ -32,7 +33,7 @@ class PhotoInlineAdmin(admin.TabularInline):
 
 
 @admin.register(Room)
-class RoomAdmin(admin.ModelAdmin):
+class RoomAdmin(ExportActionsMixin, admin.ModelAdmin):
     """Register Room model at admin panel
 
     Filter by:
@@ -48,13 +49,19 @@ class RoomAdmin(admin.ModelAdmin):
     Search by:
         city              : exact
         host.username     : startwith
+        external_id       : exact
 
     Admin function :
         count_amenities   : return amenities count
         count_facilities  : return facilities count
         count_house_rules : return house_rules count
+
+    Admin action:
+        export_csv / export_jsonl : stream selected rooms
     """
 
+    export_name = "rooms"
+
     inlines = (PhotoInlineAdmin,)
 
     fieldsets = (
@@ -71,7 +78,7 @@ class RoomAdmin(admin.ModelAdmin):
                 "fields": ("amenities", "facilities", "house_rules"),
             },
         ),
-        ("Last Details", {"fields": ("host",)}),
+        ("Last Details", {"fields": ("host", "external_id")}),
     )
 
     raw_id_fields = ("host",)
@@ -104,7 +111,7 @@ class RoomAdmin(admin.ModelAdmin):
         "country",
     )
     filter_horizontal = ("amenities", "facilities", "house_rules")
-    search_fields = ("=city", "^host__username")
+    search_fields = ("=city", "^host__username", "=external_id")
 
     def count_amenities(self, obj):
         return obj.amenities.count()
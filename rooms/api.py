@@ -0,0 +1,126 @@
+import base64
+import binascii
+from django.http import JsonResponse
+from django.views.generic import View
+from rooms.forms import SearchForm
+from rooms.models import Room
+from rooms.serializers import FIELDS, LIST_FIELDS, RoomSerializer
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + padding).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ApiError("Invalid cursor")
+
+
+class RoomApiView(View):
+    """rooms application read-only JSON API base class
+
+    Inherit        : View
+    default_fields : fields of rooms when ?fields= is not given
+
+    Method:
+        get_serializer : return a RoomSerializer of ?fields= or default fields
+        paginate       : return a page of rooms after ?cursor=, by primary key
+    """
+
+    default_fields = LIST_FIELDS
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as e:
+            return JsonResponse({"error": str(e), **e.details}, status=e.status)
+
+    def get_serializer(self):
+        fields = self.request.GET.get("fields")
+
+        if not fields:
+            return RoomSerializer(self.default_fields)
+
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in fields if field not in FIELDS]
+
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+
+        return RoomSerializer(dict.fromkeys(fields))
+
+    def paginate(self, rooms):
+        """Keyset pagination: rooms after the cursor's pk, no OFFSET or COUNT
+
+        A page costs the same queries however deep it is, and rooms created
+        while paging don't shift pages already read.
+        """
+        try:
+            page_size = int(self.request.GET.get("page_size", PAGE_SIZE))
+        except ValueError:
+            raise ApiError("Invalid page_size")
+
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+        cursor = self.request.GET.get("cursor")
+
+        if cursor:
+            rooms = rooms.filter(pk__gt=decode_cursor(cursor))
+
+        # One more room than asked tells whether a next page exists
+        items = self.get_serializer().items(rooms.order_by("pk")[: page_size + 1])
+        next_url = None
+
+        if len(items) > page_size:
+            items = items[:page_size]
+            query = self.request.GET.copy()
+            query.pop("cursor", None)
+            query["cursor"] = encode_cursor(items[-1][0])
+            next_url = f"{self.request.path}?{query.urlencode()}"
+
+        return JsonResponse({"next": next_url, "results": [room for pk, room in items]})
+
+
+class RoomListApiView(RoomApiView):
+    """Return pages of every room"""
+
+    def get(self, request):
+        return self.paginate(Room.objects.all())
+
+
+class RoomSearchApiView(RoomApiView):
+    """Return pages of rooms matching SearchForm parameters"""
+
+    def get(self, request):
+        form = SearchForm(request.GET)
+
+        if not form.is_valid():
+            raise ApiError("Invalid search", errors=form.errors.get_json_data())
+
+        return self.paginate(form.search())
+
+
+class RoomDetailApiView(RoomApiView):
+    """Return one room, every field by default"""
+
+    default_fields = FIELDS
+
+    def get(self, request, pk):
+        results = self.get_serializer().serialize(Room.objects.filter(pk=pk))
+
+        if not results:
+            raise ApiError("Room not found", status=404)
+
+        return JsonResponse(results[0])
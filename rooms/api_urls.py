@@ -0,0 +1,10 @@
+from django.urls import path
+from rooms.api import RoomListApiView, RoomSearchApiView, RoomDetailApiView
+
+app_name = "rooms_api"
+
+urlpatterns = [
+    path("", RoomListApiView.as_view(), name="list"),
+    path("<int:pk>", RoomDetailApiView.as_view(), name="detail"),
+    path("search/", RoomSearchApiView.as_view(), name="search"),
+]
@@ -0,0 +1,136 @@
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Count, DateTimeField, IntegerField, Max, OuterRef
+from django.db.models import Subquery
+from lists.saved import get_request_saved_room_ids
+from reviews.models import Review
+from rooms.models import Room, Photo
+
+
+def aggregate_by_room(model, aggregate, output_field):
+    """Subquery of aggregate over the rows of model belonging to the room"""
+    rows = (
+        model.objects.filter(room=OuterRef("pk"))
+        .order_by()
+        .values("room")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+    return Subquery(rows, output_field=output_field)
+
+
+# Links shown by rooms/room_detail.html, of items with a name each
+LINKS = ("amenities", "facilities", "house_rules")
+
+
+def link_annotations():
+    """Subqueries of the links of a room to each of LINKS
+
+    A count and the last through row pk catch added and removed links,
+    the latest updated_at of the linked items catches renamed ones.
+    """
+    annotations = {}
+
+    for name in LINKS:
+        field = Room._meta.get_field(name)
+        through = field.remote_field.through
+        item = field.m2m_reverse_field_name()
+        annotations[f"{name}_count"] = aggregate_by_room(
+            through, Count("pk"), IntegerField()
+        )
+        annotations[f"{name}_last"] = aggregate_by_room(
+            through, Max("pk"), IntegerField()
+        )
+        annotations[f"{name}_updated"] = aggregate_by_room(
+            through, Max(f"{item}__updated_at"), DateTimeField()
+        )
+
+    return annotations
+
+
+def room_detail_validators(request, pk):
+    """Validators of rooms/room_detail.html, read in one query
+
+    The page shows the room, its host, room type, photos, reviews and their
+    writers, and the names of its links. Counts catch deleted photos,
+    reviews and links, which leave no updated_at.
+    """
+    annotations = link_annotations()
+    row = (
+        Room.objects.filter(pk=pk)
+        .annotate(
+            photos_updated=aggregate_by_room(Photo, Max("updated_at"), DateTimeField()),
+            photo_count=aggregate_by_room(Photo, Count("pk"), IntegerField()),
+            reviews_updated=aggregate_by_room(
+                Review, Max("updated_at"), DateTimeField()
+            ),
+            reviewers_updated=aggregate_by_room(
+                Review, Max("user__updated_at"), DateTimeField()
+            ),
+            review_count=aggregate_by_room(Review, Count("pk"), IntegerField()),
+            **annotations,
+        )
+        .values_list(
+            "updated_at",
+            "host__updated_at",
+            "room_type__updated_at",
+            "photos_updated",
+            "reviews_updated",
+            "reviewers_updated",
+            "photo_count",
+            "review_count",
+            *annotations,
+        )
+        .first()
+    )
+
+    if row is None:
+        return None
+
+    saved = pk in get_request_saved_room_ids(request)
+    return (pk, saved) + row
+
+
+def home_validators(request, view_class):
+    """Validators of the page of rooms/room_list.html asked by request
+
+    Rooms of the page are found the way view_class paginates them, then
+    the latest change of them, their hosts, photos and reviews is read.
+    """
+    rooms = Room.objects.order_by(view_class.ordering).values_list("pk", flat=True)
+    paginator = Paginator(
+        rooms, view_class.paginate_by, orphans=view_class.paginate_orphans
+    )
+    number = request.GET.get(view_class.page_kwarg) or 1
+
+    try:
+        if number == "last":
+            number = paginator.num_pages
+
+        page = paginator.page(number)
+    except InvalidPage:
+        # The view redirects invalid pages home
+        return None
+
+    pks = list(page.object_list)
+    rooms = Room.objects.filter(pk__in=pks).aggregate(
+        updated=Max("updated_at"), host_updated=Max("host__updated_at")
+    )
+    photos = Photo.objects.filter(room__in=pks).aggregate(
+        updated=Max("updated_at"), count=Count("pk")
+    )
+    reviews = Review.objects.filter(room__in=pks).aggregate(
+        updated=Max("updated_at"), count=Count("pk")
+    )
+    saved = sorted(get_request_saved_room_ids(request) & set(pks))
+    return (
+        paginator.count,
+        page.number,
+        pks,
+        saved,
+        rooms["updated"],
+        rooms["host_updated"],
+        photos["updated"],
+        reviews["updated"],
+        photos["count"],
+        reviews["count"],
+    )
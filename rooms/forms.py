@@ -1,5 +1,5 @@
 from django import forms
-from rooms.models import RoomType, Amenity, Facility
+from rooms.models import Room, RoomType, Amenity, Facility
 from django_countries.fields import CountryField
 
 
@@ -22,6 +22,9 @@ class SearchForm(forms.Form):
         is_superhost : BooleanField
         amenities    : ModelMultipleChoiceField (Amenity)
         facilities   : ModelMultipleChoiceField (Facility)
+
+    Method:
+        search : return rooms matching the cleaned data
     """
 
     city = forms.CharField(initial="Anywhere")
@@ -46,3 +49,46 @@ class SearchForm(forms.Form):
         queryset=Facility.objects.all(),
         widget=forms.CheckboxSelectMultiple,
     )
+
+    def search(self, rooms=None):
+        """Filter rooms (all rooms by default) by the cleaned data
+
+        A room matches when it has every selected amenity and facility.
+        """
+        if rooms is None:
+            rooms = Room.objects.all()
+
+        data = self.cleaned_data
+        filter_args = {"country": data.get("country")}
+
+        if data.get("city") != "Anywhere":
+            filter_args["city__startswith"] = data.get("city")
+
+        if data.get("room_type") is not None:
+            filter_args["room_type"] = data.get("room_type")
+
+        for field, lookup in (
+            ("price", "price__lte"),
+            ("guests", "guests__gte"),
+            ("bedrooms", "bedrooms__gte"),
+            ("beds", "beds__gte"),
+            ("baths", "baths__gte"),
+        ):
+            if data.get(field) is not None:
+                filter_args[lookup] = data.get(field)
+
+        if data.get("instant_book") is True:
+            filter_args["instant_book"] = True
+
+        if data.get("is_superhost") is True:
+            filter_args["host__is_superhost"] = True
+
+        rooms = rooms.filter(**filter_args)
+
+        for amenity in data.get("amenities") or ():
+            rooms = rooms.filter(amenities=amenity)
+
+        for facility in data.get("facilities") or ():
+            rooms = rooms.filter(facilities=facility)
+
+        return rooms
@@ -0,0 +1,407 @@
+import csv
+import json
+from collections import defaultdict
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from core.seeding import BATCH_SIZE, bulk_insert, bulk_insert_m2m, chunked
+from rooms.models import Room, RoomType, Photo, Amenity, Facility, HouseRule
+from users.models import User
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+
+# Lists are JSON arrays in JSONL records and "|" separated in CSV cells
+CSV_SEPARATOR = "|"
+
+ROOM_FIELDS = (
+    "name",
+    "description",
+    "country",
+    "city",
+    "price",
+    "address",
+    "guests",
+    "beds",
+    "bedrooms",
+    "baths",
+    "check_in",
+    "check_out",
+    "instant_book",
+)
+
+M2M_FIELDS = (
+    ("amenities", Amenity),
+    ("facilities", Facility),
+    ("house_rules", HouseRule),
+)
+
+# Room attribute of every field bulk_update may write
+UPDATE_ATTNAMES = {
+    field: Room._meta.get_field(field).attname
+    for field in ROOM_FIELDS + ("host", "room_type")
+}
+
+LIST_FIELDS = tuple(key for key, model in M2M_FIELDS) + ("photos",)
+
+# Spreadsheets write booleans in many ways, BooleanField only reads a few
+CSV_BOOLEANS = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+}
+
+
+class RoomImportError(Exception):
+    pass
+
+
+class LineReader:
+    """Iterate decoded lines of a binary file, counting the bytes read"""
+
+    def __init__(self, file):
+        self.file = file
+        self.position = 0
+
+    def __iter__(self):
+        for line in self.file:
+            # utf-8-sig drops the BOM spreadsheets put before the first line
+            encoding = "utf-8-sig" if not self.position else "utf-8"
+            self.position += len(line)
+            yield line.decode(encoding)
+
+
+def read_records(lines, format):
+    """Yield (line number, record dict) of CSV or JSONL lines, one at a time
+
+    A line which isn't a record gives a ValidationError in place of a dict.
+    """
+    if format == FORMAT_JSONL:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = ValidationError(f"Invalid JSON ({e})")
+
+            if not isinstance(record, (dict, ValidationError)):
+                record = ValidationError("Record is not a JSON object")
+
+            yield number, record
+
+        return
+
+    reader = csv.DictReader(lines)
+
+    for record in reader:
+        for key in LIST_FIELDS:
+            if record.get(key) is not None:
+                values = record[key].split(CSV_SEPARATOR)
+                record[key] = [value.strip() for value in values if value.strip()]
+
+        instant_book = (record.get("instant_book") or "").strip().lower()
+        record["instant_book"] = CSV_BOOLEANS.get(instant_book, instant_book)
+
+        yield reader.line_num, record
+
+
+class RoomImporter:
+    """Create or update rooms of partner records, matched on external_id
+
+    Host emails and names of room types, amenities, facilities and house
+    rules are resolved through in-memory maps. Records are validated and
+    written batch by batch in one transaction each, new rooms with
+    bulk_create and known ones with bulk_update of their changed fields.
+    A record of a known room may hold only some fields: the others keep
+    their stored value. A list present in a record (amenities, facilities,
+    house_rules, photos) replaces the room's one when it differs.
+
+    Fields:
+        created   : number of rooms created
+        updated   : number of rooms changed by their record
+        unchanged : number of rooms their record left as they were
+        errors    : (line number, message) of skipped records
+
+    Method:
+        import_records : import (line, record) pairs, yield records per batch
+    """
+
+    def __init__(self, host=None, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.names = {
+            key: dict(model.objects.values_list("name", "pk"))
+            for key, model in (("room_type", RoomType),) + M2M_FIELDS
+        }
+        self.hosts = {}
+        self.default_host = host
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors = []
+
+        if host:
+            self.load_hosts([host])
+
+            if host not in self.hosts:
+                raise RoomImportError(f"Unknown host {host}")
+
+    def load_hosts(self, emails):
+        missing = set(emails) - set(self.hosts) - {None, ""}
+
+        if missing:
+            users = User.objects.filter(email__in=missing)
+            self.hosts.update(users.values_list("email", "pk"))
+
+    def load_rooms(self, external_ids):
+        """Return stored values of the rooms of external_ids, by external_id"""
+        external_ids = set(external_ids) - {None}
+
+        if not external_ids:
+            return {}
+
+        return {
+            values["external_id"]: values
+            for values in Room.objects.filter(external_id__in=external_ids).values(
+                "pk", "external_id", *UPDATE_ATTNAMES.values()
+            )
+        }
+
+    def import_records(self, records):
+        for batch in chunked(records, self.batch_size):
+            objects = [record for line, record in batch if isinstance(record, dict)]
+            self.load_hosts(record.get("host") for record in objects)
+            stored = self.load_rooms(get_external_id(record) for record in objects)
+            rooms = {}
+
+            for line, record in batch:
+                try:
+                    room, fields, links, photos = self.build_room(record, stored)
+                except ValidationError as e:
+                    self.errors.append((line, format_errors(e)))
+                    continue
+
+                # The last record of an external_id wins
+                rooms[room.external_id] = (room, fields, links, photos)
+
+            if rooms:
+                with transaction.atomic():
+                    self.save_rooms(list(rooms.values()), stored)
+
+            yield len(batch)
+
+    def build_room(self, record, stored):
+        """Return unsaved Room, fields, {m2m field: pks} and photos of a record
+
+        fields are the Room fields the record gives. A known room is built on
+        its stored values, so the fields left out keep them and the whole room
+        is still validated.
+        """
+        if isinstance(record, ValidationError):
+            raise record
+
+        errors = {}
+        external_id = get_external_id(record)
+        values = stored.get(external_id)
+        host = record.get("host") or self.default_host
+        room_type = record.get("room_type")
+        fields = {field for field in ROOM_FIELDS if record.get(field) not in (None, "")}
+
+        if values is None or record.get("host"):
+            fields.add("host")
+
+        if values is None or room_type:
+            fields.add("room_type")
+
+        room = Room(**(values or {"external_id": external_id}))
+
+        for field in fields & set(ROOM_FIELDS):
+            setattr(room, field, record[field])
+
+        if "host" in fields:
+            room.host_id = self.hosts.get(host)
+
+        if "room_type" in fields:
+            room.room_type_id = self.names["room_type"].get(room_type)
+
+        if room.external_id is None:
+            errors["external_id"] = ["This field is required."]
+
+        if room.host_id is None:
+            errors["host"] = [f"Unknown host {host}" if host else "Missing host"]
+
+        if room_type and room.room_type_id is None:
+            errors["room_type"] = [f"Unknown room type {room_type}"]
+
+        links = {}
+
+        for key, model in M2M_FIELDS:
+            if key not in record:
+                continue
+
+            names = record[key] or []
+            unknown = [name for name in names if name not in self.names[key]]
+
+            if unknown:
+                errors[key] = [f"Unknown {', '.join(unknown)}"]
+
+            links[key] = {self.names[key].get(name) for name in names} - {None}
+
+        try:
+            # Host and room type exist, they come from the maps
+            room.full_clean(exclude=["host", "room_type"], validate_unique=False)
+        except ValidationError as e:
+            for field, messages in e.message_dict.items():
+                errors.setdefault(field, []).extend(messages)
+
+        photos = None
+
+        if "photos" in record:
+            photos = []
+
+            for photo in record["photos"] or []:
+                if isinstance(photo, str):
+                    photo = {"file": photo}
+
+                if not photo.get("file"):
+                    errors["photos"] = ["Photo without file"]
+                    break
+
+                caption = photo.get("caption") or room.name or ""
+                photos.append((photo["file"], caption[:80]))
+
+        if errors:
+            raise ValidationError(errors)
+
+        # Room.save capitalizes city, bulk_create skips it
+        room.city = str.capitalize(room.city)
+        return room, fields, links, photos
+
+    def save_rooms(self, rooms, stored):
+        existing = {
+            room.external_id: stored[room.external_id]
+            for room, fields, links, photos in rooms
+            if room.external_id in stored
+        }
+        new_rooms = []
+        changed_rooms = defaultdict(list)
+        host_pks = set()
+
+        for room, fields, links, photos in rooms:
+            host_pks.add(room.host_id)
+            current = existing.get(room.external_id)
+
+            if current is None:
+                new_rooms.append(room)
+                continue
+
+            host_pks.add(current["host_id"])
+            # Fields left out of the record keep their stored value
+            changed = frozenset(
+                field
+                for field in fields
+                if getattr(room, UPDATE_ATTNAMES[field])
+                != current[UPDATE_ATTNAMES[field]]
+            )
+
+            if changed:
+                changed_rooms[changed].append(room)
+
+        bulk_insert(Room, new_rooms, self.batch_size, with_pks=True)
+        now = timezone.now()
+
+        # bulk_update writes a CASE per room and field, so rooms are grouped by
+        # changed fields and a field left out of a record is never written.
+        # It skips auto_now, so updated_at is written along
+        for fields, group in changed_rooms.items():
+            for room in group:
+                room.updated_at = now
+
+            Room.objects.bulk_update(
+                group, sorted(fields) + ["updated_at"], self.batch_size
+            )
+
+        known_pks = {values["pk"] for values in existing.values()}
+        changed_pks = {room.pk for group in changed_rooms.values() for room in group}
+        updated_pks = set(changed_pks)
+
+        for key, model in M2M_FIELDS:
+            field = Room._meta.get_field(key)
+            through = field.remote_field.through.objects.filter(room_id__in=known_pks)
+            current = defaultdict(set)
+
+            for room_pk, pk in through.values_list(
+                "room_id", f"{field.m2m_reverse_field_name()}_id"
+            ):
+                current[room_pk].add(pk)
+
+            replaced = [
+                (room, links[key])
+                for room, fields, links, photos in rooms
+                if key in links and links[key] != current[room.pk]
+            ]
+            changed_pks.update(room.pk for room, pks in replaced)
+            through.filter(room_id__in=[room.pk for room, pks in replaced]).delete()
+            bulk_insert_m2m(
+                Room,
+                key,
+                ((room.pk, pk) for room, pks in replaced for pk in sorted(pks)),
+                self.batch_size,
+            )
+
+        current = defaultdict(list)
+
+        for room_pk, file, caption in (
+            Photo.objects.filter(room_id__in=known_pks)
+            .order_by("pk")
+            .values_list("room_id", "file", "caption")
+        ):
+            current[room_pk].append((file, caption))
+
+        replaced = [
+            (room, photos)
+            for room, fields, links, photos in rooms
+            if photos is not None and photos != current[room.pk]
+        ]
+        changed_pks.update(room.pk for room, photos in replaced)
+        Photo.objects.filter(
+            room_id__in=[room.pk for room, photos in replaced if room.pk in known_pks]
+        ).delete()
+        bulk_insert(
+            Photo,
+            (
+                Photo(file=file, caption=caption, room_id=room.pk)
+                for room, photos in replaced
+                for file, caption in photos
+            ),
+            self.batch_size,
+        )
+
+        # bulk_create skips the signals keeping room_count up to date
+        User.objects.refresh_counts(host_pks)
+        changed_pks &= known_pks
+
+        # Rooms changed only by their links or photos are touched too
+        Room.objects.filter(pk__in=changed_pks - updated_pks).update(updated_at=now)
+        self.created += len(new_rooms)
+        self.updated += len(changed_pks)
+        self.unchanged += len(known_pks) - len(changed_pks)
+
+
+def get_external_id(record):
+    return str(record.get("external_id") or "").strip() or None
+
+
+def format_errors(error):
+    if not hasattr(error, "error_dict"):
+        return "; ".join(error.messages)
+
+    return "; ".join(
+        f"{field}: {' '.join(messages)}"
+        for field, messages in error.message_dict.items()
+    )
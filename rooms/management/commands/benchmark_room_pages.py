@@ -0,0 +1,83 @@
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection, reset_queries
+from django.db.models import Count
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from core.management.commands.custom_command import CustomCommand
+from rooms.models import Room
+from rooms.views import HomeView, RoomDetailView
+
+
+class Command(CustomCommand):
+    help = "Benchmark 304 answers of room pages against full renders"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", default=100, help="Number of requests per page")
+
+    def handle(self, *args, **options):
+        number = int(options.get("number"))
+
+        self.stdout.write(self.style.SUCCESS("■ START BENCHMARK ROOM PAGES"))
+
+        # The room with the most reviews has the heaviest detail page
+        room = (
+            Room.objects.annotate(review_count=Count("reviews"))
+            .order_by("-review_count")
+            .first()
+        )
+
+        if room is None:
+            self.stdout.write(self.style.ERROR("■ No rooms, run seed_all"))
+            return
+
+        self.factory = RequestFactory()
+
+        for label, view, path, kwargs in (
+            ("HOME", HomeView.as_view(), "/", {}),
+            (
+                "ROOM DETAIL",
+                RoomDetailView.as_view(),
+                room.get_absolute_url(),
+                {"pk": room.pk},
+            ),
+        ):
+            etag = self.request(view, path, kwargs)["ETag"]
+
+            for name, headers in (
+                ("FULL RENDER", {}),
+                ("304", {"HTTP_IF_NONE_MATCH": etag}),
+            ):
+                elapsed, queries, status = self.measure(
+                    number, lambda: self.request(view, path, kwargs, **headers)
+                )
+                self.stdout.write(
+                    f"■ {label:<11} {name:<11} : {elapsed / number * 1000:6.2f} ms, "
+                    f"{queries} queries / request, status {status}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("■ SUCCESS BENCHMARK ROOM PAGES!"))
+
+    def request(self, view, path, kwargs, **headers):
+        request = self.factory.get(path, **headers)
+        request.user = AnonymousUser()
+        response = view(request, **kwargs)
+
+        if hasattr(response, "render"):
+            response.render()
+
+        return response
+
+    def measure(self, number, request):
+        # Queries are counted once, the log of every request would be cut
+        reset_queries()
+
+        with CaptureQueriesContext(connection) as queries:
+            status = request().status_code
+
+        started = time.perf_counter()
+
+        for _ in range(number):
+            request()
+
+        return time.perf_counter() - started, len(queries), status
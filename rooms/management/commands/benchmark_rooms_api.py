@@ -0,0 +1,120 @@
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from core.management.commands.custom_command import CustomCommand
+from rooms.api import RoomListApiView
+from rooms.models import Room
+from rooms.serializers import LIST_FIELDS
+
+
+class Command(CustomCommand):
+    help = "Benchmark pages of the rooms API against serializing model instances"
+
+    SPARSE_FIELDS = "id,name,price,url"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", default=50, help="Number of pages to read")
+        parser.add_argument("--page-size", default=20, help="Number of rooms per page")
+
+    def handle(self, *args, **options):
+        pages = int(options.get("pages"))
+        page_size = int(options.get("page_size"))
+
+        self.stdout.write(self.style.SUCCESS("■ START BENCHMARK ROOMS API"))
+
+        if Room.objects.count() < pages * page_size:
+            self.stdout.write(self.style.ERROR("■ Not enough rooms, run seed_all"))
+            return
+
+        self.factory = RequestFactory()
+        self.view = RoomListApiView.as_view()
+
+        for label, read_page in (
+            ("API ALL FIELDS", lambda cursor: self.api_page(page_size, cursor)),
+            (
+                "API SPARSE FIELDS",
+                lambda cursor: self.api_page(page_size, cursor, self.SPARSE_FIELDS),
+            ),
+            ("MODEL INSTANCES", lambda cursor: self.instances_page(page_size, cursor)),
+        ):
+            elapsed, queries, size = self.measure(pages, read_page)
+            self.stdout.write(
+                f"■ {label:<17} : {elapsed / pages * 1000:6.1f} ms / page "
+                f"({pages * page_size / elapsed:,.0f} rooms/s), "
+                f"{queries / pages:.1f} queries / page, {size // pages:,} bytes / page"
+            )
+
+        self.stdout.write(self.style.SUCCESS("■ SUCCESS BENCHMARK ROOMS API!"))
+
+    def measure(self, pages, read_page):
+        cursor = None
+        size = 0
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+
+            for _ in range(pages):
+                content, cursor = read_page(cursor)
+                size += len(content)
+
+            elapsed = time.perf_counter() - started
+
+        return elapsed, len(queries), size
+
+    def api_page(self, page_size, cursor, fields=None):
+        params = {"page_size": page_size}
+
+        if cursor:
+            params["cursor"] = cursor
+
+        if fields:
+            params["fields"] = fields
+
+        response = self.view(self.factory.get("/api/rooms/", params))
+        next_url = json.loads(response.content)["next"]
+        return response.content, parse_qs(urlsplit(next_url).query)["cursor"][0]
+
+    def instances_page(self, page_size, offset):
+        """Same fields as the API list, read through prefetched instances"""
+        offset = offset or 0
+        rooms = (
+            Room.objects.select_related("host", "room_type")
+            .prefetch_related("amenities", "facilities", "photos", "reviews")
+            .order_by("pk")[offset : offset + page_size]
+        )
+        results = []
+
+        for room in rooms:
+            values = {
+                "id": room.pk,
+                "country": room.country.code,
+                "host": {
+                    "id": room.host.pk,
+                    "username": room.host.username,
+                    "is_superhost": room.host.is_superhost,
+                },
+                "room_type": room.room_type.name if room.room_type else None,
+                "amenities": sorted(amenity.name for amenity in room.amenities.all()),
+                "facilities": sorted(
+                    facility.name for facility in room.facilities.all()
+                ),
+                "photos": [
+                    {"url": photo.file.url, "caption": photo.caption}
+                    for photo in room.photos.all()
+                ],
+                "rating": room.total_rating(),
+                "url": room.get_absolute_url(),
+            }
+            results.append(
+                {
+                    field: values[field] if field in values else getattr(room, field)
+                    for field in LIST_FIELDS
+                }
+            )
+
+        content = json.dumps({"results": results}, cls=DjangoJSONEncoder)
+        return content.encode(), offset + page_size
@@ -0,0 +1,73 @@
+import os
+import time
+from core.management.commands.custom_command import CustomCommand
+from core.seeding import BATCH_SIZE
+from rooms.importers import (
+    FORMAT_CSV,
+    FORMAT_JSONL,
+    FORMATS,
+    LineReader,
+    RoomImporter,
+    read_records,
+)
+
+
+class Command(CustomCommand):
+    help = "Create or update rooms from a partner's CSV or JSONL file"
+
+    MAX_ERRORS_SHOWN = 20
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file, one room per record")
+        parser.add_argument(
+            "--format", choices=FORMATS, help="File format, guessed from extension"
+        )
+        parser.add_argument("--host", help="Email of the host of records without one")
+        parser.add_argument(
+            "--batch-size", default=BATCH_SIZE, help="Number of records per transaction"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            path = options.get("path")
+            format = options.get("format") or (
+                FORMAT_JSONL if path.endswith((".jsonl", ".ndjson")) else FORMAT_CSV
+            )
+
+            self.stdout.write(self.style.SUCCESS("■ START IMPORT ROOMS"))
+
+            importer = RoomImporter(
+                host=options.get("host"), batch_size=int(options.get("batch_size"))
+            )
+            progress = self.progress(os.path.getsize(path), unit="bytes")
+            started = time.perf_counter()
+            done = 0
+
+            with open(path, "rb") as file:
+                lines = LineReader(file)
+
+                for count in importer.import_records(read_records(lines, format)):
+                    done += count
+                    rate = done / (time.perf_counter() - started)
+                    progress.update(lines.position, suffix=f"{rate:,.0f} records/s")
+
+            progress.finish()
+
+            for line, message in importer.errors[: self.MAX_ERRORS_SHOWN]:
+                self.stdout.write(self.style.ERROR(f"■ line {line}: {message}"))
+
+            if len(importer.errors) > self.MAX_ERRORS_SHOWN:
+                hidden = len(importer.errors) - self.MAX_ERRORS_SHOWN
+                self.stdout.write(self.style.ERROR(f"■ ... and {hidden} more"))
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"■ SUCCESS IMPORT ROOMS! {importer.created} created, "
+                    f"{importer.updated} updated, {importer.unchanged} unchanged, "
+                    f"{len(importer.errors)} skipped"
+                )
+            )
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"■ {e}"))
+            self.stdout.write(self.style.ERROR("■ FAIL IMPORT ROOMS"))
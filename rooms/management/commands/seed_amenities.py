@@ -1,64 +1,64 @@
 from core.management.commands.custom_command import CustomCommand
 from rooms.models import Amenity
 
+AMENITIES = [
+    "Air conditioning",
+    "Alarm Clock",
+    "Balcony",
+    "Bathroom",
+    "Bathtub",
+    "Bed Linen",
+    "Boating",
+    "Cable TV",
+    "Carbon monoxide detectors",
+    "Chairs",
+    "Children Area",
+    "Coffee Maker in Room",
+    "Cooking hob",
+    "Cookware & Kitchen Utensils",
+    "Dishwasher",
+    "Double bed",
+    "En suite bathroom",
+    "Free Parking",
+    "Free Wireless Internet",
+    "Freezer",
+    "Fridge / Freezer",
+    "Golf",
+    "Hair Dryer",
+    "Heating",
+    "Hot tub",
+    "Indoor Pool",
+    "Ironing Board",
+    "Microwave",
+    "Outdoor Pool",
+    "Outdoor Tennis",
+    "Oven",
+    "Queen size bed",
+    "Restaurant",
+    "Shopping Mall",
+    "Shower",
+    "Smoke detectors",
+    "Sofa",
+    "Stereo",
+    "Swimming pool",
+    "Toilet",
+    "Towels",
+    "TV",
+]
+
 
 class Command(CustomCommand):
     help = "Automatically create amenities"
 
     def handle(self, *args, **options):
         try:
-            amenities = [
-                "Air conditioning",
-                "Alarm Clock",
-                "Balcony",
-                "Bathroom",
-                "Bathtub",
-                "Bed Linen",
-                "Boating",
-                "Cable TV",
-                "Carbon monoxide detectors",
-                "Chairs",
-                "Children Area",
-                "Coffee Maker in Room",
-                "Cooking hob",
-                "Cookware & Kitchen Utensils",
-                "Dishwasher",
-                "Double bed",
-                "En suite bathroom",
-                "Free Parking",
-                "Free Wireless Internet",
-                "Freezer",
-                "Fridge / Freezer",
-                "Golf",
-                "Hair Dryer",
-                "Heating",
-                "Hot tub",
-                "Indoor Pool",
-                "Ironing Board",
-                "Microwave",
-                "Outdoor Pool",
-                "Outdoor Tennis",
-                "Oven",
-                "Queen size bed",
-                "Restaurant",
-                "Shopping Mall",
-                "Shower",
-                "Smoke detectors",
-                "Sofa",
-                "Stereo",
-                "Swimming pool",
-                "Toilet",
-                "Towels",
-                "TV",
-            ]
-
             self.stdout.write(self.style.SUCCESS("■ START CREATE AMENITIES"))
 
-            for idx, name in enumerate(amenities):
+            for idx, name in enumerate(AMENITIES):
                 Amenity.objects.create(name=name)
                 self.progress_bar(
                     idx + 1,
-                    len(amenities),
+                    len(AMENITIES),
                     prefix="■ PROGRESS",
                     suffix="Complete",
                     length=40,
@@ -1,28 +1,28 @@
 from core.management.commands.custom_command import CustomCommand
 from rooms.models import Facility
 
+FACILITIES = [
+    "Private entrance",
+    "Paid parking on premises",
+    "Paid parking off premises",
+    "Elevator",
+    "Parking",
+    "Gym",
+]
+
 
 class Command(CustomCommand):
     help = "Automatically create facilities"
 
     def handle(self, *args, **options):
         try:
-            facilities = [
-                "Private entrance",
-                "Paid parking on premises",
-                "Paid parking off premises",
-                "Elevator",
-                "Parking",
-                "Gym",
-            ]
-
             self.stdout.write(self.style.SUCCESS("■ START CREATE FACILITIES"))
 
-            for idx, name in enumerate(facilities):
+            for idx, name in enumerate(FACILITIES):
                 Facility.objects.create(name=name)
                 self.progress_bar(
                     idx + 1,
-                    len(facilities),
+                    len(FACILITIES),
                     prefix="■ PROGRESS",
                     suffix="Complete",
                     length=40,
@@ -1,21 +1,21 @@
 from core.management.commands.custom_command import CustomCommand
 from rooms.models import RoomType
 
+ROOM_TYPES = ["Hotel room", "Shared room", "Private room", "Entire place"]
+
 
 class Command(CustomCommand):
     help = "Automatically create room types"
 
     def handle(self, *args, **options):
         try:
-            room_types = ["Hotel room", "Shared room", "Private room", "Entire place"]
-
             self.stdout.write(self.style.SUCCESS("■ START CREATE ROOM TYPES"))
 
-            for idx, name in enumerate(room_types):
+            for idx, name in enumerate(ROOM_TYPES):
                 RoomType.objects.create(name=name)
                 self.progress_bar(
                     idx + 1,
-                    len(room_types),
+                    len(ROOM_TYPES),
                     prefix="■ PROGRESS",
                     suffix="Complete",
                     length=40,
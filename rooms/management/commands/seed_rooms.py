@@ -1,7 +1,8 @@
 from core.management.commands.custom_command import CustomCommand
-from django.contrib.admin.utils import flatten
+from core.seeding import BATCH_SIZE, bulk_insert, bulk_insert_m2m, chunked
+from django.db import transaction
 from django_seed import Seed
-from random import choice, randint
+from random import choice, randint, random
 from rooms.models import Room, RoomType, Photo, Amenity, Facility, HouseRule
 from users.models import User
 
@@ -9,66 +10,107 @@ from users.models import User
 class Command(CustomCommand):
     help = "Automatically create rooms"
 
+    # Faker is slow, texts are drawn from pools generated once per run
+    POOL_SIZE = 500
+
     def add_arguments(self, parser):
         parser.add_argument("--number", default=1, help="Number of rooms to create")
+        parser.add_argument(
+            "--batch-size", default=BATCH_SIZE, help="Number of rooms per insert"
+        )
 
     def handle(self, *args, **options):
         try:
             number = int(options.get("number"))
+            batch_size = int(options.get("batch_size"))
 
             self.stdout.write(self.style.SUCCESS("■ START CREATE ROOMS"))
 
-            users = User.objects.all()
-            room_types = RoomType.objects.all()
-            amenities = Amenity.objects.all()
-            facilities = Facility.objects.all()
-            house_rules = HouseRule.objects.all()
+            self.load_choices()
+            progress = self.progress(number, unit="rooms")
 
-            seeder = Seed.seeder()
-            seeder.add_entity(
-                Room,
-                number,
-                {
-                    "name": lambda x: seeder.faker.address(),
-                    "host": lambda x: choice(users),
-                    "room_type": lambda x: choice(room_types),
-                    "price": lambda x: randint(1, 300),
-                    "guests": lambda x: randint(1, 10),
-                    "beds": lambda x: randint(1, 5),
-                    "bedrooms": lambda x: randint(1, 5),
-                    "baths": lambda x: randint(1, 5),
-                },
-            )
-            clean_pk_list = flatten(list(seeder.execute().values()))
-
-            for idx, pk in enumerate(clean_pk_list):
-                room = Room.objects.get(pk=pk)
-                BOOLEAN = [True, False]
-                self.progress_bar(
-                    idx + 1, number, prefix="■ PROGRESS", suffix="Complete", length=40
-                )
+            for chunk in chunked(range(number), batch_size):
+                with transaction.atomic():
+                    self.create_rooms(len(chunk))
 
-                for i in range(randint(7, 27)):
-                    Photo.objects.create(
-                        caption=seeder.faker.sentence(),
-                        file=f"room_photos/{randint(1, 31)}.webp",
-                        room=room,
-                    )
+                progress.advance(len(chunk))
 
-                for amenity in amenities:
-                    if choice(BOOLEAN):
-                        room.amenities.add(amenity)
-
-                for facility in facilities:
-                    if choice(BOOLEAN):
-                        room.facilities.add(facility)
-
-                for house_rule in house_rules:
-                    if choice(BOOLEAN):
-                        room.house_rules.add(house_rule)
+            # bulk_create skips the signals keeping room_count up to date
+            User.objects.refresh_counts()
 
             self.stdout.write(self.style.SUCCESS("■ SUCCESS CREATE ALL ROOMS!"))
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"■ {e}"))
             self.stdout.write(self.style.ERROR("■ FAIL CREATE ROOMS"))
+
+    def load_choices(self):
+        faker = Seed.faker()
+        pool = range(self.POOL_SIZE)
+
+        self.user_pks = list(User.objects.values_list("pk", flat=True))
+        self.room_type_pks = list(RoomType.objects.values_list("pk", flat=True))
+        self.amenity_pks = list(Amenity.objects.values_list("pk", flat=True))
+        self.facility_pks = list(Facility.objects.values_list("pk", flat=True))
+        self.house_rule_pks = list(HouseRule.objects.values_list("pk", flat=True))
+
+        if not self.user_pks:
+            raise ValueError("Create users first")
+
+        self.names = [faker.address()[:140] for _ in pool]
+        self.descriptions = [faker.text() for _ in pool]
+        self.countries = [faker.country_code() for _ in pool]
+        self.cities = [str.capitalize(faker.city()) for _ in pool]
+        self.addresses = [faker.street_address() for _ in pool]
+        self.times = [faker.time_object() for _ in pool]
+        self.captions = [faker.sentence()[:80] for _ in pool]
+
+    def create_rooms(self, number):
+        rooms = bulk_insert(
+            Room,
+            (
+                Room(
+                    name=choice(self.names),
+                    description=choice(self.descriptions),
+                    country=choice(self.countries),
+                    city=choice(self.cities),
+                    price=randint(1, 300),
+                    address=choice(self.addresses),
+                    guests=randint(1, 10),
+                    beds=randint(1, 5),
+                    bedrooms=randint(1, 5),
+                    baths=randint(1, 5),
+                    check_in=choice(self.times),
+                    check_out=choice(self.times),
+                    instant_book=choice([True, False]),
+                    host_id=choice(self.user_pks),
+                    room_type_id=choice(self.room_type_pks or [None]),
+                )
+                for _ in range(number)
+            ),
+            with_pks=True,
+        )
+
+        bulk_insert(
+            Photo,
+            (
+                Photo(
+                    caption=choice(self.captions),
+                    file=f"room_photos/{randint(1, 31)}.webp",
+                    room_id=room.pk,
+                )
+                for room in rooms
+                for _ in range(randint(7, 27))
+            ),
+        )
+
+        for field_name, pks in (
+            ("amenities", self.amenity_pks),
+            ("facilities", self.facility_pks),
+            ("house_rules", self.house_rule_pks),
+        ):
+            bulk_insert_m2m(
+                Room,
+                field_name,
+                ((room.pk, pk) for room in rooms for pk in pks if random() < 0.5),
+            )
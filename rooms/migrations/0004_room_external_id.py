@@ -0,0 +1,18 @@
+# Generated by Django 2.2.13 on 2026-10-19 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0003_auto_20191222_2155"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=80, null=True, unique=True),
+        ),
+    ]
@@ -97,6 +97,14 @@ class Photo(AbstractTimeStamp):
         return self.caption
 
 
+class RoomQuerySet(models.QuerySet):
+    def for_cards(self):
+        """Load everything mixins/room_card.html reads in constant queries
+        host by join, photos (first_photo) and reviews (total_rating) prefetched
+        """
+        return self.select_related("host").prefetch_related("photos", "reviews")
+
+
 class Room(AbstractTimeStamp):
     """Room Model
 
@@ -122,6 +130,7 @@ class Room(AbstractTimeStamp):
         amenities    : Amenity model (N:N)
         facilities   : Facility model (N:N)
         house_rules  : HouseRule model(N:N)
+        external_id  : CharField (partner's id, upsert key of import_rooms)
         created_at   : DateTimeField
         updated_at   : DateTimeField
 
@@ -154,6 +163,9 @@ class Room(AbstractTimeStamp):
     amenities = models.ManyToManyField("Amenity", related_name="rooms", blank=True)
     facilities = models.ManyToManyField("Facility", related_name="rooms", blank=True)
     house_rules = models.ManyToManyField("HouseRule", related_name="rooms", blank=True)
+    external_id = models.CharField(max_length=80, unique=True, null=True, blank=True)
+
+    objects = RoomQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -0,0 +1,132 @@
+from django.test import TestCase
+from django.urls import reverse
+from reviews.models import Review
+from rooms.models import Room, RoomType, Amenity, Photo
+from users.models import User
+from datetime import time
+
+
+class RoomApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running RoomApiTest
+        Create 5 rooms with amenities and photos, and a review of the first
+        """
+        cls.host = User.objects.create_user("host", is_superhost=True)
+        room_type = RoomType.objects.create(name="Entire place")
+        wifi = Amenity.objects.create(name="Wifi")
+        tv = Amenity.objects.create(name="TV")
+
+        for i in range(5):
+            room = Room.objects.create(
+                name=f"Room {i}",
+                description="Test Description",
+                country="KR",
+                city="Seoul" if i % 2 else "Busan",
+                price=100 + i,
+                address="Test Address",
+                guests=2,
+                beds=1,
+                bedrooms=1,
+                baths=1,
+                check_in=time(15, 0),
+                check_out=time(11, 0),
+                host=cls.host,
+                room_type=room_type,
+            )
+            room.amenities.add(wifi, *([tv] if i < 2 else []))
+            Photo.objects.create(
+                caption=f"Photo {i}", file="room_photos/1.webp", room=room
+            )
+
+        Review.objects.create(
+            review="Good",
+            accuracy=5,
+            communication=5,
+            cleanliness=4,
+            location=4,
+            check_in=3,
+            value=3,
+            user=cls.host,
+            room=Room.objects.order_by("pk").first(),
+        )
+
+    def test_room_list_api_pages(self):
+        """Room list API test
+        Check cursors walk every room once, in constant queries per page
+        """
+        url = reverse("rooms_api:list") + "?page_size=2"
+        names = []
+
+        while url:
+            with self.assertNumQueries(5):
+                data = self.client.get(url).json()
+
+            names.extend(room["name"] for room in data["results"])
+            url = data["next"]
+
+        self.assertEqual([f"Room {i}" for i in range(5)], names)
+
+    def test_room_list_api_fields(self):
+        """Room list API test
+        Check ?fields= returns only asked fields, in one query
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("rooms_api:list"), {"fields": "name,host,url"}
+            )
+
+        room = response.json()["results"][0]
+        self.assertEqual(["name", "host", "url"], list(room))
+        self.assertEqual(
+            {"id": self.host.pk, "username": "host", "is_superhost": True},
+            room["host"],
+        )
+        self.assertEqual(Room.objects.order_by("pk")[0].get_absolute_url(), room["url"])
+
+    def test_room_detail_api(self):
+        """Room detail API test
+        Check every field of a room, matching the model's methods
+        """
+        room = Room.objects.order_by("pk").first()
+        data = self.client.get(reverse("rooms_api:detail", args=[room.pk])).json()
+
+        self.assertEqual("Test Description", data["description"])
+        self.assertEqual("KR", data["country"])
+        self.assertEqual("15:00:00", data["check_in"])
+        self.assertEqual("Entire place", data["room_type"])
+        self.assertEqual(["TV", "Wifi"], data["amenities"])
+        self.assertEqual([], data["house_rules"])
+        self.assertEqual([room.first_photo()], [p["url"] for p in data["photos"]])
+        self.assertEqual(room.total_rating(), data["rating"])
+        self.assertNotIn("address", data)
+
+    def test_room_search_api(self):
+        """Room search API test
+        Check SearchForm filters apply, every selected amenity is required
+        """
+        tv = Amenity.objects.get(name="TV")
+        data = self.client.get(
+            reverse("rooms_api:search"),
+            {"country": "KR", "city": "Busan", "amenities": [tv.pk], "fields": "name"},
+        ).json()
+
+        self.assertEqual([{"name": "Room 0"}], data["results"])
+
+    def test_room_api_errors(self):
+        """Room API test
+        Check bad parameters answer JSON errors
+        """
+        responses = (
+            (400, self.client.get(reverse("rooms_api:list"), {"fields": "secret"})),
+            (400, self.client.get(reverse("rooms_api:list"), {"cursor": "@@"})),
+            (400, self.client.get(reverse("rooms_api:search"), {"city": "Seoul"})),
+            (404, self.client.get(reverse("rooms_api:detail", args=[999]))),
+            (405, self.client.post(reverse("rooms_api:list"))),
+        )
+
+        for status, response in responses:
+            self.assertEqual(status, response.status_code)
+
+        self.assertEqual("Unknown fields: secret", responses[0][1].json()["error"])
+        self.assertIn("country", responses[2][1].json()["errors"])
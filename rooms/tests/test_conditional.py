@@ -0,0 +1,185 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from lists.models import List
+from reviews.models import Review
+from rooms.models import Room, Photo, Amenity
+from users.avatars import import_avatar
+from users.models import AvatarImport, User
+from datetime import time
+from io import BytesIO
+from PIL import Image
+from unittest import mock
+import shutil
+import tempfile
+
+
+class ConditionalViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running ConditionalViewTest
+        Create a host with 3 rooms, a photo and a guest with a review
+        """
+        cls.host = User.objects.create_user("host", password="password")
+        cls.guest = User.objects.create_user("guest", password="password")
+
+        for i in range(3):
+            room = Room.objects.create(
+                name=f"Room {i}",
+                description="Test Description",
+                country="KR",
+                city="Seoul",
+                price=100,
+                address="Test Address",
+                guests=1,
+                beds=1,
+                bedrooms=1,
+                baths=1,
+                check_in=time(9, 30),
+                check_out=time(10, 30),
+                host=cls.host,
+            )
+
+        Photo.objects.create(caption="Photo", file="room_photos/1.webp", room=room)
+        cls.room = room
+        cls.review = Review.objects.create(
+            review="Good",
+            accuracy=5,
+            communication=5,
+            cleanliness=5,
+            location=5,
+            check_in=5,
+            value=5,
+            user=cls.guest,
+            room=room,
+        )
+
+    def setUp(self):
+        """Run every test function
+        Forget saved rooms cached by other tests
+        """
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def get_etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        return response["ETag"]
+
+    def test_room_detail_not_modified(self):
+        """RoomDetailView conditional GET test
+        Check a known ETag answers 304 in one query, without rendering
+        """
+        url = self.room.get_absolute_url()
+        response = self.client.get(url)
+
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+
+        with self.assertNumQueries(1), self.assertTemplateNotUsed(
+            "rooms/room_detail.html"
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b"", response.content)
+
+    def test_room_detail_etag_changes(self):
+        """RoomDetailView conditional GET test
+        Check the ETag changes with the room's host, photos, reviews, writers,
+        links and the counters of host and writers
+        """
+        url = self.room.get_absolute_url()
+        wifi = Amenity.objects.create(name="Wifi")
+        tv = Amenity.objects.create(name="TV")
+        etags = [self.get_etag(url)]
+
+        for change in (
+            lambda: self.room.amenities.add(wifi),
+            lambda: wifi.save(),
+            lambda: self.room.amenities.set([tv]),
+            lambda: self.host.save(),
+            lambda: Photo.objects.filter(room=self.room).delete(),
+            lambda: self.review.save(),
+            lambda: self.guest.save(),
+            lambda: self.room.save(),
+            lambda: User.objects.refresh_counts([self.host.pk]),
+            lambda: Room.objects.filter(name="Room 0").delete(),
+        ):
+            change()
+            etags.append(self.get_etag(url))
+
+        self.assertEqual(len(etags), len(set(etags)))
+
+    def test_room_detail_etag_host_avatar(self):
+        """RoomDetailView conditional GET test
+        Check the ETag changes when an avatar is imported for the host
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        url = self.room.get_absolute_url()
+        etag = self.get_etag(url)
+        avatar = BytesIO()
+        Image.new("RGB", (300, 300), "red").save(avatar, "PNG")
+        avatar_import = AvatarImport.objects.enqueue(
+            self.host, "https://avatars.test/host.png"
+        )
+
+        with override_settings(MEDIA_ROOT=media_root), mock.patch(
+            "users.oauth.OAuthClient.get_avatar", return_value=avatar.getvalue()
+        ):
+            import_avatar(avatar_import)
+
+        self.assertNotEqual(etag, self.get_etag(url))
+
+    def test_room_detail_etag_per_user(self):
+        """RoomDetailView conditional GET test
+        Check users and the saved state of the room get their own ETag
+        """
+        url = self.room.get_absolute_url()
+        anonymous = self.get_etag(url)
+
+        self.client.login(username="guest", password="password")
+        guest = self.get_etag(url)
+        self.client.post(reverse("lists:save-room", args=[self.room.pk]), follow=True)
+        saved = self.get_etag(url)
+
+        self.assertEqual(3, len({anonymous, guest, saved}))
+        self.assertTrue(List.objects.filter(user=self.guest).exists())
+
+    def test_room_detail_messages_skip_validators(self):
+        """RoomDetailView conditional GET test
+        Check a page with a queued message is rendered, the message shown
+        """
+        url = self.room.get_absolute_url()
+        self.client.login(username="guest", password="password")
+        etag = self.get_etag(url)
+        # Saved then removed, the page is the same but for the messages
+        self.client.post(reverse("lists:save-room", args=[self.room.pk]))
+        self.client.post(reverse("lists:unsave-room", args=[self.room.pk]))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn("ETag", response)
+        self.assertContains(response, f"Removed {self.room.name}")
+        self.assertEqual(304, self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code)
+
+    def test_home_not_modified(self):
+        """HomeView conditional GET test
+        Check a known ETag answers 304 until a room of the page changes
+        """
+        url = reverse("core:home")
+        etag = self.get_etag(url)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+
+        self.review.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+
+        # Invalid pages still go home
+        response = self.client.get(url, {"page": 9}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(302, response.status_code)
@@ -0,0 +1,215 @@
+from django.test import TestCase
+from django.core.management import call_command
+from rooms.models import Room, RoomType, Amenity, Facility
+from users.models import User
+from datetime import time
+from io import StringIO
+import json
+import os
+import shutil
+import tempfile
+
+CSV_HEADER = (
+    "external_id,name,description,country,city,price,address,guests,beds,"
+    "bedrooms,baths,check_in,check_out,instant_book,room_type,amenities,photos\n"
+)
+
+
+def make_record(external_id, **fields):
+    record = {
+        "external_id": external_id,
+        "name": f"Room {external_id}",
+        "description": "Test Description",
+        "country": "KR",
+        "city": "seoul",
+        "price": 100,
+        "address": "Test Address",
+        "guests": 2,
+        "beds": 1,
+        "bedrooms": 1,
+        "baths": 1,
+        "check_in": "15:00",
+        "check_out": "11:00",
+        "instant_book": True,
+        "room_type": "Entire place",
+        "amenities": ["Wifi"],
+        "photos": [{"file": "room_photos/1.webp", "caption": "Front"}],
+    }
+    record.update(fields)
+    return record
+
+
+class ImportRoomsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running ImportRoomsTest
+        Create a host, a room type, two amenities and a facility
+        """
+        User.objects.create_user("host", email="host@test.com")
+        RoomType.objects.create(name="Entire place")
+        Amenity.objects.create(name="Wifi")
+        Amenity.objects.create(name="TV")
+        Facility.objects.create(name="Gym")
+
+    def setUp(self):
+        """Run every test function
+        Make a temporary directory for import files
+        """
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+        return path
+
+    def import_rooms(self, path, *args):
+        out = StringIO()
+        call_command("import_rooms", path, "--host=host@test.com", *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_rooms_jsonl(self):
+        """import_rooms command test
+        Check rooms are created with their names resolved, bad lines skipped
+        """
+        records = [make_record(f"P{i}") for i in range(5)]
+        records[1]["amenities"] = ["Wifi", "TV"]
+        records[2]["price"] = "free"
+        records[3]["amenities"] = ["Pool"]
+        lines = [json.dumps(record) for record in records] + ["{broken", "", "[]"]
+        path = self.write("rooms.jsonl", "\n".join(lines) + "\n")
+
+        with self.assertNumQueries(25):
+            out = self.import_rooms(path, "--batch-size=2")
+
+        self.assertIn("3 created, 0 updated, 0 unchanged, 4 skipped", out)
+        self.assertIn("line 3: price:", out)
+        self.assertIn("line 4: amenities: Unknown Pool", out)
+        self.assertIn("line 6: Invalid JSON", out)
+        self.assertIn("line 8: Record is not a JSON object", out)
+
+        room = Room.objects.get(external_id="P1")
+        self.assertEqual("Seoul", room.city)
+        self.assertEqual(time(15, 0), room.check_in)
+        self.assertEqual("Entire place", room.room_type.name)
+        self.assertEqual(
+            ["TV", "Wifi"], sorted(room.amenities.values_list("name", flat=True))
+        )
+        self.assertEqual(["Front"], [photo.caption for photo in room.photos.all()])
+        self.assertEqual(3, User.objects.get(username="host").room_count)
+
+    def test_import_rooms_upsert(self):
+        """import_rooms command test
+        Check known external ids update their room, unchanged ones are left
+        """
+        path = self.write(
+            "rooms.jsonl",
+            "\n".join(json.dumps(make_record(f"P{i}")) for i in range(3)),
+        )
+        self.import_rooms(path)
+        pks = list(Room.objects.order_by("pk").values_list("pk", flat=True))
+        updated = dict(Room.objects.values_list("external_id", "updated_at"))
+
+        records = [
+            make_record("P0", price=200),
+            make_record("P1", amenities=["TV"], photos=["room_photos/2.webp"]),
+            make_record("P2"),
+        ]
+        # Records without a list leave the room's one alone
+        del records[2]["amenities"]
+        path = self.write(
+            "rooms.jsonl", "\n".join(json.dumps(record) for record in records)
+        )
+        out = self.import_rooms(path)
+
+        self.assertIn("0 created, 2 updated, 1 unchanged, 0 skipped", out)
+        self.assertEqual(
+            pks, list(Room.objects.order_by("pk").values_list("pk", flat=True))
+        )
+        self.assertEqual(200, Room.objects.get(external_id="P0").price)
+
+        # Changed fields, links and photos all move updated_at
+        for external_id, updated_at in Room.objects.values_list(
+            "external_id", "updated_at"
+        ):
+            changed = external_id != "P2"
+            self.assertEqual(changed, updated_at > updated[external_id])
+
+        room = Room.objects.get(external_id="P1")
+        self.assertEqual(["TV"], [amenity.name for amenity in room.amenities.all()])
+        self.assertEqual(
+            ["room_photos/2.webp"], [photo.file.name for photo in room.photos.all()]
+        )
+        self.assertEqual(
+            ["Wifi"],
+            [
+                amenity.name
+                for amenity in Room.objects.get(external_id="P2").amenities.all()
+            ],
+        )
+
+    def test_import_rooms_partial_record(self):
+        """import_rooms command test
+        Check a record with only some fields leaves the others of the room alone
+        """
+        path = self.write("rooms.jsonl", json.dumps(make_record("P0", name="Kept")))
+        self.import_rooms(path)
+
+        path = self.write(
+            "rooms.jsonl", json.dumps({"external_id": "P0", "price": 300})
+        )
+        out = self.import_rooms(path)
+        path = self.write("rooms.csv", "external_id,guests\nP0,4\n")
+        out += self.import_rooms(path)
+
+        self.assertEqual(2, out.count("0 created, 1 updated, 0 unchanged, 0 skipped"))
+        room = Room.objects.get(external_id="P0")
+        self.assertEqual((300, 4, "Kept"), (room.price, room.guests, room.name))
+        self.assertEqual("Entire place", room.room_type.name)
+        self.assertTrue(room.instant_book)
+        self.assertEqual(["Wifi"], [amenity.name for amenity in room.amenities.all()])
+        self.assertEqual(["Front"], [photo.caption for photo in room.photos.all()])
+
+    def test_import_rooms_csv(self):
+        """import_rooms command test
+        Check CSV cells with lists, quoted new lines and spreadsheet booleans
+        """
+        path = self.write(
+            "rooms.csv",
+            "﻿"
+            + CSV_HEADER
+            + 'C1,Room,"Two\nlines",KR,busan,80,Address,2,1,1,1,14:00,10:00,'
+            "FALSE,Entire place,Wifi|TV,room_photos/1.webp|room_photos/2.webp\n"
+            "C2,Room,Description,KR,busan,80,Address,2,1,1,1,14:00,10:00,"
+            "yes,,,\n",
+        )
+        out = self.import_rooms(path)
+
+        self.assertIn("2 created, 0 updated, 0 unchanged, 0 skipped", out)
+
+        room = Room.objects.get(external_id="C1")
+        self.assertEqual("Two\nlines", room.description)
+        self.assertFalse(room.instant_book)
+        self.assertEqual(2, room.amenities.count())
+        self.assertEqual(
+            ["Room", "Room"], [photo.caption for photo in room.photos.all()]
+        )
+
+        room = Room.objects.get(external_id="C2")
+        self.assertTrue(room.instant_book)
+        self.assertIsNone(room.room_type)
+        self.assertFalse(room.photos.exists())
+
+    def test_import_rooms_unknown_host(self):
+        """import_rooms command test
+        Check nothing is imported for an unknown default host
+        """
+        path = self.write("rooms.jsonl", json.dumps(make_record("P0")))
+        out = StringIO()
+        call_command("import_rooms", path, "--host=nobody@test.com", stdout=out)
+
+        self.assertIn("■ Unknown host nobody@test.com", out.getvalue())
+        self.assertFalse(Room.objects.exists())
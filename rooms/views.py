@@ -2,13 +2,26 @@ from django.views.generic import ListView, DetailView, UpdateView, View
 from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.vary import vary_on_cookie
+from core.conditional import conditional
+from rooms.conditional import home_validators, room_detail_validators
 from rooms.models import Room
 from rooms.forms import SearchForm
 
+# Browsers keep pages of one user but check them on every visit, so
+# unchanged ones come back as 304 without rendering
+private_page = [vary_on_cookie, cache_control(private=True, no_cache=True)]
 
+
+@method_decorator(
+    private_page + [conditional(lambda request: home_validators(request, HomeView))],
+    name="dispatch",
+)
 class HomeView(ListView):
     """rooms application HomeView class
-    Display list of room query set
+    Display list of room query set, 304 when unchanged
 
     Inherit             : ListView
     Model               : Room
@@ -33,9 +46,10 @@ class HomeView(ListView):
             return redirect(reverse("core:home"))
 
 
+@method_decorator(private_page + [conditional(room_detail_validators)], name="dispatch")
 class RoomDetailView(DetailView):
     """rooms application RoomDetailView Class
-    Display detail of room object
+    Display detail of room object, 304 when unchanged
 
     Inherit             : DetailView
     Model               : Room
@@ -60,57 +74,7 @@ class SearchView(View):
             form = SearchForm(request.GET)
 
             if form.is_valid():
-                city = form.cleaned_data.get("city")
-                country = form.cleaned_data.get("country")
-                room_type = form.cleaned_data.get("room_type")
-                price = form.cleaned_data.get("price")
-                guests = form.cleaned_data.get("guests")
-                bedrooms = form.cleaned_data.get("bedrooms")
-                beds = form.cleaned_data.get("beds")
-                baths = form.cleaned_data.get("baths")
-                instant_book = form.cleaned_data.get("instant_book")
-                is_superhost = form.cleaned_data.get("is_superhost")
-                amenities = form.cleaned_data.get("amenities")
-                facilities = form.cleaned_data.get("facilities")
-
-                filter_args = {}
-
-                if city != "Anywhere":
-                    filter_args["city__startswith"] = city
-
-                filter_args["country"] = country
-
-                if room_type is not None:
-                    filter_args["room_type"] = room_type
-
-                if price is not None:
-                    filter_args["price__lte"] = price
-
-                if guests is not None:
-                    filter_args["guests__gte"] = guests
-
-                if bedrooms is not None:
-                    filter_args["bedrooms__gte"] = bedrooms
-
-                if beds is not None:
-                    filter_args["beds__gte"] = beds
-
-                if baths is not None:
-                    filter_args["baths__gte"] = baths
-
-                if instant_book is True:
-                    filter_args["instant_book"] = True
-
-                if is_superhost is True:
-                    filter_args["host__is_superhost"] = True
-
-                for amenity in amenities:
-                    filter_args["amenities"] = amenity
-
-                for facility in facilities:
-                    filter_args["facilities"] = facility
-
-                rooms = Room.objects.filter(**filter_args)
+                rooms = form.search()
 
                 return render(
                     request, "rooms/search.html", {"form": form, "rooms": rooms}
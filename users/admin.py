@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from users.models import User
+from django.utils import timezone
+from users.models import AvatarImport, LoginLockout, User
+from users.throttle import get_login_buckets
 
 
 @admin.register(User)
@@ -20,6 +22,7 @@ class UserAdmin(BaseUserAdmin):
             {
                 "fields": (
                     "avatar",
+                    "avatar_thumbnail",
                     "gender",
                     "bio",
                     "birth_date",
@@ -48,3 +51,71 @@ class UserAdmin(BaseUserAdmin):
         "is_superuser",
         "login_method",
     )
+
+
+@admin.register(AvatarImport)
+class AvatarImportAdmin(admin.ModelAdmin):
+    """Register AvatarImport model at admin panel
+
+    Filter by:
+        status : CharField
+
+    Admin action:
+        retry : queue selected imports again for immediate download
+    """
+
+    list_display = ("user", "url", "status", "attempts", "run_after")
+    list_filter = ("status",)
+    search_fields = ("user__email", "url")
+    raw_id_fields = ("user",)
+    actions = ("retry",)
+
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=AvatarImport.STATUS_DONE).update(
+            status=AvatarImport.STATUS_PENDING, run_after=timezone.now()
+        )
+        self.message_user(request, f"{updated} avatar imports queued again")
+
+    retry.short_description = "Retry selected avatar imports"
+
+
+@admin.register(LoginLockout)
+class LoginLockoutAdmin(admin.ModelAdmin):
+    """Register LoginLockout model at admin panel
+
+    Filter by:
+        scope : CharField
+
+    Admin action:
+        unlock : refill login token buckets of selected IPs / accounts
+    """
+
+    list_display = (
+        "scope",
+        "value",
+        "lockouts",
+        "locked_until",
+        "is_locked",
+        "attempts_left",
+        "updated_at",
+    )
+    list_filter = ("scope",)
+    search_fields = ("value",)
+    ordering = ("-updated_at",)
+    actions = ("unlock",)
+
+    def attempts_left(self, obj):
+        bucket = get_login_buckets().get(obj.scope)
+        return bucket.peek(obj.value) if bucket else None
+
+    def unlock(self, request, queryset):
+        buckets = get_login_buckets()
+
+        for lockout in queryset:
+            if lockout.scope in buckets:
+                buckets[lockout.scope].reset(lockout.value)
+
+        updated = queryset.update(locked_until=timezone.now())
+        self.message_user(request, f"{updated} logins unlocked")
+
+    unlock.short_description = "Unlock selected logins"
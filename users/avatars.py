@@ -0,0 +1,43 @@
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+from users.oauth import OAuthClient
+
+
+def make_thumbnail(data, size=None):
+    """Return a square WebP thumbnail of image bytes, cropped at the center"""
+    size = size or settings.AVATAR_THUMBNAIL_SIZE
+    image = Image.open(BytesIO(data))
+
+    # Lets JPEG decode at a reduced scale instead of full resolution
+    image.draft("RGB", (size, size))
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+
+    output = BytesIO()
+    image.save(output, "WEBP", quality=settings.AVATAR_THUMBNAIL_QUALITY)
+    return ContentFile(output.getvalue())
+
+
+def import_avatar(avatar_import):
+    """Download avatar of an AvatarImport and store its thumbnail on the user
+
+    The stored file is deleted again when the user can't be saved, and the
+    previous thumbnail once it is replaced. updated_at is saved too, so
+    conditional responses showing the avatar change their ETag.
+    """
+    user = avatar_import.user
+    previous = user.avatar_thumbnail.name
+    thumbnail = make_thumbnail(OAuthClient().get_avatar(avatar_import.url))
+    user.avatar_thumbnail.save(f"pk-{user.pk}-avatar.webp", thumbnail, save=False)
+
+    try:
+        user.save(update_fields=["avatar_thumbnail", "updated_at"])
+    except Exception:
+        user.avatar_thumbnail.delete(save=False)
+        raise
+
+    if previous and previous != user.avatar_thumbnail.name:
+        user.avatar_thumbnail.storage.delete(previous)
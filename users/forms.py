@@ -1,6 +1,8 @@
 from django import forms
-from django.contrib.auth import password_validation
+from django.contrib.auth import authenticate, password_validation
 from users.models import User
+from users.throttle import throttle_login
+import math
 
 
 class LoginForm(forms.Form):
@@ -14,8 +16,8 @@ class LoginForm(forms.Form):
         password : CharField
 
     Method:
-        clean_email    : return any users you use for email
-        clean_password : pass
+        clean    : throttle, then authenticate user once, keep it for get_user
+        get_user : return user authenticated by clean
     """
 
     email = forms.EmailField(
@@ -29,21 +31,43 @@ class LoginForm(forms.Form):
         )
     )
 
+    def __init__(self, *args, request=None, **kwargs):
+        self.request = request
+        self.user_cache = None
+        self.retry_after = 0
+        super().__init__(*args, **kwargs)
+
     def clean(self):
         email = self.cleaned_data.get("email")
         password = self.cleaned_data.get("password")
 
-        try:
-            user = User.objects.get(username=email)
+        if email is None or password is None:
+            return self.cleaned_data
 
-            if user.check_password(password):
-                return self.cleaned_data
+        # Rejected before hashing, so flooding the form costs no PBKDF2 rounds
+        if self.request is not None:
+            self.retry_after = throttle_login(self.request, email)
 
-            else:
-                self.add_error("password", forms.ValidationError("Password is wrong"))
-        except User.DoesNotExist:
+        if self.retry_after:
+            raise forms.ValidationError(
+                "Too many login attempts, try again in "
+                f"{math.ceil(self.retry_after)} seconds"
+            )
+
+        # The only password hash of the login flow, the view reuses user_cache
+        self.user_cache = authenticate(self.request, username=email, password=password)
+
+        if self.user_cache is not None:
+            return self.cleaned_data
+
+        if User.objects.filter(username=email).exists():
+            self.add_error("password", forms.ValidationError("Password is wrong"))
+        else:
             self.add_error("email", forms.ValidationError("User does not exist"))
 
+    def get_user(self):
+        return self.user_cache
+
 
 class SignUpForm(forms.ModelForm):
     """Users application signup form
@@ -62,7 +86,7 @@ class SignUpForm(forms.ModelForm):
     Method:
         clean_email          : Check user exist witj email field data
         clean_password_check : Check password is equal to password_check
-        save                 : Create user object from cleaned_data
+        save                 : Create user object from cleaned_data and return it
     """
 
     class Meta:
@@ -141,7 +165,7 @@ class SignUpForm(forms.ModelForm):
         except forms.ValidationError as error:
             self.add_error("password", error)
 
-    def save(self, *args, **kwargs):
+    def save(self, commit=True):
         user = super().save(commit=False)
 
         email = self.cleaned_data.get("email")
@@ -149,4 +173,8 @@ class SignUpForm(forms.ModelForm):
 
         user.username = email
         user.set_password(password)
-        user.save()
+
+        if commit:
+            user.save()
+
+        return user
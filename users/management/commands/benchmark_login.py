@@ -0,0 +1,66 @@
+import time
+from django.contrib.auth import authenticate
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from core.management.commands.custom_command import CustomCommand
+from users.forms import LoginForm
+from users.models import User
+
+
+class Command(CustomCommand):
+    help = "Benchmark CPU cost of the login form (one hash vs check + authenticate)"
+
+    EMAIL = "benchmark-login@airbnb.clone"
+    PASSWORD = "benchmark-password"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", default=20, help="Number of logins to run")
+
+    def handle(self, *args, **options):
+        number = int(options.get("number"))
+
+        self.stdout.write(self.style.SUCCESS("■ START BENCHMARK LOGIN"))
+
+        # Measures hashing only, login throttling would reject most attempts
+        with transaction.atomic(), override_settings(LOGIN_THROTTLE_RATES={}):
+            User.objects.create_user(
+                username=self.EMAIL, email=self.EMAIL, password=self.PASSWORD
+            )
+            request = RequestFactory().post("/users/login")
+
+            double = self.measure(number, lambda: self.double_hash_login(request))
+            single = self.measure(number, lambda: self.form_login(request))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"■ CHECK + AUTHENTICATE : {double / number * 1000:.1f} ms CPU / login "
+            f"({number / double:.1f} logins/s)\n"
+            f"■ LOGIN FORM           : {single / number * 1000:.1f} ms CPU / login "
+            f"({number / single:.1f} logins/s)\n"
+            f"■ CPU RATIO            : {single / double:.2f}"
+        )
+        self.stdout.write(self.style.SUCCESS("■ SUCCESS BENCHMARK LOGIN!"))
+
+    def measure(self, number, login):
+        started = time.process_time()
+
+        for _ in range(number):
+            assert login() is not None
+
+        return time.process_time() - started
+
+    def double_hash_login(self, request):
+        """Previous login flow: form check_password, then view authenticate"""
+        user = User.objects.get(username=self.EMAIL)
+        user.check_password(self.PASSWORD)
+
+        return authenticate(request, username=self.EMAIL, password=self.PASSWORD)
+
+    def form_login(self, request):
+        form = LoginForm(
+            {"email": self.EMAIL, "password": self.PASSWORD}, request=request
+        )
+        form.is_valid()
+
+        return form.get_user()
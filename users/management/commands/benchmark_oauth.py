@@ -0,0 +1,111 @@
+import json
+import statistics
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.management.commands.custom_command import CustomCommand
+from users.oauth import GithubProvider, build_session
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Answer token and profile calls like a provider after a fixed latency"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.answer({"access_token": "benchmark"})
+
+    def do_GET(self):
+        self.answer({"login": "benchmark", "email": "benchmark@airbnb.clone"})
+
+    def answer(self, data):
+        time.sleep(self.latency)
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(CustomCommand):
+    help = "Benchmark concurrent OAuth callbacks against a local stub provider"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", default=200, help="Number of logins to run")
+        parser.add_argument(
+            "--concurrency", default=20, help="Number of callbacks run at once"
+        )
+        parser.add_argument(
+            "--latency", default=20, help="Stub provider latency in milliseconds"
+        )
+
+    def handle(self, *args, **options):
+        number = int(options.get("number"))
+        concurrency = int(options.get("concurrency"))
+        StubProviderHandler.latency = int(options.get("latency")) / 1000
+
+        self.stdout.write(self.style.SUCCESS("■ START BENCHMARK OAUTH"))
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubProviderHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        stub_provider = type(
+            "StubProvider",
+            (GithubProvider,),
+            {"token_url": f"{url}/token", "profile_url": f"{url}/user"},
+        )
+
+        try:
+            # Module level requests functions open a new connection per call
+            fresh = self.measure(
+                stub_provider("stub", session=requests), number, concurrency
+            )
+            pooled = self.measure(
+                stub_provider("stub", session=build_session(concurrency)),
+                number,
+                concurrency,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        for title, (elapsed, latencies) in (
+            ("NEW CONNECTIONS", fresh),
+            ("POOLED SESSION ", pooled),
+        ):
+            self.stdout.write(
+                f"■ {title} : {number / elapsed:.1f} logins/s, "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {self.percentile(latencies, 95) * 1000:.1f} ms"
+            )
+
+        self.stdout.write(self.style.SUCCESS("■ SUCCESS BENCHMARK OAUTH!"))
+
+    def measure(self, provider, number, concurrency):
+        def callback(_):
+            started = time.perf_counter()
+            access_token = provider.get_access_token("benchmark", "http://testserver")
+            provider.map_profile(provider.get_profile(access_token))
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            latencies = list(executor.map(callback, range(number)))
+
+        return time.perf_counter() - started, latencies
+
+    def percentile(self, values, percent):
+        values = sorted(values)
+        return values[min(len(values) - 1, len(values) * percent // 100)]
@@ -0,0 +1,116 @@
+import time
+from datetime import timedelta
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+from core.management.commands.custom_command import CustomCommand
+from users.avatars import import_avatar
+from users.models import AvatarImport
+
+
+class Command(CustomCommand):
+    help = "Download queued social login avatars and store WebP thumbnails"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", default=20, help="Number of avatars claimed per batch"
+        )
+        parser.add_argument(
+            "--max-attempts", default=3, help="Attempts before an import is failed"
+        )
+        parser.add_argument(
+            "--backoff",
+            default=60,
+            help="Seconds before the first retry, doubled on every attempt",
+        )
+        parser.add_argument(
+            "--lease",
+            default=300,
+            help="Seconds claimed imports are held before another worker retries",
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling the queue forever"
+        )
+        parser.add_argument(
+            "--interval", default=5, help="Seconds between polls with --loop"
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = int(options.get("batch_size"))
+        self.max_attempts = int(options.get("max_attempts"))
+        self.backoff = int(options.get("backoff"))
+        self.lease = int(options.get("lease"))
+        interval = int(options.get("interval"))
+
+        while True:
+            done, failed = self.import_all()
+
+            if done or failed or options.get("verbosity") > 1:
+                self.stdout.write(
+                    self.style.SUCCESS(f"■ IMPORTED {done} AVATARS, {failed} FAILED")
+                )
+
+            if not options.get("loop"):
+                break
+
+            time.sleep(interval)
+
+    def import_all(self):
+        done = failed = 0
+
+        while True:
+            batch_done, batch_failed, claimed = self.import_batch()
+            done += batch_done
+            failed += batch_failed
+
+            if claimed < self.batch_size:
+                return done, failed
+
+    def claim(self):
+        """Lease a batch of due imports to this worker and commit at once
+
+        Downloads happen outside of the transaction, so row locks are held
+        only while claiming. Imports of a worker dying mid batch are due
+        again once the lease ends.
+        """
+        with transaction.atomic():
+            queryset = AvatarImport.objects.due().select_related("user")
+
+            # Lets several workers drain the queue without importing twice
+            if db_connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True, of=("self",))
+
+            avatar_imports = list(queryset[: self.batch_size])
+            AvatarImport.objects.filter(
+                pk__in=[avatar_import.pk for avatar_import in avatar_imports]
+            ).update(run_after=timezone.now() + timedelta(seconds=self.lease))
+
+        return avatar_imports
+
+    def import_batch(self):
+        avatar_imports = self.claim()
+        done = failed = 0
+
+        for avatar_import in avatar_imports:
+            avatar_import.attempts += 1
+
+            try:
+                import_avatar(avatar_import)
+                avatar_import.status = AvatarImport.STATUS_DONE
+                avatar_import.last_error = ""
+                done += 1
+            except Exception as e:
+                avatar_import.last_error = f"{e.__class__.__name__}: {e}"
+
+                if avatar_import.attempts >= self.max_attempts:
+                    avatar_import.status = AvatarImport.STATUS_FAILED
+                    failed += 1
+                else:
+                    delay = self.backoff * 2 ** (avatar_import.attempts - 1)
+                    avatar_import.run_after = timezone.now() + timedelta(seconds=delay)
+
+            # Recorded one by one, a later failure keeps earlier results
+            avatar_import.save(
+                update_fields=["status", "attempts", "run_after", "last_error"]
+            )
+
+        return done, failed, len(avatar_imports)
@@ -0,0 +1,19 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Clear email secrets of expired verification links in bulk"
+
+    def handle(self, *args, **options):
+        expired = timezone.now() - timedelta(
+            seconds=settings.EMAIL_VERIFICATION_MAX_AGE
+        )
+        purged = User.objects.filter(email_secret_created__lt=expired).update(
+            email_secret="", email_secret_created=None
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"■ PURGED {purged} EMAIL SECRETS"))
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.13 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_user_login_method"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="email_secret_created",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.13 on 2026-10-19 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_avatar_import"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoginLockout",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[("ip", "IP"), ("account", "Account")], max_length=10
+                    ),
+                ),
+                ("value", models.CharField(max_length=254)),
+                ("lockouts", models.PositiveIntegerField(default=0)),
+                ("locked_until", models.DateTimeField()),
+            ],
+            options={
+                "unique_together": {("scope", "value")},
+            },
+        ),
+    ]
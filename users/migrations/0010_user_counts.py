@@ -0,0 +1,56 @@
+# Generated by Django 2.2.13 on 2026-10-19 02:42
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import users.models
+
+
+def fill_counts(apps, schema_editor):
+    """Set room_count / review_count of existing users in one UPDATE"""
+    User = apps.get_model("users", "User")
+    Room = apps.get_model("rooms", "Room")
+    Review = apps.get_model("reviews", "Review")
+
+    def count(model, field):
+        rows = (
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+    User.objects.update(
+        room_count=count(Room, "host"), review_count=count(Review, "user")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0009_login_lockout"),
+        ("rooms", "0003_auto_20191222_2155"),
+        ("reviews", "0003_review_user"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", users.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="room_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,48 @@
-from django.contrib.auth.models import AbstractUser
+from django.apps import apps
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
-from django.core.mail import send_mail
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.urls import reverse
 from django.utils.html import strip_tags
 from django.template.loader import render_to_string
+from django.utils import timezone
+from datetime import timedelta
+from core.models import AbstractTimeStamp, OutgoingEmail
+from users.tokens import make_verification_token
 import uuid
 
 
+def count_subquery(model, field):
+    """Return COUNT of model rows whose field points to the outer user"""
+    rows = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+class UserManager(BaseUserManager):
+    def refresh_counts(self, user_pks=None):
+        """Recount denormalized room_count / review_count in one UPDATE
+
+        updated_at is bumped too, as pages showing the users use it as validator.
+        """
+        Room = apps.get_model("rooms", "Room")
+        Review = apps.get_model("reviews", "Review")
+        queryset = self.all() if user_pks is None else self.filter(pk__in=user_pks)
+
+        return queryset.update(
+            room_count=count_subquery(Room, "host"),
+            review_count=count_subquery(Review, "user"),
+            updated_at=timezone.now(),
+        )
+
+
 class User(AbstractUser):
     """Custom User Model
 
@@ -16,17 +51,24 @@ class User(AbstractUser):
 
     Fields:
         avatar         : ImageField
+        avatar_thumbnail : ImageField (square WebP, made by import_avatars)
         gender         : CharField
         bio            : TextField
         birth_date     : DateField
         language       : CharField
         currency       : CharField
         is_superhost   : BooleanField
-        email_verified : BooleanField
-        email_secret   : CharField
+        email_verified       : BooleanField
+        email_secret         : CharField
+        email_secret_created : DateTimeField
+        room_count           : PositiveIntegerField (rooms hosted, kept by signals)
+        review_count         : PositiveIntegerField (reviews written, kept by signals)
+        updated_at           : DateTimeField (validators of pages showing the user)
 
     Methods:
-        verify_email : Send an email for verify user
+        generate_email_secret      : Set a new email_secret without saving
+        enqueue_verification_email : Queue an email with the current email_secret
+        verify_email               : Queue an email for verify user
     """
 
     GENDER_MALE = "male"
@@ -60,6 +102,7 @@ class User(AbstractUser):
     )
 
     avatar = models.ImageField(upload_to="avatars", blank=True)
+    avatar_thumbnail = models.ImageField(upload_to="avatars/thumbnails", blank=True)
     gender = models.CharField(choices=GENDER_CHOICES, max_length=10, blank=True)
     bio = models.TextField(blank=True)
     birth_date = models.DateField(null=True, blank=True)
@@ -72,28 +115,159 @@ class User(AbstractUser):
     is_superhost = models.BooleanField(default=False)
     email_verified = models.BooleanField(default=False)
     email_secret = models.CharField(max_length=20, default="", blank=True)
+    email_secret_created = models.DateTimeField(null=True, blank=True, db_index=True)
     login_method = models.CharField(
         max_length=50, choices=LOGIN_CHOICES, default=LOGIN_EMAIL
     )
+    room_count = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserManager()
 
     def get_absolute_url(self):
         return reverse("users:profile", kwargs={"pk": self.pk})
 
+    def generate_email_secret(self):
+        self.email_secret = uuid.uuid4().hex[:20]
+        self.email_secret_created = timezone.now()
+        return self.email_secret
+
+    def enqueue_verification_email(self):
+        """Store the email in the outbox, send_queued_emails delivers it"""
+        html_message = render_to_string(
+            "emails/verify_email.html", {"token": make_verification_token(self)}
+        )
+        return OutgoingEmail.objects.enqueue(
+            "Verify Airbnb Account",
+            strip_tags(html_message),
+            settings.EMAIL_FROM,
+            [self.email],
+            html_body=html_message,
+        )
+
     def verify_email(self):
         if not self.email_verified:
-            secret = uuid.uuid4().hex[:20]
-            self.email_secret = secret
-            html_message = render_to_string(
-                "emails/verify_email.html", {"secret": secret}
-            )
-            send_mail(
-                "Verify Airbnb Account",
-                strip_tags(html_message),
-                settings.EMAIL_FROM,
-                [self.email],
-                fail_silently=False,
-                html_message=html_message,
-            )
+            self.generate_email_secret()
             self.save()
+            self.enqueue_verification_email()
             return True
         return False
+
+
+class AvatarImportManager(models.Manager):
+    def enqueue(self, user, url):
+        """Store an avatar url to be imported by the import_avatars command"""
+        return self.create(user=user, url=url)
+
+    def due(self):
+        return self.filter(
+            status=AvatarImport.STATUS_PENDING, run_after__lte=timezone.now()
+        ).order_by("run_after", "pk")
+
+
+class AvatarImport(AbstractTimeStamp):
+    """AvatarImport Model
+    Avatar of a social login user, fetched later by import_avatars
+
+    Inherit:
+        AbstractTimeStamp
+
+    Fields:
+        user       : ForeignKey => User
+        url        : URLField
+        status     : CharField
+        attempts   : PositiveIntegerField
+        run_after  : DateTimeField (next attempt time)
+        last_error : TextField
+        created_at : DateTimeField
+        updated_at : DateTimeField
+
+    Method:
+        __str__ : return user - url
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    user = models.ForeignKey(
+        User, related_name="avatar_imports", on_delete=models.CASCADE
+    )
+    url = models.URLField(max_length=1000)
+    status = models.CharField(
+        max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    objects = AvatarImportManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.user} - {self.url}"
+
+
+class LoginLockoutManager(models.Manager):
+    def record(self, scope, value, seconds):
+        """Count a lockout of an IP / account, locked for seconds from now"""
+        locked_until = timezone.now() + timedelta(seconds=seconds)
+        updated = self.filter(scope=scope, value=value).update(
+            lockouts=F("lockouts") + 1, locked_until=locked_until
+        )
+
+        if not updated:
+            self.create(scope=scope, value=value, lockouts=1, locked_until=locked_until)
+
+
+class LoginLockout(AbstractTimeStamp):
+    """LoginLockout Model
+    IP or account whose login token bucket ran empty
+
+    Inherit:
+        AbstractTimeStamp
+
+    Fields:
+        scope        : CharField (ip / account)
+        value        : CharField (IP address / email)
+        lockouts     : PositiveIntegerField
+        locked_until : DateTimeField
+        created_at   : DateTimeField
+        updated_at   : DateTimeField
+
+    Method:
+        __str__   : return scope - value
+        is_locked : return True until locked_until
+    """
+
+    SCOPE_IP = "ip"
+    SCOPE_ACCOUNT = "account"
+
+    SCOPE_CHOICES = ((SCOPE_IP, "IP"), (SCOPE_ACCOUNT, "Account"))
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    value = models.CharField(max_length=254)
+    lockouts = models.PositiveIntegerField(default=0)
+    locked_until = models.DateTimeField()
+
+    objects = LoginLockoutManager()
+
+    class Meta:
+        unique_together = ("scope", "value")
+
+    def __str__(self):
+        return f"{self.scope} - {self.value}"
+
+    def is_locked(self):
+        return self.locked_until > timezone.now()
+
+    is_locked.boolean = True
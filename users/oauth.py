@@ -0,0 +1,278 @@
+import logging
+import threading
+import time
+import requests
+from contextlib import contextmanager
+from functools import lru_cache
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class OAuthError(Exception):
+    pass
+
+
+def build_session(pool_size):
+    """Return requests Session keeping pool_size connections alive per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every provider of the process so TLS connections to the
+# provider APIs are reused across logins instead of opened per request
+http = build_session(settings.OAUTH_POOL_SIZE)
+
+
+class LatencyStats:
+    """Thread safe count / avg / max seconds of calls, grouped by call name"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def record(self, call, seconds):
+        with self.lock:
+            count, total, slowest = self.calls.get(call, (0, 0.0, 0.0))
+            self.calls[call] = (count + 1, total + seconds, max(slowest, seconds))
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                call: {"count": count, "avg": total / count, "max": slowest}
+                for call, (count, total, slowest) in self.calls.items()
+            }
+
+
+class OAuthClient:
+    """HTTP client of an OAuth provider
+
+    Every call goes through the shared pooled session with OAUTH_TIMEOUT
+    and raises OAuthError on network errors and error status codes.
+
+    Method:
+        request      : send request, OAuthError on network or HTTP error
+        request_json : send request and return its JSON body
+        get_avatar   : return avatar image bytes up to a size cap
+    """
+
+    def __init__(self, session=None, timeout=None):
+        self.session = session or http
+        self.timeout = timeout or settings.OAUTH_TIMEOUT
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        host = url.split("/")[2]
+
+        try:
+            response = getattr(self.session, method)(url, **kwargs)
+        except requests.RequestException as e:
+            raise OAuthError(f"Can't reach {host}") from e
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            response.close()
+            raise OAuthError(f"Error from {host} ({response.status_code})") from e
+
+        return response
+
+    def request_json(self, method, url, **kwargs):
+        response = self.request(method, url, **kwargs)
+
+        try:
+            return response.json()
+        except ValueError as e:
+            raise OAuthError("Invalid response from provider") from e
+
+    def get_avatar(self, url, max_size=None):
+        """Stream avatar image, give up once it is larger than max_size bytes"""
+        max_size = max_size or settings.AVATAR_MAX_DOWNLOAD_SIZE
+        response = self.request("get", url, stream=True)
+
+        with response:
+            if response.status_code != 200:
+                raise OAuthError(f"Can't get avatar ({response.status_code})")
+
+            if int(response.headers.get("Content-Length") or 0) > max_size:
+                raise OAuthError("Avatar is too large")
+
+            content = bytearray()
+
+            try:
+                for chunk in response.iter_content(64 * 1024):
+                    content += chunk
+
+                    if len(content) > max_size:
+                        raise OAuthError("Avatar is too large")
+            except requests.RequestException as e:
+                raise OAuthError("Can't get avatar") from e
+
+        return bytes(content)
+
+
+class OAuthProvider(OAuthClient):
+    """Authorization code flow of an OAuth provider
+
+    Subclasses only declare endpoints and map_profile, the oauth_login and
+    oauth_callback views drive every provider the same way.
+
+    Fields:
+        authorize_url : consent page the user is redirected to
+        token_url     : endpoint exchanging the code for an access token
+        profile_url   : endpoint returning the user's profile
+        scope         : scope asked on the consent page
+        token_type    : Authorization header scheme of profile_url
+
+    Method:
+        measure          : record latency of a provider call in stats
+        get_login_url    : return consent page url
+        get_access_token : exchange authorization code for an access token
+        get_profile      : return profile JSON for an access token
+        map_profile      : return (User fields, avatar url) of profile JSON
+    """
+
+    authorize_url = None
+    token_url = None
+    profile_url = None
+    scope = ""
+    token_type = "Bearer"
+
+    def __init__(self, name, client_id=None, client_secret=None, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.stats = LatencyStats()
+
+    @contextmanager
+    def measure(self, call):
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stats.record(call, elapsed)
+            logger.info("oauth %s %s %.1fms", self.name, call, elapsed * 1000)
+
+    def get_login_url(self, redirect_uri):
+        params = {
+            "client_id": self.client_id,
+            "redirect_uri": redirect_uri,
+            "response_type": "code",
+        }
+
+        if self.scope:
+            params["scope"] = self.scope
+
+        return f"{self.authorize_url}?{urlencode(params)}"
+
+    def get_access_token(self, code, redirect_uri):
+        data = {
+            "grant_type": "authorization_code",
+            "client_id": self.client_id,
+            "redirect_uri": redirect_uri,
+            "code": code,
+        }
+
+        if self.client_secret:
+            data["client_secret"] = self.client_secret
+
+        with self.measure("token"):
+            token_json = self.request_json(
+                "post",
+                self.token_url,
+                data=data,
+                headers={"Accept": "application/json"},
+            )
+
+        access_token = token_json.get("access_token")
+
+        if token_json.get("error") or not access_token:
+            raise OAuthError("Can't get access token")
+
+        return access_token
+
+    def get_profile(self, access_token):
+        with self.measure("profile"):
+            return self.request_json(
+                "get",
+                self.profile_url,
+                headers={
+                    "Authorization": f"{self.token_type} {access_token}",
+                    "Accept": "application/json",
+                },
+            )
+
+    def map_profile(self, profile_json):
+        raise NotImplementedError
+
+
+class GithubProvider(OAuthProvider):
+    authorize_url = "https://github.com/login/oauth/authorize"
+    token_url = "https://github.com/login/oauth/access_token"
+    profile_url = "https://api.github.com/user"
+    scope = "read:user"
+    token_type = "token"
+
+    def map_profile(self, profile_json):
+        if not profile_json.get("login"):
+            raise OAuthError("Can't get your profile")
+
+        fields = {
+            "email": profile_json.get("email"),
+            "first_name": profile_json.get("name") or "",
+            "bio": profile_json.get("bio") or "",
+        }
+        return fields, profile_json.get("avatar_url")
+
+
+class KakaoProvider(OAuthProvider):
+    authorize_url = "https://kauth.kakao.com/oauth/authorize"
+    token_url = "https://kauth.kakao.com/oauth/token"
+    profile_url = "https://kapi.kakao.com/v2/user/me"
+
+    def map_profile(self, profile_json):
+        email = (profile_json.get("kakao_account") or {}).get("email")
+
+        if not email:
+            raise OAuthError("Please also give me your email")
+
+        properties = profile_json.get("properties") or {}
+        fields = {"email": email, "first_name": properties.get("nickname") or ""}
+        return fields, properties.get("profile_image")
+
+
+@lru_cache(maxsize=None)
+def get_providers():
+    """Build every provider of OAUTH_PROVIDERS once per process"""
+    providers = {}
+
+    for name, config in settings.OAUTH_PROVIDERS.items():
+        provider_class = import_string(config["CLASS"])
+        providers[name] = provider_class(
+            name,
+            client_id=config.get("CLIENT_ID"),
+            client_secret=config.get("CLIENT_SECRET"),
+        )
+
+    return providers
+
+
+def get_provider(name):
+    return get_providers()[name]
+
+
+@receiver(setting_changed)
+def reset_providers(setting, **kwargs):
+    if setting in ("OAUTH_PROVIDERS", "OAUTH_TIMEOUT"):
+        get_providers.cache_clear()
@@ -0,0 +1,70 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from users.models import User
+
+
+def add_count(field, user_pk, delta):
+    """Move a denormalized counter of one user, never below zero
+
+    updated_at is bumped too, as pages showing the user use it as validator.
+    """
+    queryset = User.objects.filter(pk=user_pk)
+
+    if delta < 0:
+        queryset = queryset.filter(**{f"{field}__gte": -delta})
+
+    queryset.update(**{field: F(field) + delta, "updated_at": timezone.now()})
+
+
+def remember_owner(instance, attname):
+    """Keep the owner pk loaded from the database, to see it change on save
+
+    Read from __dict__, a deferred owner is not fetched.
+    """
+    instance._counted_owner = instance.__dict__.get(attname)
+
+
+def count_saved(field, instance, attname, created):
+    """Count a created row, or move it from its old owner to the new one"""
+    owner = getattr(instance, attname)
+    old_owner = getattr(instance, "_counted_owner", None)
+
+    if created:
+        add_count(field, owner, 1)
+    elif old_owner is not None and old_owner != owner:
+        add_count(field, old_owner, -1)
+        add_count(field, owner, 1)
+
+    instance._counted_owner = owner
+
+
+@receiver(post_init, sender="rooms.Room")
+def remember_room_host(sender, instance, **kwargs):
+    remember_owner(instance, "host_id")
+
+
+@receiver(post_save, sender="rooms.Room")
+def count_saved_room(sender, instance, created, **kwargs):
+    count_saved("room_count", instance, "host_id", created)
+
+
+@receiver(post_delete, sender="rooms.Room")
+def count_deleted_room(sender, instance, **kwargs):
+    add_count("room_count", instance.host_id, -1)
+
+
+@receiver(post_init, sender="reviews.Review")
+def remember_review_user(sender, instance, **kwargs):
+    remember_owner(instance, "user_id")
+
+
+@receiver(post_save, sender="reviews.Review")
+def count_saved_review(sender, instance, created, **kwargs):
+    count_saved("review_count", instance, "user_id", created)
+
+
+@receiver(post_delete, sender="reviews.Review")
+def count_deleted_review(sender, instance, **kwargs):
+    add_count("review_count", instance.user_id, -1)
@@ -1,8 +1,10 @@
 from django.test import TestCase
+from django.contrib.auth.hashers import check_password
 from users.forms import LoginForm, SignUpForm
 from users.models import User
 from django import forms
 from itertools import chain
+from unittest import mock
 
 
 class LoginFormTest(TestCase):
@@ -56,6 +58,19 @@ class LoginFormTest(TestCase):
         if form.is_valid():
             self.assertEqual(user, form.clean())
 
+    def test_login_form_get_user(self):
+        """Users application login form get_user method test
+        Check authenticated user is kept after hashing the password only once
+        """
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as mocked_check_password:
+            form = LoginForm({"email": "test@test.com", "password": "testtest"})
+            self.assertTrue(form.is_valid())
+
+        self.assertEqual(1, mocked_check_password.call_count)
+        self.assertEqual(User.objects.get(username="test@test.com"), form.get_user())
+
 
 class SignUpFormTest(TestCase):
     @classmethod
@@ -157,8 +172,29 @@ class SignUpFormTest(TestCase):
         )
 
         if form.is_valid():
-            self.assertIsNone(form.save())
-            self.assertIsNotNone(User.objects.get(username="test@test.com"))
+            user = form.save()
+            self.assertEqual(user, User.objects.get(username="test@test.com"))
+            self.assertTrue(user.check_password("pwdsuccess@"))
+
+    def test_sign_up_form_save_commit_false(self):
+        """Users appliation sign up form save method without commit test
+        Check SignUpForm's save method return unsaved user with password set
+        """
+        form = SignUpForm(
+            {
+                "first_name": "test",
+                "last_name": "test",
+                "email": "test@test.com",
+                "password": "pwdsuccess@",
+                "password_check": "pwdsuccess@",
+            }
+        )
+
+        self.assertTrue(form.is_valid())
+        user = form.save(commit=False)
+        self.assertIsNone(user.pk)
+        self.assertEqual("test@test.com", user.username)
+        self.assertFalse(User.objects.filter(username="test@test.com").exists())
 
     def test_sign_up_form_validate_password_fail(self):
         """Users appliation sign up form save method fail test
@@ -4,9 +4,22 @@ from django.utils.timezone import now
 from django.test import override_settings
 from django.conf import settings
 from django.core import mail
-from users.models import User
+from django.core.management import call_command
+from core.models import OutgoingEmail
+from django.core.cache import cache, caches
+from reviews.models import Review
+from rooms.models import Room
+from users.avatars import make_thumbnail
+from users.throttle import TokenBucket
+from users.models import AvatarImport, User
+from io import BytesIO, StringIO
+from datetime import datetime
+from PIL import Image
 from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+import shutil
 import tempfile
+import time
 
 
 class UserModelTest(TestCase):
@@ -222,6 +235,10 @@ class UserModelTest(TestCase):
         with mock.patch("uuid.uuid4") as uuid4:
             uuid4.return_value = mock.Mock(hex="a" * 20)
             self.assertTrue(User.verify_email(user))
+            self.assertEqual(len(mail.outbox), 0)
+            self.assertEqual(1, OutgoingEmail.objects.due().count())
+
+            call_command("send_queued_emails", stdout=StringIO())
             self.assertEqual(len(mail.outbox), 1)
             self.assertEqual(mail.outbox[0].subject, "Verify Airbnb Account")
             self.assertEqual(mail.outbox[0].to, [user.email])
@@ -243,3 +260,284 @@ class UserModelTest(TestCase):
         """
         user = User.objects.get(pk=1)
         self.assertEqual(user.get_absolute_url(), "/users/1")
+
+
+class FakeAvatarResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(content))}
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for idx in range(0, len(self.content), chunk_size):
+            yield self.content[idx : idx + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def make_image(width, height, format="JPEG"):
+    output = BytesIO()
+    Image.new("RGB", (width, height), "red").save(output, format)
+    return output.getvalue()
+
+
+class AvatarImportTest(TestCase):
+    def setUp(self):
+        """Run every test function
+        Store uploads in a temporary MEDIA_ROOT, removed after the test, and
+        queue an avatar import for a github user
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        user = User.objects.create_user(username="github", first_name="git")
+        self.avatar_import = AvatarImport.objects.enqueue(
+            user, "https://avatars.test/github.png"
+        )
+
+    def test_make_thumbnail(self):
+        """make_thumbnail function test
+        Check image is cropped to a square WebP of AVATAR_THUMBNAIL_SIZE
+        """
+        thumbnail = make_thumbnail(make_image(800, 400))
+        image = Image.open(thumbnail)
+
+        self.assertEqual("WEBP", image.format)
+        self.assertEqual(
+            (settings.AVATAR_THUMBNAIL_SIZE, settings.AVATAR_THUMBNAIL_SIZE),
+            image.size,
+        )
+
+    def test_import_avatars_command(self):
+        """import_avatars command test
+        Check queued avatar is downloaded and stored as user's thumbnail
+        """
+        with mock.patch(
+            "users.oauth.http.get",
+            return_value=FakeAvatarResponse(make_image(300, 300, "PNG")),
+        ) as mocked_get:
+            call_command("import_avatars", stdout=StringIO())
+
+        self.assertTrue(mocked_get.call_args[1]["stream"])
+        self.avatar_import.refresh_from_db()
+        self.assertEqual(AvatarImport.STATUS_DONE, self.avatar_import.status)
+
+        user = User.objects.get(username="github")
+        self.assertIn(f"pk-{user.pk}-avatar", user.avatar_thumbnail.name)
+        self.assertTrue(user.avatar_thumbnail.name.endswith(".webp"))
+
+    def test_import_avatars_replace(self):
+        """import_avatars command replace test
+        Check new thumbnail bumps updated_at and deletes the previous file
+        """
+        response = FakeAvatarResponse(make_image(300, 300, "PNG"))
+
+        with mock.patch("users.oauth.http.get", return_value=response):
+            call_command("import_avatars", stdout=StringIO())
+            user = User.objects.get(username="github")
+            previous, updated_at = user.avatar_thumbnail, user.updated_at
+            AvatarImport.objects.enqueue(user, "https://avatars.test/github.png")
+            call_command("import_avatars", stdout=StringIO())
+
+        user.refresh_from_db()
+        self.assertNotEqual(previous.name, user.avatar_thumbnail.name)
+        self.assertFalse(previous.storage.exists(previous.name))
+        self.assertTrue(user.avatar_thumbnail.storage.exists(user.avatar_thumbnail.name))
+        self.assertGreater(user.updated_at, updated_at)
+
+    @override_settings(AVATAR_MAX_DOWNLOAD_SIZE=100)
+    def test_import_avatars_too_large(self):
+        """import_avatars command size cap test
+        Check avatar larger than AVATAR_MAX_DOWNLOAD_SIZE is not stored
+        """
+        with mock.patch(
+            "users.oauth.http.get", return_value=FakeAvatarResponse(b"x" * 1000),
+        ):
+            call_command("import_avatars", "--max-attempts=1", stdout=StringIO())
+
+        self.avatar_import.refresh_from_db()
+        self.assertEqual(AvatarImport.STATUS_FAILED, self.avatar_import.status)
+        self.assertIn("too large", self.avatar_import.last_error)
+        self.assertFalse(User.objects.get(username="github").avatar_thumbnail)
+
+    def test_import_avatars_retry_backoff(self):
+        """import_avatars command failure test
+        Check broken image is retried later with backoff
+        """
+        with mock.patch(
+            "users.oauth.http.get", return_value=FakeAvatarResponse(b"not image"),
+        ):
+            call_command("import_avatars", "--backoff=60", stdout=StringIO())
+
+        self.avatar_import.refresh_from_db()
+        self.assertEqual(AvatarImport.STATUS_PENDING, self.avatar_import.status)
+        self.assertEqual(1, self.avatar_import.attempts)
+        self.assertGreater(self.avatar_import.run_after, now())
+        self.assertFalse(AvatarImport.objects.due().exists())
+
+    def test_import_avatars_claimed_before_download(self):
+        """import_avatars command claim test
+        Check imports are leased before downloading, a failed save keeps no file
+        """
+
+        def get(*args, **kwargs):
+            self.assertFalse(AvatarImport.objects.due().exists())
+            return FakeAvatarResponse(make_image(300, 300, "PNG"))
+
+        with mock.patch("users.oauth.http.get", side_effect=get), mock.patch(
+            "users.models.User.save", side_effect=IntegrityError("locked")
+        ), mock.patch("django.db.models.fields.files.FieldFile.delete") as delete:
+            call_command("import_avatars", stdout=StringIO())
+
+        self.avatar_import.refresh_from_db()
+        self.assertEqual(1, self.avatar_import.attempts)
+        self.assertEqual("IntegrityError: locked", self.avatar_import.last_error)
+        self.assertEqual(1, delete.call_count)
+
+
+class TokenBucketTest(TestCase):
+    def setUp(self):
+        caches[settings.LOGIN_THROTTLE_CACHE].clear()
+        cache.clear()
+
+    def test_token_bucket_consume(self):
+        """TokenBucket consume test
+        Check bucket rejects once empty and refills with time
+        """
+        bucket = TokenBucket("test", 2, 60)
+        now = time.time()
+
+        with mock.patch("users.throttle.time.time", return_value=now):
+            self.assertEqual(0, bucket.consume("ident"))
+            self.assertEqual(0, bucket.consume("ident"))
+            self.assertAlmostEqual(30, bucket.consume("ident"))
+            self.assertEqual(2, bucket.peek("other"))
+
+        with mock.patch("users.throttle.time.time", return_value=now + 30):
+            self.assertEqual(1, bucket.peek("ident"))
+            self.assertEqual(0, bucket.consume("ident"))
+
+        bucket.reset("ident")
+        self.assertEqual(2, bucket.peek("ident"))
+
+    def test_token_bucket_concurrent_consume(self):
+        """TokenBucket consume test
+        Check concurrent attempts take no more than capacity tokens
+        """
+        bucket = TokenBucket("test", 5, 3600, cache=cache)
+
+        with ThreadPoolExecutor(8) as executor:
+            waits = list(executor.map(bucket.consume, ["ident"] * 40))
+
+        self.assertEqual(5, waits.count(0))
+
+
+class UserCountsTest(TestCase):
+    def test_user_counts_follow_rooms_and_reviews(self):
+        """User room_count / review_count signals test
+        Check counters follow created and deleted rooms and reviews
+        """
+        user = User.objects.create_user(username="counts")
+        room = Room.objects.create(
+            name="Count Room",
+            description="Test Description",
+            country="KR",
+            city="Seoul",
+            price=100,
+            address="Test Address",
+            guests=1,
+            beds=1,
+            bedrooms=1,
+            baths=1,
+            check_in=datetime(2019, 1, 1, 9, 30),
+            check_out=datetime(2019, 1, 2, 10, 30),
+            host=user,
+        )
+        Review.objects.create(
+            review="Good",
+            accuracy=5,
+            communication=5,
+            cleanliness=5,
+            location=5,
+            check_in=5,
+            value=5,
+            user=user,
+            room=room,
+        )
+
+        user.refresh_from_db()
+        self.assertEqual((1, 1), (user.room_count, user.review_count))
+
+        room.delete()
+        user.refresh_from_db()
+        self.assertEqual((0, 0), (user.room_count, user.review_count))
+
+    def test_user_counts_follow_reassigned_host(self):
+        """User room_count / review_count signals test
+        Check reassigning a room's host or a review's user moves the counts
+        """
+        old, new = (User.objects.create_user(username=name) for name in "ab")
+        room = Room.objects.create(
+            name="Count Room",
+            description="Test Description",
+            country="KR",
+            city="Seoul",
+            price=100,
+            address="Test Address",
+            guests=1,
+            beds=1,
+            bedrooms=1,
+            baths=1,
+            check_in=datetime(2019, 1, 1, 9, 30),
+            check_out=datetime(2019, 1, 2, 10, 30),
+            host=old,
+        )
+        review = Review.objects.create(
+            review="Good",
+            accuracy=5,
+            communication=5,
+            cleanliness=5,
+            location=5,
+            check_in=5,
+            value=5,
+            user=old,
+            room=room,
+        )
+
+        room = Room.objects.get(pk=room.pk)
+        room.host = new
+        room.save()
+        room.save()
+        review.user = new
+        review.save()
+
+        old.refresh_from_db()
+        new.refresh_from_db()
+        self.assertEqual((0, 0), (old.room_count, old.review_count))
+        self.assertEqual((1, 1), (new.room_count, new.review_count))
+
+    def test_user_refresh_counts(self):
+        """UserManager refresh_counts method test
+        Check drifted counters are recounted in one query
+        """
+        user = User.objects.create_user(username="counts")
+        User.objects.filter(pk=user.pk).update(room_count=7, review_count=3)
+
+        with self.assertNumQueries(1):
+            User.objects.refresh_counts([user.pk])
+
+        user.refresh_from_db()
+        self.assertEqual((0, 0), (user.room_count, user.review_count))
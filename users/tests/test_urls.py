@@ -10,10 +10,8 @@ from users.views import (
     UpdateProfileView,
     UpdatePasswordView,
     complete_verification,
-    github_login,
-    github_callback,
-    kakao_login,
-    kakao_callback,
+    oauth_login,
+    oauth_callback,
 )
 
 
@@ -48,31 +46,35 @@ class UsersUrlTest(TestCase):
 
     def test_url_resolves_to_github_login(self):
         """User applictaion '/users/login/github' pattern urls test
-        Check '/users/login/github' pattern resolved function is github_login
+        Check '/users/login/github' pattern resolved function is oauth_login
         """
         found = resolve("/users/login/github")
-        self.assertEqual(found.func, github_login)
+        self.assertEqual(found.func, oauth_login)
+        self.assertEqual(found.kwargs, {"provider": "github"})
 
     def test_url_resolves_to_github_callback(self):
         """User applictaion '/users/login/github/callback' pattern urls test
-        Check '/users/login/github/callback' pattern resolved function is github_callback
+        Check '/users/login/github/callback' pattern resolved function is oauth_callback
         """
         found = resolve("/users/login/github/callback")
-        self.assertEqual(found.func, github_callback)
+        self.assertEqual(found.func, oauth_callback)
+        self.assertEqual(found.kwargs, {"provider": "github"})
 
     def test_url_resolves_to_kakao_login(self):
         """User applictaion '/users/login/kakao' pattern urls test
-        Check '/users/login/kakao' pattern resolved function is kakao_login
+        Check '/users/login/kakao' pattern resolved function is oauth_login
         """
         found = resolve("/users/login/kakao")
-        self.assertEqual(found.func, kakao_login)
+        self.assertEqual(found.func, oauth_login)
+        self.assertEqual(found.kwargs, {"provider": "kakao"})
 
     def test_url_resolves_to_kakao_callback(self):
         """User applictaion '/users/login/kakao/callback' pattern urls test
-        Check '/users/login/kakao/callback' pattern resolved function is kakao_callback
+        Check '/users/login/kakao/callback' pattern resolved function is oauth_callback
         """
         found = resolve("/users/login/kakao/callback")
-        self.assertEqual(found.func, kakao_callback)
+        self.assertEqual(found.func, oauth_callback)
+        self.assertEqual(found.kwargs, {"provider": "kakao"})
 
     def test_url_resolves_to_user_profile_view(self):
         """User application '/users/1' pattern urls test
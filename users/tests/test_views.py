@@ -1,7 +1,20 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.timezone import now
+from django.core import mail
+from django.core.management import call_command
+from io import StringIO
 from django.shortcuts import reverse
-from users.models import User
+from django.contrib.auth.hashers import check_password
+from reviews.models import Review
+from rooms.models import Room
+from users.models import LoginLockout, User
+from users.oauth import GithubProvider, get_provider
+from users.tokens import make_verification_token, check_verification_token
+from datetime import datetime, timedelta
 from unittest import mock
+import requests
 
 
 class MockResponse:
@@ -13,6 +26,13 @@ class MockResponse:
     def json(self):
         return self.json_data
 
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def close(self):
+        pass
+
 
 def mocked_requests_token(*args, **kwargs):
     if args[0] == "https://github.com/login/oauth/access_token":
@@ -72,9 +92,6 @@ def mocked_requests_noneexist_profile(*args, **kwargs):
             200,
         )
 
-    elif args[0] == "test_profile_image_url.com":
-        return MockResponse({}, 200, "test_profile_image_url.com")
-
 
 def mocked_requests_exist_not_oauth_profile(*args, **kwargs):
     if args[0] == "https://api.github.com/user":
@@ -109,6 +126,31 @@ def mocked_requests_no_user_data(*args, **kwargs):
         return MockResponse({"kakao_account": {}}, 200)
 
 
+def mocked_requests_unauthorized(*args, **kwargs):
+    return MockResponse({"message": "Bad credentials"}, 401)
+
+
+def mocked_requests_server_error(*args, **kwargs):
+    return MockResponse(None, 500)
+
+
+def mocked_requests_timeout(*args, **kwargs):
+    raise requests.Timeout()
+
+
+class FakeProvider(GithubProvider):
+    def get_access_token(self, code, redirect_uri):
+        return "test_access_token"
+
+    def get_profile(self, access_token):
+        return {
+            "login": "fake",
+            "name": "fake",
+            "email": "fake@test.com",
+            "bio": "fake user",
+        }
+
+
 def mocked_requests_error(*args, **kwargs):
     if args[0] == "https://github.com/login/oauth/access_token":
         return MockResponse({"error": "error"}, 200)
@@ -171,6 +213,75 @@ class UserViewTest(TestCase):
         html = response.content.decode("utf8")
         self.assertIn('href="/users/logout"', html)
 
+    def test_view_users_login_view_post_hash_once(self):
+        """Users application LoginView post method password hashing test
+        Check password is hashed only once in the whole login flow
+        """
+        data = {"email": "test@test.com", "password": "testtest"}
+
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as mocked_check_password:
+            response = self.client.post("/users/login", data)
+
+        self.assertEqual(302, response.status_code)
+        self.assertEqual(1, mocked_check_password.call_count)
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": (10, 60), "account": (2, 60)})
+    def test_view_users_login_view_post_throttled_account(self):
+        """Users application LoginView post method account throttling test
+        Check login is answered 429 without hashing once account bucket is empty
+        """
+        throttle_cache = caches[settings.LOGIN_THROTTLE_CACHE]
+        throttle_cache.clear()
+        self.addCleanup(throttle_cache.clear)
+        data = {"email": "email@test.com", "password": "wrong"}
+
+        for _ in range(2):
+            self.assertEqual(200, self.client.post("/users/login", data).status_code)
+
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as mocked_check_password:
+            response = self.client.post(
+                "/users/login", {"email": "email@test.com", "password": "testtest"}
+            )
+
+        self.assertEqual(429, response.status_code)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertIn("Too many login attempts", response.content.decode("utf8"))
+        self.assertFalse(mocked_check_password.called)
+
+        lockout = LoginLockout.objects.get(scope=LoginLockout.SCOPE_ACCOUNT)
+        self.assertEqual("email@test.com", lockout.value)
+        self.assertEqual(1, lockout.lockouts)
+        self.assertTrue(lockout.is_locked())
+
+        data = {"email": "test@test.com", "password": "testtest"}
+        self.assertEqual(302, self.client.post("/users/login", data).status_code)
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": (2, 60), "account": (10, 60)})
+    def test_view_users_login_view_post_throttled_ip(self):
+        """Users application LoginView post method IP throttling test
+        Check every account is rejected once client IP bucket is empty
+        """
+        throttle_cache = caches[settings.LOGIN_THROTTLE_CACHE]
+        throttle_cache.clear()
+        self.addCleanup(throttle_cache.clear)
+
+        for email in ("a@test.com", "b@test.com"):
+            data = {"email": email, "password": "wrong"}
+            self.assertEqual(200, self.client.post("/users/login", data).status_code)
+
+        data = {"email": "test@test.com", "password": "testtest"}
+        self.assertEqual(429, self.client.post("/users/login", data).status_code)
+
+        response = self.client.post("/users/login", data, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(302, response.status_code)
+        self.assertEqual(
+            "127.0.0.1", LoginLockout.objects.get(scope=LoginLockout.SCOPE_IP).value
+        )
+
     def test_view_users_login_view_post_login_fail(self):
         """Users application LoginView post method test
         Check render login template when fail login process
@@ -255,6 +366,38 @@ class UserViewTest(TestCase):
         self.assertIn('href="/users/logout"', html)
         self.assertIsNotNone(User.objects.get(username="testtest@test.com"))
 
+    def test_view_users_sign_up_view_post_single_hash_and_save(self):
+        """Users application sign up view post method cost test
+        Check password is hashed once, never checked and user saved once
+        """
+        data = {
+            "first_name": "test",
+            "last_name": "test",
+            "email": "single@test.com",
+            "password": "pwdsuccess@",
+            "password_check": "pwdsuccess@",
+        }
+
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password"
+        ) as mocked_check_password, mock.patch(
+            "users.models.User.save", autospec=True, side_effect=User.save
+        ) as mocked_save:
+            response = self.client.post("/users/signup", data=data)
+
+        self.assertEqual(302, response.status_code)
+        self.assertFalse(mocked_check_password.called)
+        # One full save, login only updates last_login
+        self.assertEqual(2, mocked_save.call_count)
+        self.assertNotIn("update_fields", mocked_save.call_args_list[0][1])
+        self.assertEqual(
+            {"update_fields": ["last_login"]}, mocked_save.call_args_list[1][1]
+        )
+
+        user = User.objects.get(username="single@test.com")
+        self.assertEqual(20, len(user.email_secret))
+        self.assertEqual(str(user.pk), self.client.session["_auth_user_id"])
+
     def test_view_users_sign_up_view_post_fail(self):
         """Users application sign up view post method test
         Check fail to create user and raise four ValidationError
@@ -280,13 +423,57 @@ class UserViewTest(TestCase):
 
         user = User.objects.get(email_secret="a" * 20)
         self.assertFalse(user.email_verified)
+        token = make_verification_token(user)
 
-        response = self.client.post(f"/users/verify/{'a' * 20}")
+        with self.assertNumQueries(1):
+            response = self.client.post(f"/users/verify/{token}")
         self.assertEqual(302, response.status_code)
 
         user = User.objects.get(username="test@test.com")
         self.assertTrue(user.email_verified)
         self.assertEqual("", user.email_secret)
+        self.assertIsNone(user.email_secret_created)
+
+        # Token is single use
+        user.email_verified = False
+        user.save()
+        self.client.post(f"/users/verify/{token}")
+        self.assertFalse(User.objects.get(username="test@test.com").email_verified)
+
+    def test_complete_verification_bad_token(self):
+        """Users application complete_verification view bad token test
+        Check tampered and expired tokens are rejected without any query
+        """
+        user = User.objects.get(username="test@test.com")
+        user.generate_email_secret()
+        user.save()
+        token = make_verification_token(user)
+
+        with self.assertNumQueries(0):
+            self.client.post(f"/users/verify/{token[:-1]}x")
+
+        with override_settings(EMAIL_VERIFICATION_MAX_AGE=-1):
+            with self.assertNumQueries(0):
+                self.client.post(f"/users/verify/{token}")
+
+        self.assertFalse(User.objects.get(username="test@test.com").email_verified)
+
+    def test_purge_email_secrets_command(self):
+        """Users application purge_email_secrets command test
+        Check only secrets older than EMAIL_VERIFICATION_MAX_AGE are purged
+        """
+        old = User.objects.get(username="test@test.com")
+        old.generate_email_secret()
+        old.email_secret_created = now() - timedelta(days=30)
+        old.save()
+        fresh = User.objects.get(username="email@test.com")
+        fresh.generate_email_secret()
+        fresh.save()
+
+        call_command("purge_email_secrets", stdout=StringIO())
+
+        self.assertEqual("", User.objects.get(pk=old.pk).email_secret)
+        self.assertEqual(fresh.email_secret, User.objects.get(pk=fresh.pk).email_secret)
 
     def test_complete_verification_fail(self):
         """Users application complete_verification view fail test
@@ -298,12 +485,16 @@ class UserViewTest(TestCase):
             self.assertIsNone(User.objects.get(email_secret="b" * 20))
 
     def test_github_login(self):
-        """Users application github_login view test
-        Check github_login redirect to Authorization callback url
+        """Users application oauth_login view github test
+        Check oauth_login redirect to Authorization url with absolute callback url
         """
         response = self.client.get("/users/login/github")
         self.assertEqual(302, response.status_code)
         self.assertIn("https://github.com/login/oauth/authorize", response.url)
+        self.assertIn(
+            "redirect_uri=http%3A%2F%2Ftestserver%2Fusers%2Flogin%2Fgithub%2Fcallback",
+            response.url,
+        )
 
     def test_github_callback_code_is_none(self):
         """Users application github_callback view not has code test
@@ -313,7 +504,7 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_error)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_error)
     def test_github_callback_has_error(self, mock_get):
         """Users application github_callback view has error test
         Check github_callback redirect to login when has error at token_json
@@ -322,8 +513,8 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_no_user_data)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_no_user_data)
     def test_github_callback_is_no_username(self, mock_post, mock_get):
         """Users application github_callback view username is None
         Check github_callback redirect to login when username is None
@@ -332,8 +523,8 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_noneexist_profile)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_noneexist_profile)
     def test_github_callback_noneexist_github_profile(self, mock_post, mock_get):
         """Users application github_callback view hasn't user profile test
         Check github_callback create user with login and redirect to home
@@ -350,13 +541,19 @@ class UserViewTest(TestCase):
         self.assertEqual(user.email, "testtest@test.com")
         self.assertEqual(user.login_method, User.LOGIN_GITHUB)
         self.assertTrue(user.email_verified)
-        self.assertIn(f"pk-{user.pk}-{user.first_name}-avatar", user.avatar.url)
+        self.assertFalse(user.avatar_thumbnail)
+        self.assertEqual(
+            ["test_profile_image_url.com"],
+            list(user.avatar_imports.values_list("url", flat=True)),
+        )
 
         response = self.client.get("/")
         self.assertEqual(response.context[0]["user"], user)
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_exist_not_oauth_profile)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch(
+        "users.oauth.http.get", side_effect=mocked_requests_exist_not_oauth_profile
+    )
     def test_github_callback_not_github_profile(self, mock_post, mock_get):
         """Users application github_callback view user's login method test
         Check github_callback redirect to login when user's login method not Github
@@ -365,8 +562,8 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_exist_oauth_profile)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_exist_oauth_profile)
     def test_github_callback_exist_github_profile(self, mock_post, mock_get):
         """Users application github_callback view has user profile test
         Check github_callback redirect to home when already have an account
@@ -380,9 +577,68 @@ class UserViewTest(TestCase):
         response = self.client.get("/")
         self.assertEqual(response.context[0]["user"], user)
 
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_timeout)
+    def test_github_callback_timeout(self, mock_post):
+        """Users application github_callback view timeout test
+        Check github_callback redirect to login when provider doesn't answer
+        """
+        response = self.client.get("/users/login/github/callback?code=testtest")
+        self.assertEqual(302, response.status_code)
+        self.assertEqual(response.url, reverse("users:login"))
+        self.assertEqual(settings.OAUTH_TIMEOUT, mock_post.call_args[1]["timeout"])
+
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    def test_github_callback_error_status(self, mock_post):
+        """Users application github_callback view error status test
+        Check github_callback redirect to login when provider answers 401 or 500
+        """
+        user_count = User.objects.count()
+
+        for mocked_get in (mocked_requests_unauthorized, mocked_requests_server_error):
+            with mock.patch("users.oauth.http.get", side_effect=mocked_get):
+                response = self.client.get(
+                    "/users/login/github/callback?code=testtest", follow=True
+                )
+
+            self.assertRedirects(response, reverse("users:login"))
+            self.assertContains(response, "Error from api.github.com")
+
+        self.assertEqual(user_count, User.objects.count())
+
+    @override_settings(
+        OAUTH_PROVIDERS={"github": {"CLASS": "users.tests.test_views.FakeProvider"}}
+    )
+    def test_github_callback_fake_provider(self):
+        """Users application github_callback view provider setting test
+        Check github_callback uses provider class configured by OAUTH_PROVIDERS
+        """
+        response = self.client.get("/users/login/github/callback?code=testtest")
+        self.assertEqual(302, response.status_code)
+        self.assertEqual(response.url, reverse("core:home"))
+        self.assertEqual(
+            User.LOGIN_GITHUB, User.objects.get(email="fake@test.com").login_method
+        )
+
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_exist_oauth_profile)
+    def test_github_callback_latency_stats(self, mock_post, mock_get):
+        """OAuth provider latency stats test
+        Check token and profile calls of the callback are recorded per provider
+        """
+        provider = get_provider("github")
+        self.assertIs(provider, get_provider("github"))
+
+        before = provider.stats.snapshot().get("token", {"count": 0})["count"]
+        self.client.get("/users/login/github/callback?code=testtest")
+        stats = provider.stats.snapshot()
+
+        self.assertEqual(before + 1, stats["token"]["count"])
+        self.assertIn("profile", stats)
+        self.assertGreaterEqual(stats["token"]["max"], stats["token"]["avg"])
+
     def test_kakao_login(self):
-        """Users application kakao_login view test
-        Check kakao_login redirect to Authorization callback url
+        """Users application oauth_login view kakao test
+        Check oauth_login redirect to Authorization callback url
         """
         response = self.client.get("/users/login/kakao")
         self.assertEqual(302, response.status_code)
@@ -396,7 +652,7 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_error)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_error)
     def test_kakao_callback_has_error(self, mock_get):
         """Users application kakao_callback view has error test
         Check kakao_callback redirect to login when has error at token_json
@@ -405,8 +661,8 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_no_user_data)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_no_user_data)
     def test_kakao_callback_is_no_email(self, mock_post, mock_get):
         """Users application kakao_callback view has code test
         Check kakao_callback redirect to login when email is None
@@ -415,8 +671,8 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_noneexist_profile)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_noneexist_profile)
     def test_kakao_callback_noneexist_kakao_profile(self, mock_post, mock_get):
         """Users application kakao_callback view hasn't user profile test
         Check kakao_callback create user with login and redirect to home
@@ -432,13 +688,19 @@ class UserViewTest(TestCase):
         self.assertEqual(user.email, "testtest@test.com")
         self.assertEqual(user.login_method, User.LOGIN_KAKAO)
         self.assertTrue(user.email_verified)
-        self.assertIn(f"pk-{user.pk}-{user.first_name}-avatar", user.avatar.url)
+        self.assertFalse(user.avatar_thumbnail)
+        self.assertEqual(
+            ["test_profile_image_url.com"],
+            list(user.avatar_imports.values_list("url", flat=True)),
+        )
 
         response = self.client.get("/")
         self.assertEqual(response.context[0]["user"], user)
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_exist_not_oauth_profile)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch(
+        "users.oauth.http.get", side_effect=mocked_requests_exist_not_oauth_profile
+    )
     def test_kakao_callback_not_kakao_profile(self, mock_post, mock_get):
         """Users application kakao_callback view user's login method test
         Check kakao_callback redirect to login when user's login method not kakao
@@ -447,8 +709,8 @@ class UserViewTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual(response.url, reverse("users:login"))
 
-    @mock.patch("requests.post", side_effect=mocked_requests_token)
-    @mock.patch("requests.get", side_effect=mocked_requests_exist_oauth_profile)
+    @mock.patch("users.oauth.http.post", side_effect=mocked_requests_token)
+    @mock.patch("users.oauth.http.get", side_effect=mocked_requests_exist_oauth_profile)
     def test_kakao_callback_exist_kakao_profile(self, mock_post, mock_get):
         """Users application kakao_callback view has user profile test
         Check kakao_callback redirect to home when already have an account
@@ -537,3 +799,116 @@ class UserViewTest(TestCase):
         response = self.client.post("/users/login?next=/users/update", data)
         self.assertEqual(302, response.status_code)
         self.assertEqual(reverse("users:update"), response.url)
+
+
+class SignUpEmailTest(TestCase):
+    def test_sign_up_queue_verification_email(self):
+        """Users application sign up view verification email test
+        Check verification email with saved secret is queued, not sent
+        """
+        data = {
+            "first_name": "test",
+            "last_name": "test",
+            "email": "mail@test.com",
+            "password": "pwdsuccess@",
+            "password_check": "pwdsuccess@",
+        }
+        self.client.post("/users/signup", data=data)
+        user = User.objects.get(username="mail@test.com")
+
+        self.assertEqual(0, len(mail.outbox))
+        call_command("send_queued_emails", stdout=StringIO())
+        self.assertEqual(1, len(mail.outbox))
+        self.assertEqual(["mail@test.com"], mail.outbox[0].to)
+        html = mail.outbox[0].alternatives[0][0]
+        token = html.split("/users/verify/")[1].split('"')[0]
+        self.assertEqual((user.pk, user.email_secret), check_verification_token(token))
+
+
+def create_room(host, name):
+    return Room.objects.create(
+        name=name,
+        description="Test Description",
+        country="KR",
+        city="Seoul",
+        price=100,
+        address="Test Address",
+        guests=6,
+        beds=3,
+        bedrooms=2,
+        baths=2,
+        check_in=datetime(2019, 1, 1, 9, 30),
+        check_out=datetime(2019, 1, 2, 10, 30),
+        host=host,
+    )
+
+
+class UserProfileViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Run only once when running UserProfileViewTest
+        Create host with 15 rooms, one of them reviewed by guest
+        """
+        host = User.objects.create_user(
+            username="host", password="testtest", first_name="host"
+        )
+        guest = User.objects.create_user(username="guest", password="testtest")
+
+        for i in range(1, 16):
+            create_room(host, f"Host Room {i}")
+
+        Review.objects.create(
+            review="Good",
+            accuracy=5,
+            communication=5,
+            cleanliness=5,
+            location=5,
+            check_in=5,
+            value=5,
+            user=guest,
+            room=Room.objects.get(name="Host Room 1"),
+        )
+
+    def setUp(self):
+        self.client.login(username="guest", password="testtest")
+        self.host = User.objects.get(username="host")
+
+    def test_user_profile_view_paginated(self):
+        """UserProfileView room pagination test
+        Check host's rooms are paginated, newest first, with counts
+        """
+        response = self.client.get(f"/users/{self.host.pk}")
+        html = response.content.decode("utf8")
+        page = response.context["page_obj"]
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(12, len(page))
+        self.assertEqual("Host Room 15", page[0].name)
+        self.assertEqual(2, page.paginator.num_pages)
+        self.assertIn("host's Rooms (15)", html)
+        self.assertIn("15 rooms", html)
+
+        response = self.client.get(f"/users/{self.host.pk}", {"page": 2})
+        page = response.context["page_obj"]
+        self.assertEqual(
+            ["Host Room 3", "Host Room 2", "Host Room 1"], [room.name for room in page]
+        )
+
+        guest = User.objects.get(username="guest")
+        response = self.client.get(f"/users/{guest.pk}")
+        self.assertIn("1 review", response.content.decode("utf8"))
+
+    def test_user_profile_view_constant_queries(self):
+        """UserProfileView query count test
+        Check query count doesn't grow with number of host's rooms
+        """
+        self.client.get(f"/users/{self.host.pk}")
+
+        with self.assertNumQueries(7):
+            self.client.get(f"/users/{self.host.pk}")
+
+        for i in range(16, 30):
+            create_room(self.host, f"Host Room {i}")
+
+        with self.assertNumQueries(7):
+            self.client.get(f"/users/{self.host.pk}")
@@ -0,0 +1,112 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from users.models import LoginLockout
+
+
+# A consume holds the lock of its bucket for a few cache round trips. Others
+# wait up to LOCK_ATTEMPTS * LOCK_WAIT seconds for it, then are rejected, and
+# a lock left by a dead worker expires after LOCK_TIMEOUT seconds
+LOCK_TIMEOUT = 5
+LOCK_WAIT = 0.01
+LOCK_ATTEMPTS = 100
+
+
+class TokenBucket:
+    """Token bucket of every identity of a scope, kept in a cache backend
+
+    A bucket holds up to capacity tokens and refills capacity tokens every
+    period seconds. Each attempt takes a token, an empty bucket rejects.
+    A missing cache entry is a full bucket, so idle identities cost nothing.
+    Buckets are read and written under a lock taken with cache.add, atomic
+    in local memory, memcached and database caches, so concurrent attempts
+    can't all pass.
+
+    Method:
+        consume : take a token, return 0 or seconds until one is available
+        peek    : return tokens left without taking one
+        reset   : refill the bucket of an identity
+    """
+
+    def __init__(self, scope, capacity, period, cache=None):
+        self.scope = scope
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.cache = cache or caches[settings.LOGIN_THROTTLE_CACHE]
+
+    def get_key(self, ident):
+        digest = hashlib.sha1(ident.encode()).hexdigest()
+        return f"throttle:{self.scope}:{digest}"
+
+    def get_tokens(self, key, now):
+        tokens, updated = self.cache.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def consume(self, ident):
+        key = self.get_key(ident)
+        lock_key = f"{key}:lock"
+
+        for _ in range(LOCK_ATTEMPTS):
+            if self.cache.add(lock_key, True, LOCK_TIMEOUT):
+                break
+
+            time.sleep(LOCK_WAIT)
+        else:
+            # Attempts racing for one identity that long are rejected
+            return 1 / self.rate
+
+        try:
+            now = time.time()
+            tokens = self.get_tokens(key, now)
+            allowed = tokens >= 1
+
+            if allowed:
+                tokens -= 1
+
+            self.cache.set(key, (tokens, now), self.period)
+        finally:
+            self.cache.delete(lock_key)
+
+        return 0 if allowed else (1 - tokens) / self.rate
+
+    def peek(self, ident):
+        return int(self.get_tokens(self.get_key(ident), time.time()))
+
+    def reset(self, ident):
+        self.cache.delete(self.get_key(ident))
+
+
+def get_login_buckets():
+    return {
+        scope: TokenBucket(scope, capacity, period)
+        for scope, (capacity, period) in settings.LOGIN_THROTTLE_RATES.items()
+    }
+
+
+def get_client_ip(request):
+    return request.META.get("REMOTE_ADDR") or "unknown"
+
+
+def throttle_login(request, email):
+    """Take a login attempt token of the client IP and of the account
+
+    Return seconds to wait when a bucket is empty, 0 when login may go on.
+    The first rejection of a lockout is recorded as a LoginLockout.
+    """
+    idents = {"ip": get_client_ip(request), "account": email.lower()}
+    retry_after = 0
+
+    for scope, bucket in get_login_buckets().items():
+        wait = bucket.consume(idents[scope])
+
+        if not wait:
+            continue
+
+        retry_after = max(retry_after, wait)
+
+        if bucket.cache.add(f"{bucket.get_key(idents[scope])}:locked", True, wait):
+            LoginLockout.objects.record(scope, idents[scope], wait)
+
+    return retry_after
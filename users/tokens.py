@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core import signing
+
+SALT = "users.email-verification"
+
+
+def make_verification_token(user):
+    """Return signed, timestamped token of user pk and current email_secret"""
+    return signing.dumps({"u": user.pk, "s": user.email_secret}, salt=SALT)
+
+
+def check_verification_token(token):
+    """Return (user pk, email secret) of a token
+    None when the signature is wrong or older than EMAIL_VERIFICATION_MAX_AGE,
+    checked before any database access
+    """
+    try:
+        data = signing.loads(
+            token, salt=SALT, max_age=settings.EMAIL_VERIFICATION_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+
+    return data.get("u"), data.get("s")
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from users.views import (
     LoginView,
@@ -7,20 +8,14 @@ from users.views import (
     UpdateProfileView,
     UpdatePasswordView,
     complete_verification,
-    github_login,
-    github_callback,
-    kakao_login,
-    kakao_callback,
+    oauth_login,
+    oauth_callback,
 )
 
 app_name = "users"
 
 urlpatterns = [
     path("login", LoginView.as_view(), name="login"),
-    path("login/github", github_login, name="github-login"),
-    path("login/github/callback", github_callback, name="github-callback"),
-    path("login/kakao", kakao_login, name="kakao-login"),
-    path("login/kakao/callback", kakao_callback, name="kakao-callback"),
     path("logout", log_out, name="logout"),
     path("signup", SignUpView.as_view(), name="signup"),
     path("verify/<str:key>", complete_verification, name="complete_verfication"),
@@ -28,3 +23,20 @@ urlpatterns = [
     path("update-password", UpdatePasswordView.as_view(), name="password"),
     path("<int:pk>", UserProfileView.as_view(), name="profile"),
 ]
+
+# One login / callback url pair per OAuth provider, e.g. "users:github-login"
+for provider in settings.OAUTH_PROVIDERS:
+    urlpatterns += [
+        path(
+            f"login/{provider}",
+            oauth_login,
+            {"provider": provider},
+            name=f"{provider}-login",
+        ),
+        path(
+            f"login/{provider}/callback",
+            oauth_callback,
+            {"provider": provider},
+            name=f"{provider}-callback",
+        ),
+    ]
@@ -4,14 +4,18 @@ from django.contrib.messages.views import SuccessMessageMixin
 from django.urls import reverse_lazy
 from django.shortcuts import redirect, reverse
 from django.contrib import messages
-from django.contrib.auth import authenticate, login, logout
-from django.core.files.base import ContentFile
+from django.conf import settings
+from django.contrib.auth import login, logout
+from django.core.paginator import Paginator
+from django.db import transaction
+from rooms.models import Room
 from users.forms import LoginForm, SignUpForm
 from users.mixins import LoggedOutOnlyView, LoggedInOnlyView, EmailLoginOnlyView
-from users.models import User
+from users.models import AvatarImport, User
+from users.oauth import OAuthError, get_provider
+from users.tokens import check_verification_token
 
-import os
-import requests
+import math
 
 
 class LoginView(LoggedOutOnlyView, FormView):
@@ -23,22 +27,32 @@ class LoginView(LoggedOutOnlyView, FormView):
     success_url   : reverse_lazy("core:home")
 
     Method:
-        form_valid : user auth process
+        get_form_kwargs : pass request to LoginForm
+        form_valid      : login user already authenticated by LoginForm
+        form_invalid    : answer 429 with Retry-After when login is throttled
     """
 
     template_name = "users/login.html"
     form_class = LoginForm
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["request"] = self.request
+        return kwargs
+
     def form_valid(self, form):
-        email = form.cleaned_data.get("email")
-        password = form.cleaned_data.get("password")
+        login(self.request, form.get_user())
 
-        user = authenticate(self.request, username=email, password=password)
+        return super().form_valid(form)
 
-        if user is not None:
-            login(self.request, user)
+    def form_invalid(self, form):
+        response = super().form_invalid(form)
 
-        return super().form_valid(form)
+        if form.retry_after:
+            response.status_code = 429
+            response["Retry-After"] = math.ceil(form.retry_after)
+
+        return response
 
     def get_success_url(self):
         next_arg = self.request.GET.get("next")
@@ -63,7 +77,8 @@ class SignUpView(LoggedOutOnlyView, FormView):
     success_url   : reverse_lazy("core:home")
 
     Method:
-        form_valid : Create user using save method and login user
+        form_valid : Create user with email secret in one save, queue the
+                     verification email in the same transaction and login user
     """
 
     template_name = "users/signup.html"
@@ -71,208 +86,87 @@ class SignUpView(LoggedOutOnlyView, FormView):
     success_url = reverse_lazy("core:home")
 
     def form_valid(self, form):
-        form.save()
-        email = form.cleaned_data.get("email")
-        password = form.cleaned_data.get("password")
+        with transaction.atomic():
+            user = form.save(commit=False)
+            user.generate_email_secret()
+            user.save()
+            user.enqueue_verification_email()
 
-        user = authenticate(self.request, username=email, password=password)
+        # The password was just hashed by set_password, no need to authenticate
+        login(self.request, user, backend=settings.AUTHENTICATION_BACKENDS[0])
 
-        if user is not None:
-            login(self.request, user)
-        user.verify_email()
         return super().form_valid(form)
 
 
 def complete_verification(request, key):
-    try:
-        user = User.objects.get(email_secret=key)
-        user.email_verified = True
-        user.email_secret = ""
-        user.save()
-        # To do : add success message
-    except User.DoesNotExist:
-        # To do : add error message
-        pass
-
-    return redirect(reverse("core:home"))
-
-
-def github_login(request):
-    client_id = os.environ.get("GITHUB_CLIENT_ID")
-
-    redirect_url = "http://127.0.0.1:8000/users/login/github/callback"
-    query_string = (
-        f"?client_id={client_id}" + f"&redirect_url={redirect_url}" + "&scope=read:user"
-    )
-    return redirect("https://github.com/login/oauth/authorize" + query_string)
-
-
-class GithubException(Exception):
-    pass
+    payload = check_verification_token(key)
+    verified = 0
+
+    if payload is not None:
+        user_pk, secret = payload
+        # Primary key update, the secret makes the token single use
+        verified = (
+            User.objects.filter(pk=user_pk, email_secret=secret)
+            .exclude(email_secret="")
+            .update(email_verified=True, email_secret="", email_secret_created=None)
+        )
 
+    if verified:
+        messages.success(request, "Email verified")
+    else:
+        messages.error(request, "Verification link is invalid or expired")
 
-def github_callback(request):
-    try:
-        code = request.GET.get("code", None)
-        client_id = os.environ.get("GITHUB_CLIENT_ID")
-        client_secret = os.environ.get("GITHUB_CLIENT_SECRET")
-
-        if code is not None:
-            token_response = requests.post(
-                "https://github.com/login/oauth/access_token",
-                data={
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "code": code,
-                },
-                headers={"Accept": "application/json"},
-            )
-            token_json = token_response.json()
-            error = token_json.get("error", None)
-
-            if error:
-                raise GithubException("Can't get access token")
-
-            access_token = token_json.get("access_token")
-            profile_response = requests.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            profile_json = profile_response.json()
-            username = profile_json.get("login", None)
-
-            if not username:
-                raise GithubException("Can't get your profile")
-
-            name = profile_json.get("name")
-            email = profile_json.get("email")
-            bio = profile_json.get("bio")
-            avatar_url = profile_json.get("avatar_url", None)
-
-            try:
-                user = User.objects.get(email=email)
-
-                if user.login_method != User.LOGIN_GITHUB:
-                    raise GithubException(f"Please login with: {user.login_method}")
-
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    username=email,
-                    first_name=name,
-                    bio=bio,
-                    email=email,
-                    email_verified=True,
-                    login_method=User.LOGIN_GITHUB,
-                )
-                user.set_unusable_password()
-                user.save()
-
-                if avatar_url:
-                    photo_response = requests.get(avatar_url)
-                    user.avatar.save(
-                        f"pk-{user.pk}-{name}-avatar",
-                        ContentFile(photo_response.content),
-                    )
-
-            login(request, user)
-            messages.success(request, f"Welcome back {user.first_name}")
-
-            return redirect(reverse("core:home"))
-
-        raise GithubException()
-    except GithubException as e:
-        messages.error(request, e)
-        return redirect(reverse("users:login"))
+    return redirect(reverse("core:home"))
 
 
-def kakao_login(request):
-    client_id = os.environ.get("KAKAO_API_KEY")
-    redirect_uri = "http://127.0.0.1:8000/users/login/kakao/callback"
-    kakao_url = "https://kauth.kakao.com/oauth/authorize"
-    query_string = (
-        f"?client_id={client_id}&redirect_uri={redirect_uri}&response_type=code"
+def oauth_login(request, provider):
+    provider = get_provider(provider)
+    redirect_uri = request.build_absolute_uri(
+        reverse(f"users:{provider.name}-callback")
     )
 
-    return redirect(kakao_url + query_string)
-
+    return redirect(provider.get_login_url(redirect_uri))
 
-class KakaoException(Exception):
-    pass
 
+def oauth_callback(request, provider):
+    provider = get_provider(provider)
 
-def kakao_callback(request):
     try:
         code = request.GET.get("code", None)
 
         if not code:
-            raise KakaoException("Can't get authorization code.")
-
-        client_id = os.environ.get("KAKAO_API_KEY")
-        redirect_uri = "http://127.0.0.1:8000/users/login/kakao/callback"
-        data = {
-            "grant_type": "authorization_code",
-            "client_id": client_id,
-            "redirect_uri": redirect_uri,
-            "code": code,
-        }
-        token_response = requests.post("https://kauth.kakao.com/oauth/token", data=data)
-        token_json = token_response.json()
-        error = token_json.get("error", None)
-
-        if error:
-            raise KakaoException("Can't get authorization code.")
+            raise OAuthError("Can't get authorization code.")
 
-        access_token = token_json.get("access_token")
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
-        }
-        profile_response = requests.get(
-            "https://kapi.kakao.com/v2/user/me", headers=headers
+        redirect_uri = request.build_absolute_uri(
+            reverse(f"users:{provider.name}-callback")
         )
-
-        profile_json = profile_response.json()
-        email = profile_json.get("kakao_account").get("email", None)
-
-        if not email:
-            raise KakaoException("Please also give me your email")
-
-        properties = profile_json.get("properties")
-        nickname = properties.get("nickname")
-        profile_image = properties.get("profile_image", None)
+        access_token = provider.get_access_token(code, redirect_uri)
+        fields, avatar_url = provider.map_profile(provider.get_profile(access_token))
 
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.get(email=fields["email"])
 
-            if user.login_method != User.LOGIN_KAKAO:
-                raise KakaoException(f"Please login with: {user.login_method}")
+            if user.login_method != provider.name:
+                raise OAuthError(f"Please login with: {user.login_method}")
 
         except User.DoesNotExist:
-            user = User.objects.create(
-                username=email,
-                first_name=nickname,
-                email=email,
+            user = User(
+                username=fields["email"],
                 email_verified=True,
-                login_method=User.LOGIN_KAKAO,
+                login_method=provider.name,
+                **fields,
             )
             user.set_unusable_password()
             user.save()
 
-            if profile_image:
-                photo_response = requests.get(profile_image)
-                user.avatar.save(
-                    f"pk-{user.pk}-{nickname}-avatar",
-                    ContentFile(photo_response.content),
-                )
+            if avatar_url:
+                AvatarImport.objects.enqueue(user, avatar_url)
 
-        messages.success(request, f"Welcome back {user.first_name}")
         login(request, user)
+        messages.success(request, f"Welcome back {user.first_name}")
 
         return redirect(reverse("core:home"))
-    except KakaoException as e:
+    except OAuthError as e:
         messages.error(request, e)
         return redirect(reverse("users:login"))
 
@@ -282,10 +176,26 @@ class UserProfileView(LoggedInOnlyView, DetailView):
 
     Inherit       :  DetailView
     template_name : "users/user_detail.html"
+    paginate_by   : 12
+
+    Method:
+        get_context_data : add one page of the user's rooms as page_obj
     """
 
     model = User
     context_object_name = "user_obj"
+    paginate_by = 12
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        rooms = Room.objects.filter(host=self.object).for_cards().order_by("-pk")
+        paginator = Paginator(rooms, self.paginate_by)
+
+        # Denormalized room_count saves the COUNT query of the paginator
+        paginator.count = self.object.room_count
+
+        context["page_obj"] = paginator.get_page(self.request.GET.get("page"))
+        return context
 
 
 class UpdateProfileView(LoggedInOnlyView, SuccessMessageMixin, UpdateView):